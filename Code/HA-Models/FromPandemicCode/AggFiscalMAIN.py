@@ -19,6 +19,7 @@ else:
 sys.path.append(Abs_Path)
 from Simulate import Simulate
 from Output_Results import Output_Results
+from ParallelTools import num_workers_from_env, TaskScheduler
 
 #%%
 # ============================================================================
@@ -54,19 +55,36 @@ Run_Dict['Run_1stRoundAD']          = True
 Run_Dict['Run_NonAD']               = True 
 # For PVSame some of this automatically set to False
 
+# Number of processes for the policy routines and recession-length sweeps (set
+# HAFISCAL_NUM_WORKERS; 0 uses every core). Results are identical to the serial run.
+Run_Dict['num_workers']             = num_workers_from_env()
+
 #%% Execute main Simulation
 
+# The Baseline routines and the PVSame run share one scheduler. PVSame rescales
+# the policies using the Baseline no-recession results, so it starts as soon as
+# those are written, while the Baseline recession routines are still running.
+# Each set of results is written out as soon as the routines it reads are done
+# (the PVSame tables also read the Baseline recession results).
+scheduler = TaskScheduler(num_workers = Run_Dict['num_workers'])
+Baseline_tasks = []
+
 if Run_Main:
     
     figs_dir = Abs_Path+'/Figures/CRRA2/'    
-    Simulate(Run_Dict,figs_dir,Parametrization='Baseline')    
-    Output_Results(Abs_Path+'/Figures/CRRA2/',Abs_Path+'/Figures/',Abs_Path+'/Tables/CRRA2/',Parametrization='Baseline')
+    Baseline_tasks = Simulate(Run_Dict,figs_dir,Parametrization='Baseline',scheduler=scheduler)    
+    scheduler.add_task('Baseline:Output_Results', Output_Results, Abs_Path+'/Figures/CRRA2/',Abs_Path+'/Figures/',Abs_Path+'/Tables/CRRA2/',Parametrization='Baseline', deps=Baseline_tasks)
     
 if Run_EqualPVs:
            
     figs_dir = Abs_Path+'/Figures/CRRA2_PVSame/'
-    Simulate(Run_Dict,figs_dir,Parametrization='CRRA2_PVSame')
-    Output_Results(Abs_Path+'/Figures/CRRA2_PVSame/',Abs_Path+'/Figures/CRRA2_PVSame/',Abs_Path+'/Tables/CRRA2_PVSame/',Parametrization='CRRA2_PVSame')
+    # Only the Baseline no-recession routines that were actually queued
+    PVSame_deps = [name for name in Baseline_tasks if name in ['Baseline:Check', 'Baseline:UI', 'Baseline:TaxCut']]
+    Run_Dict_PVSame = dict(Run_Dict, num_workers = max(1, Run_Dict['num_workers']//2))
+    scheduler.add_task('CRRA2_PVSame', Simulate, Run_Dict_PVSame, figs_dir, Parametrization='CRRA2_PVSame', deps=PVSame_deps)
+    scheduler.add_task('CRRA2_PVSame:Output_Results', Output_Results, Abs_Path+'/Figures/CRRA2_PVSame/',Abs_Path+'/Figures/CRRA2_PVSame/',Abs_Path+'/Tables/CRRA2_PVSame/',Parametrization='CRRA2_PVSame', deps=['CRRA2_PVSame'] + Baseline_tasks)
+
+scheduler.run()
 
 # Welfare4.tex contains the relevant results for the welfare analysis
 
@@ -2,27 +2,36 @@
 This file has an extension of MarkovConsumerType that is used for the Fiscal project.
 '''
 import warnings
+import os
+import pickle
+from collections import OrderedDict
 import numpy as np
 import scipy.sparse as sp
-from HARK.distribution import DiscreteDistribution, Uniform
+from HARK.distribution import DiscreteDistribution, Uniform, Lognormal
 from HARK.ConsumptionSaving.ConsMarkovModel import MarkovConsumerType
 from HARK.ConsumptionSaving.ConsIndShockModel import ConsumerSolution
 from HARK.ConsumptionSaving.ConsAggShockModel import MargValueFunc2D, AggShockConsumerType
 from HARK.interpolation import LinearInterp, BilinearInterp, VariableLowerBoundFunc2D, \
                                 LinearInterpOnInterp1D, LowerEnvelope2D, UpperEnvelope, ConstantFunction
 from HARK import Market
+from HARK.utilities import make_grid_exp_mult
 from HARK.metric import distance_metric
 from HARK.core import Model
 
 from copy import copy, deepcopy
 import matplotlib.pyplot as plt
+from EGMKernels import calc_EndOfPrdvP_cond, calc_EndOfPrdvP
 
 from Parameters import returnParameters
+from OtherFunctions import calculate_NPV, hash_inputs
 [makeMacroMrkvArray_recession, makeCondMrkvArrays_recession, makeFullMrkvArray, T_sim, makeCondMrkvArrays_base, makeCondMrkvArrays_recessionUI] = returnParameters(OutputFor='_Model.py')
 
 # Define a modified MarkovConsumerType
 class AggFiscalType(MarkovConsumerType):
     time_inv_ = MarkovConsumerType.time_inv_ 
+    # Attributes that spawn() shares between a type and the types made from it,
+    # in addition to the Markov arrays and the arrays inside the income distributions
+    shared_attrs_ = ['aXtraGrid', 'Cgrid', 'CFunc', 'ADFunc', 'solution', 'solution_terminal']
     
     def __init__(self,cycles=1,time_flow=True,**kwds):
         MarkovConsumerType.__init__(self,cycles=1,time_flow=True,**kwds)
@@ -34,9 +43,21 @@ class AggFiscalType(MarkovConsumerType):
         self.time_inv = deepcopy(MarkovConsumerType.time_inv_)
         self.del_from_time_inv('vFuncBool', 'CubicBool')
         self.add_to_time_vary('IncShkDstn','PermShkDstn','TranShkDstn')
-        self.add_to_time_inv('aXtraGrid', 'Rfree')
+        self.add_to_time_inv('aXtraGrid', 'Rfree', 'EGMkernel')
+        if not hasattr(self, 'EGMkernel'):
+            self.EGMkernel = False
+        if getattr(self, 'solution_cache_size', None):
+            self.solution_cache = SolutionCache(self.solution_cache_size)
+        if getattr(self, 'shock_history_cache_size', None):
+            self.shock_history_cache = SolutionCache(self.shock_history_cache_size)
         
     def updateSolutionTerminal(self):
+        # Warm start: begin the infinite horizon iteration from a previously
+        # converged solution with the same Markov states, if one was provided
+        warm_start = getattr(self, 'solution_warm_start', None)
+        if warm_start is not None and len(warm_start.cFunc) == self.MrkvArray[-1].shape[0]:
+            self.solution_terminal = warm_start
+            return
         AggShockConsumerType.update_solution_terminal(self)
         # Make replicated terminal period solution
         StateCount = self.MrkvArray[-1].shape[0]
@@ -44,6 +65,68 @@ class AggFiscalType(MarkovConsumerType):
         self.solution_terminal.vPfunc = StateCount*[self.solution_terminal.vPfunc]
         self.solution_terminal.mNrmMin = StateCount*[self.solution_terminal.mNrmMin]
         
+    def spawn(self, **params):
+        '''
+        Returns a new type that differs from this one only in params, such as
+        DiscFac, AgentCount and seed.  Unlike deepcopy, the new type shares this
+        type's large, parameter-independent inputs by reference: the Markov arrays,
+        the grids, the atoms and probabilities of the income distributions, and the
+        solution (which solve() replaces rather than changes).  Everything else is
+        copied, including the simulation state and the random number generators of
+        the income distributions, so the new type simulates exactly like a deepcopy.
+        '''
+        memo = {}
+        def share(value):
+            memo[id(value)] = value
+        def share_dstn_arrays(value):
+            if isinstance(value, DiscreteDistribution):
+                share(value.pmv)
+                share(value.atoms)
+            elif isinstance(value, list):
+                for item in value:
+                    share_dstn_arrays(item)
+        attrs = dict(getattr(self, 'parameters', {}))
+        attrs.update(vars(self))
+        for name in attrs:
+            value = attrs[name]
+            if value is None:
+                continue
+            if name in self.shared_attrs_ or name.startswith(('MrkvArray', 'CondMrkvArrays', 'MacroMrkvArray')):
+                share(value)
+            elif name.startswith(('IncShkDstn', 'PermShkDstn', 'TranShkDstn')):
+                share_dstn_arrays(value)
+        NewType = deepcopy(self, memo)
+        for key in params:
+            setattr(NewType, key, params[key])
+        return NewType
+        
+    def solve(self, verbose=False):
+        '''
+        Solve the model, unless this type (or a copy of it) has already solved
+        the same problem and the solution is still in its solution_cache.  Types
+        made without a solution_cache_size, and warm-started solves, always solve.
+        '''
+        if getattr(self, 'solution_cache', None) is None or getattr(self, 'solution_warm_start', None) is not None:
+            MarkovConsumerType.solve(self, verbose)
+            return
+        key = self.solution_key()
+        solution = self.solution_cache.get(key)
+        if solution is not None:
+            self.solution = solution
+            return
+        MarkovConsumerType.solve(self, verbose)
+        self.solution_cache.put(key, self.solution)
+        
+    def solution_key(self):
+        '''
+        Returns a hash of everything solveAggConsMarkovALT depends on.  ADFunc
+        enters through its values on Cgrid, the only points it is evaluated at.
+        '''
+        return hash_inputs(self.DiscFac, self.CRRA, self.IncShkDstn, self.MrkvArray, self.Rfree, self.LivPrb,
+                           self.PermGroFac, self.BoroCnstArt, self.aXtraGrid, self.Cgrid, self.CFunc,
+                           self.ADFunc(self.Cgrid, False), self.ADFunc(self.Cgrid, True),
+                           self.num_base_MrkvStates, self.cycles, self.T_cycle, self.tolerance, self.EGMkernel)
+        
     def pre_solve(self):
         self.MrkvArray = self.MrkvArray
         MarkovConsumerType.pre_solve(self)
@@ -128,8 +211,272 @@ class AggFiscalType(MarkovConsumerType):
         self.t_cycle = self.cycle_base.copy()
         self.t_age   = self.age_base.copy()
         self.state_now['PlvlAgg'] = self.PlvlAgg_base
-        
-    def make_idiosyncratic_shock_histories(self):     
+
+    def warm_start_key(self):
+        '''
+        Returns the key of the snapshot that simulate_ergodic starts warm-started
+        simulations from: everything the exogenous states depend on.
+        '''
+        return (self.seed, self.AgentCount, self.T_sim, self.burn_in_periods,
+                hash_inputs(self.IncShkDstn, self.MrkvArray, self.LivPrb, self.UpdatePrb))
+
+    def take_warm_start_snapshot(self):
+        '''
+        Returns the simulation state that the rest of a simulation depends on: the
+        state variables, Markov states, ages and the states of the random number
+        generators.
+        '''
+        return {'state_now' : {var : deepcopy(self.state_now[var]) for var in self.state_now},
+                'shocks' : {var : deepcopy(self.shocks[var]) for var in self.shocks},
+                'MacroMrkvNow' : np.copy(self.MacroMrkvNow),
+                'MicroMrkvNow' : np.copy(self.MicroMrkvNow),
+                'EconomyMrkvNow' : np.copy(self.EconomyMrkvNow),
+                'MrkvNowPcvd' : self.MrkvNowPcvd.copy() if hasattr(self, 'MrkvNowPcvd') else None,
+                't_age' : self.t_age.copy(),
+                't_cycle' : self.t_cycle.copy(),
+                't_sim' : self.t_sim,
+                'RNG' : deepcopy(self.RNG.bit_generator.state),
+                'IncShkRNG' : [[deepcopy(IncShkDstn_j._rng.bit_generator.state) for IncShkDstn_j in IncShkDstn_t]
+                               for IncShkDstn_t in self.IncShkDstn]}
+
+    def restore_warm_start_snapshot(self, snapshot):
+        '''
+        Put the simulation back in the state that take_warm_start_snapshot saved.
+        '''
+        for var in snapshot['state_now']:
+            self.state_now[var] = deepcopy(snapshot['state_now'][var])
+        for var in snapshot['shocks']:
+            self.shocks[var] = deepcopy(snapshot['shocks'][var])
+        self.MacroMrkvNow = np.copy(snapshot['MacroMrkvNow'])
+        self.MicroMrkvNow = np.copy(snapshot['MicroMrkvNow'])
+        self.EconomyMrkvNow = np.copy(snapshot['EconomyMrkvNow'])
+        if snapshot['MrkvNowPcvd'] is not None:
+            self.MrkvNowPcvd = snapshot['MrkvNowPcvd'].copy()
+        self.t_age = snapshot['t_age'].copy()
+        self.t_cycle = snapshot['t_cycle'].copy()
+        self.t_sim = snapshot['t_sim']
+        self.RNG.bit_generator.state = deepcopy(snapshot['RNG'])
+        for IncShkDstn_t, states_t in zip(self.IncShkDstn, snapshot['IncShkRNG']):
+            for IncShkDstn_j, state in zip(IncShkDstn_t, states_t):
+                IncShkDstn_j._rng.bit_generator.state = deepcopy(state)
+
+    def simulate_ergodic(self):
+        '''
+        Simulate to the ergodic distribution, for the estimation objectives.  The
+        first call (for each warm_start_key) does what initialize_sim() followed by
+        simulate() does, and keeps a snapshot of the simulation burn_in_periods
+        periods before its end in warm_start_snapshots.  Later calls are warm
+        started: they restart from that snapshot, with its assets, and simulate
+        only the last burn_in_periods periods, with the same shock draws.
+
+        A warm-started call therefore gives the same agents, shocks and Markov
+        states in period T_sim as a full simulation, and its assets differ only
+        through the assets that the reference simulation (the first call, at its
+        DiscFac) had burn_in_periods periods earlier.  Results depend on the
+        parameters of that first call, but not on the order of later calls, and
+        a call at the parameters of the first call repeats it exactly.
+        '''
+        if not hasattr(self, 'warm_start_snapshots'):
+            self.warm_start_snapshots = {}
+        key = self.warm_start_key()
+        T_ref = max(self.T_sim - self.burn_in_periods, 0)
+        if hasattr(self, 'MrkvNowPcvd'):
+            del self.MrkvNowPcvd
+        self.initialize_sim()
+        if key not in self.warm_start_snapshots:
+            # Reference simulation from the initial distribution, as a newly made type would
+            self.simulate(T_ref)
+            self.warm_start_snapshots[key] = self.take_warm_start_snapshot()
+        else:
+            self.restore_warm_start_snapshot(self.warm_start_snapshots[key])
+        self.simulate(self.T_sim - T_ref)
+
+    def calc_wealth_histogram(self):
+        '''
+        Computes the distribution that simulate() draws its agents from, on a grid
+        instead of by Monte Carlo.  Starting from the population that initialize_sim()
+        makes, the mass on each (Markov state, mNrm, pLvl) gridpoint is carried
+        forward T_sim periods with the model's transition matrix.  Deaths and births
+        follow simulate(): a newborn takes the Markov state of the agent it replaces
+        and has no income shocks in its first period, and neither do the agents that
+        initialize_ages() makes age zero.
+
+        This is not the ergodic distribution that HARK's calc_transition_matrix and
+        calc_ergodic_dist would give, and it does not use them, for three reasons:
+        - The estimation targets come from agents simulated for T_sim periods, and
+          the stationary pLvl distribution has a much fatter upper tail than the
+          simulation ever reaches, so the ergodic distribution would move the targets.
+        - The consumption functions depend on (mNrm, Cratio), and a dense transition
+          matrix over (Markov state, mNrm, pLvl) does not fit in memory.  The matrix
+          is kept factored instead, as a sum over permanent shocks of
+          kron(A, S), with A acting on (Markov state, mNrm) and S on pLvl (see
+          make_histogram_transitions).
+        - mNrm does not depend on pLvl, and pLvl does not depend on mNrm, so until the
+          last hist_joint_periods periods only the distributions of (Markov state, mNrm)
+          and of (Markov state, pLvl) are carried forward.  The joint distribution
+          starts from their product, and the two become correlated again through
+          the permanent shocks they share.  This is the one approximation beyond the
+          grids: any correlation older than hist_joint_periods is lost.
+        Each point's next period mNrm and pLvl are split between the two gridpoints
+        around them, as in calc_transition_matrix, so the moments are continuous in
+        the parameters.  Each such lottery adds a little variance, which would build
+        up in pLvl over T_sim periods, so pLvl is tracked net of its deterministic
+        growth and the permanent shocks are adjusted to offset the rest (see
+        lottery_matched_shocks).  test_calc_wealth_histogram checks the moments
+        against a large simulation.
+
+        The result is stored in wealth_histogram, a dict with the end-of-period
+        aNrm, aLvl and pLvl at each gridpoint with positive mass, and that mass
+        ('prob', summing to one).  The grids have hist_mCount points of mNrm up to
+        hist_mMax, and hist_pCount points of pLvl, evenly spaced in logs over
+        hist_pStds standard deviations of log permanent income after T_sim periods.
+        Agents must know the Markov state (UpdatePrb = 1) and live until they die
+        at random (T_age = None), as in the estimation.
+        '''
+        if self.UpdatePrb < 1.0 or self.T_age is not None:
+            raise ValueError('calc_wealth_histogram requires UpdatePrb = 1 and T_age = None.')
+        StateCount = self.MrkvArray[0].shape[0]
+        PermGroFac = np.asarray(self.PermGroFac[0])
+        mMin = min(np.min(self.IncShkDstn[0][j].atoms[1]) for j in range(StateCount))*self.AggDemandFac
+        mGrid = make_grid_exp_mult(mMin, self.hist_mMax, self.hist_mCount, 3)
+        spread = self.hist_pStds*np.sqrt(self.pLvlInitStd**2 + self.T_sim*self.PermShkStd[0]**2)
+        logpMin = self.pLvlInitMean + min(self.T_sim*np.log(np.min(PermGroFac)), 0.) - spread
+        logpMax = self.pLvlInitMean + max(self.T_sim*np.log(np.max(PermGroFac)), 0.) + spread
+        pGrid = np.exp(np.linspace(logpMin, logpMax, self.hist_pCount))
+
+        # Where newborns start: permanent income from the initial distribution,
+        # and market resources out of aNrmInit with no income shocks.  Each pLvl is
+        # tracked as it will be at the end of the T_sim periods, so that the growth
+        # factor PermGroFac[0] is applied exactly rather than through a lottery in
+        # every period; a newborn, who does not grow in its first period, enters at
+        # its initial pLvl grown by the periods it has left.
+        aNrmInit = np.exp(self.aNrmInitMean)
+        pLvlInitDstn = Lognormal(self.pLvlInitMean, self.pLvlInitStd).discretize(2*self.hist_pCount)
+        def newborn_pLvl(periods_left):
+            i, w = grid_lottery(pGrid, pLvlInitDstn.atoms[0]*PermGroFac[0]**periods_left)
+            return np.bincount(i, w*pLvlInitDstn.pmv, pGrid.size) + np.bincount(i+1, (1.-w)*pLvlInitDstn.pmv, pGrid.size)
+        mNewborn = np.zeros((StateCount*mGrid.size, StateCount))
+        for j in range(StateCount):
+            i, w = grid_lottery(mGrid, np.array([self.Rfree[j]*aNrmInit + self.AggDemandFac]))
+            mNewborn[j*mGrid.size + i[0], j] = w[0]
+            mNewborn[j*mGrid.size + i[0] + 1, j] = 1. - w[0]
+
+        # The population made by initialize_sim: everyone holds aNrmInit, and is
+        # employed or unemployed at the normal rate
+        Dstn = np.zeros((StateCount*mGrid.size, pGrid.size))
+        Dstn[0] = (1.0 - self.Urate_normal)*newborn_pLvl(self.T_sim)
+        Dstn[mGrid.size] = self.Urate_normal*newborn_pLvl(self.T_sim)
+
+        # End-of-period assets at each (Markov state, mNrm) gridpoint
+        cNrm = [self.solution[0].cFunc[j](mGrid, self.Cratio*np.ones(mGrid.size)) for j in range(StateCount)]
+        aNrm = np.concatenate([mGrid - cNrm[j] for j in range(StateCount)])
+
+        # Share of the initial population that initialize_ages() makes age zero,
+        # from the same age distribution as calc_age_distribution()
+        if hasattr(self, 'mortality_off'):
+            AgeZeroShare = 1.0
+        else:
+            LivPrb = self.LivPrb[0][0]
+            AgeZeroShare = (1. - LivPrb)/(1. - LivPrb**401)
+
+        StateSum = sp.kron(sp.identity(StateCount), np.ones((1, mGrid.size)), format='csr')
+        JointStart = max(self.T_sim - self.hist_joint_periods, 0)
+        for t in range(self.T_sim):
+            pNewborn = newborn_pLvl(self.T_sim - t - 1)
+            if t <= 1:
+                Transitions = self.make_histogram_transitions(mGrid, pGrid, aNrmInit*np.ones(aNrm.size) if t == 0 else aNrm)
+            if t < JointStart:
+                if t == 0:
+                    Dstn_m = np.sum(Dstn, axis=1, keepdims=True)
+                    Dstn_p = StateSum @ Dstn
+                if t <= 1:
+                    Transitions_m = [(sum(A for A, S in Transitions), sp.identity(1))]
+                    Transitions_p = [((StateSum @ A @ StateSum.T)/mGrid.size, S) for A, S in Transitions]
+                NoShockShare = AgeZeroShare if t == 0 else 0.
+                Dstn_m = self.step_histogram(Dstn_m, Transitions_m, mNewborn, np.ones(1), NoShockShare)
+                Dstn_p = self.step_histogram(Dstn_p, Transitions_p, np.identity(StateCount), pNewborn, NoShockShare)
+                continue
+            if t == JointStart and t > 0:
+                StatePrb = np.sum(Dstn_p, axis=1)
+                Dstn = Dstn_m*((Dstn_p/np.maximum(StatePrb, 1e-300)[:, None])[np.repeat(np.arange(StateCount), mGrid.size)])
+            Dstn = self.step_histogram(Dstn, Transitions, mNewborn, pNewborn, AgeZeroShare if t == 0 else 0.)
+
+        prob = Dstn.flatten()
+        aNrmAll = np.repeat(aNrm, pGrid.size)
+        pLvlAll = np.tile(pGrid, aNrm.size)
+        these = prob > 0.
+        self.wealth_histogram = {'aNrm' : aNrmAll[these], 'aLvl' : aNrmAll[these]*pLvlAll[these],
+                                 'pLvl' : pLvlAll[these], 'prob' : prob[these]/np.sum(prob[these])}
+
+    def make_histogram_transitions(self, mGrid, pGrid, aNrm):
+        '''
+        Returns the transition matrix of calc_wealth_histogram for survivors that
+        hold end-of-period assets aNrm at each (Markov state, mNrm) gridpoint, as a
+        list of pairs of sparse matrices (A, S), one for each value of the
+        permanent income growth factor.  A moves the mass over (Markov state, mNrm)
+        and S moves it over pLvl, so that the transition matrix over (Markov state,
+        mNrm, pLvl) is the sum over pairs of kron(A, S).  S moves pLvl only by the
+        part of the permanent shock beyond PermGroFac[0] (see calc_wealth_histogram),
+        with the shocks pulled toward their mean by lottery_matched_shocks.
+        '''
+        MrkvArray = self.MrkvArray[0]
+        StateCount = MrkvArray.shape[0]
+        GridCount = StateCount*mGrid.size
+        LivPrb = np.asarray(self.LivPrb[0])
+        PermGroFac = np.asarray(self.PermGroFac[0])
+        GridStep = np.log(pGrid[1]/pGrid[0])
+        rows = np.arange(GridCount)
+        StateNow = rows//mGrid.size
+        entries = dict()
+        for j in range(StateCount):
+            TransPrb = LivPrb[StateNow]*MrkvArray[StateNow, j]
+            these = TransPrb > 0.
+            IncShkDstn = self.IncShkDstn[0][j]
+            pShk = lottery_matched_shocks(GridStep, IncShkDstn.atoms[0]*PermGroFac[j]/PermGroFac[0], IncShkDstn.pmv)
+            for n in range(IncShkDstn.pmv.size):
+                PermShk = IncShkDstn.atoms[0][n]*PermGroFac[j]
+                mNext = self.Rfree[j]*aNrm[these]/PermShk + IncShkDstn.atoms[1][n]*self.AggDemandFac
+                i, w = grid_lottery(mGrid, mNext)
+                prob = TransPrb[these]*IncShkDstn.pmv[n]
+                to_list, from_list, prob_list = entries.setdefault((PermShk, pShk[n]), ([], [], []))
+                to_list += [j*mGrid.size + i, j*mGrid.size + i + 1]
+                from_list += [rows[these], rows[these]]
+                prob_list += [prob*w, prob*(1. - w)]
+        Transitions = []
+        for (PermShk, pShk), (to_list, from_list, prob_list) in entries.items():
+            A = sp.csr_matrix((np.concatenate(prob_list), (np.concatenate(to_list), np.concatenate(from_list))),
+                              shape=(GridCount, GridCount))
+            i, w = grid_lottery(pGrid, pGrid*pShk)
+            cols = np.arange(pGrid.size)
+            S = sp.csr_matrix((np.concatenate((w, 1. - w)), (np.concatenate((i, i+1)), np.concatenate((cols, cols)))),
+                              shape=(pGrid.size, pGrid.size))
+            Transitions.append((A, S))
+        return Transitions
+
+    def step_histogram(self, Dstn, Transitions, NewbornRows, NewbornCols, NoShockShare=0.):
+        '''
+        Moves the mass Dstn, whose rows are grouped by Markov state, forward one
+        period with Transitions from make_histogram_transitions (or their sums over
+        one dimension), and replaces the agents who die with newborns, whose mass
+        is spread as NewbornRows (for each Markov state) times NewbornCols.  A share
+        NoShockShare of the survivors gets no income shocks and moves like a
+        newborn; this is only right in the first period, when every agent still
+        holds the initial assets and permanent income.
+        '''
+        MrkvArray = self.MrkvArray[0]
+        StateCount = MrkvArray.shape[0]
+        DstnNext = np.zeros_like(Dstn)
+        for A, S in Transitions:
+            DstnNext += (S @ (A @ Dstn).T).T
+        DstnNext *= 1. - NoShockShare
+        # Newborns take the Markov state of the agent they replace, which then changes as usual
+        LivPrb = np.asarray(self.LivPrb[0])
+        StateMass = np.sum(Dstn.reshape(StateCount, -1), axis=1)
+        NewbornMass = (1. - LivPrb + NoShockShare*LivPrb)*StateMass
+        DstnNext += np.outer(NewbornRows @ (NewbornMass @ MrkvArray), NewbornCols)
+        return DstnNext
+
+    def make_idiosyncratic_shock_histories(self):
         self.Mrkv_univ = 0
         self.read_shocks = False
         self.make_shock_history()
@@ -139,6 +486,33 @@ class AggFiscalType(MarkovConsumerType):
         self.tran_shock_fixed_hist  = self.shock_history['TranShk'].copy()
         self.unemployment_draw_fixed_hist = self.shock_history['unemployment_draw'].copy()
         self.Mrkv_univ = None
+        self.fixed_shock_history_id = hash_inputs(self.who_dies_fixed_hist, self.update_draw_fixed_hist,
+                                                  self.perm_shock_fixed_hist, self.tran_shock_fixed_hist,
+                                                  self.unemployment_draw_fixed_hist)
+        # Shock histories made from the previous draws will not be used again
+        self.clear_shock_history_cache()
+        
+    def clear_shock_history_cache(self):
+        '''
+        Empties the shock_history_cache of this type (and of its copies, which
+        share it), if it has one.
+        '''
+        if getattr(self, 'shock_history_cache', None) is not None:
+            self.shock_history_cache.clear()
+        
+    def shock_history_key(self, shock_type, CheckAmountNow):
+        '''
+        Returns the key under which hit_with_recession_shock stores the shock
+        histories it makes for shock_type: this type's seed, the shock type, the
+        macro history, and a hash of everything else they are made from: the states
+        agents start in, the conditional Markov arrays, the fixed idiosyncratic
+        draws, the income of the unemployed, and the tax cut or stimulus check.
+        '''
+        TaxCutIncFactor = self.TaxCutIncFactor if shock_type in ('recessionTaxCut', 'TaxCut') else None
+        return (self.seed, shock_type, tuple(self.EconomyMrkvNow_hist[0:self.T_sim]),
+                hash_inputs(self.shocks['Mrkv'], self.CondMrkvArrays, self.MacroMrkvArray.shape,
+                            self.fixed_shock_history_id, self.IncUnemp, self.IncUnempNoBenefits,
+                            TaxCutIncFactor, CheckAmountNow))
         
     def hit_with_recession_shock(self, shock_type):
         '''
@@ -174,6 +548,46 @@ class AggFiscalType(MarkovConsumerType):
         self.MacroMrkvNow = np.floor(self.shocks['Mrkv']/self.num_base_MrkvStates).astype(int)
         MicroMrkvNow_start = copy(self.MicroMrkvNow)
         MacroMrkvNow_start = copy(self.MacroMrkvNow)
+        if shock_type=="recessionCheck" or shock_type=="Check":
+            # Stimulus is a function of permanent income
+            CheckAmountNow = self.get_check_schedule().normalized(self.state_now['pLvl'])
+        else:
+            CheckAmountNow = None
+        # The shock histories only depend on the states agents start in, the macro
+        # history, the fixed idiosyncratic draws and the policy, so reuse them if
+        # these repeat (as they do in every iteration of the AD solution)
+        cache = getattr(self, 'shock_history_cache', None)
+        key = self.shock_history_key(shock_type, CheckAmountNow)
+        stored = cache.get(key) if cache is not None else None
+        if stored is not None:
+            for name in stored:
+                self.shock_history[name][:] = stored[name]
+        else:
+            self.make_counterfactual_shock_history(shock_type, CheckAmountNow)
+            self.t_age = t_age_start
+            self.MicroMrkvNow = MicroMrkvNow_start
+            self.MacroMrkvNow = MacroMrkvNow_start
+            if cache is not None:
+                # Store the Markov states in the smallest integer type that holds every
+                # state; the income shocks stay float64, so a repeated experiment gives
+                # exactly the same results as the first
+                Mrkv_dtype = np.min_scalar_type(self.MrkvArray[0].shape[0]-1)
+                cache.put(key, {'Mrkv' : self.shock_history['Mrkv'].astype(Mrkv_dtype),
+                                'PermShk' : self.shock_history['PermShk'].copy(),
+                                'TranShk' : self.shock_history['TranShk'].copy()})
+        self.shocks['Mrkv'] = self.num_base_MrkvStates*self.MacroMrkvNow + self.MicroMrkvNow
+        
+        self.shock_history['who_dies'] = self.who_dies_fixed_hist
+        self.shock_history['update_draw'] = self.update_draw_fixed_hist
+        self.shock_history['unemployment_draw'] = self.unemployment_draw_fixed_hist
+        
+    def make_counterfactual_shock_history(self, shock_type, CheckAmountNow):
+        '''
+        Makes the Markov state, permanent shock and transitory shock histories of
+        an experiment of shock_type, from the fixed idiosyncratic draws and the
+        states that hit_with_recession_shock put agents in.  CheckAmountNow is
+        each agent's stimulus check (normalized by permanent income), or None.
+        '''
         for t in range(self.T_sim):
             self.t_age = 1 - self.who_dies_fixed_hist[t] # hack to get newborns have t_age=0
             self.MacroMrkvNow = self.EconomyMrkvNow_hist[t] 
@@ -181,29 +595,15 @@ class AggFiscalType(MarkovConsumerType):
             self.get_micro_markv_states_guts(unemployment_draw)
             MrkvNow = self.num_base_MrkvStates*self.MacroMrkvNow + self.MicroMrkvNow
             self.shock_history['Mrkv'][t] = MrkvNow.astype(int)
-        self.t_age = t_age_start
-        self.MicroMrkvNow = MicroMrkvNow_start
-        self.MacroMrkvNow = MacroMrkvNow_start
-        self.shocks['Mrkv'] = self.num_base_MrkvStates*self.MacroMrkvNow + self.MicroMrkvNow
         
         tax_cut_multiplier  = np.ones_like(self.shock_history['Mrkv'])
         CheckAmount         = np.zeros_like(self.shock_history['Mrkv'])
         if shock_type=="recessionTaxCut" or shock_type=="TaxCut":
             tax_cut_states = np.logical_and(np.greater(self.shock_history['Mrkv'], 2*self.num_base_MrkvStates-1), np.less(self.shock_history['Mrkv'],9*2*self.num_base_MrkvStates)) # assumes tax cut last 8 periods
             tax_cut_multiplier[tax_cut_states] *= self.TaxCutIncFactor 
-        elif shock_type=="recessionCheck" or shock_type=="Check":
+        elif CheckAmountNow is not None:
             #This only works because check occurs in first period
-            CheckAmount[0] = self.CheckStimLvl
-            CheckAmount[0] = CheckAmount[0] / self.state_now['pLvl']        
-            for agent in range(len(CheckAmount[0])):
-                # Stimulus is a function of permanent income
-                if self.state_now['pLvl'][agent] < self.CheckStimLvl_PLvl_Cutoff_start:
-                    AgentSpecificScalar = 1
-                elif self.state_now['pLvl'][agent] > self.CheckStimLvl_PLvl_Cutoff_end:
-                    AgentSpecificScalar = 0
-                else:
-                    AgentSpecificScalar = 1-(self.state_now['pLvl'][agent]-self.CheckStimLvl_PLvl_Cutoff_start)/(self.CheckStimLvl_PLvl_Cutoff_end-self.CheckStimLvl_PLvl_Cutoff_start)
-                CheckAmount[0][agent] *= AgentSpecificScalar
+            CheckAmount[0] = CheckAmountNow
                 
         employed = np.equal(self.shock_history['Mrkv']%self.num_base_MrkvStates, 0)
         self.shock_history['PermShk'][employed] = self.perm_shock_fixed_hist[employed]
@@ -215,9 +615,16 @@ class AggFiscalType(MarkovConsumerType):
         self.shock_history['PermShk'][unemp_with_benefits] = 1.0
         self.shock_history['TranShk'][unemp_with_benefits] = self.IncUnemp + CheckAmount[unemp_with_benefits] 
         
-        self.shock_history['who_dies'] = self.who_dies_fixed_hist
-        self.shock_history['update_draw'] = self.update_draw_fixed_hist
-        self.shock_history['unemployment_draw'] = self.unemployment_draw_fixed_hist
+    def get_check_schedule(self):
+        '''
+        Returns the TransferSchedule for the stimulus check: CheckSchedule if
+        this type has one, otherwise CheckStimLvl phased out linearly between
+        the permanent income levels CheckStimLvl_PLvl_Cutoff_start and _end.
+        '''
+        if getattr(self, 'CheckSchedule', None) is not None:
+            return self.CheckSchedule
+        return TransferSchedule(self.CheckStimLvl, 
+                                LinearPhaseOut(self.CheckStimLvl_PLvl_Cutoff_start, self.CheckStimLvl_PLvl_Cutoff_end))
         
     def switch_to_counterfactual_mode(self, shock_type):
         del self.solution
@@ -292,6 +699,9 @@ class AggFiscalType(MarkovConsumerType):
         # update the idiosyncratic state (employed, unemployed with benefits, unemployed without benefits)
         # but leave the macro state as it is (idiosyncratic state is 'modulo self.num_base_MrkvStates')
         self.MrkvNowPcvd = np.remainder(self.shocks['Mrkv'],self.num_base_MrkvStates) + self.num_base_MrkvStates*np.floor_divide(self.MrkvNowPcvd,self.num_base_MrkvStates)
+        # The actual macro and micro states, which agents reading their shocks from shock_history do not draw
+        self.MacroMrkvNow = np.floor_divide(self.shocks['Mrkv'],self.num_base_MrkvStates)
+        self.MicroMrkvNow = np.remainder(self.shocks['Mrkv'],self.num_base_MrkvStates)
         self.state_now["mNrm"] = self.state_now["bNrm"] + self.shocks['TranShk']*self.AggDemandFac # Market resources after income accounting for Agg Demand factor (this is for simulation)
         
     def get_macro_markov_states(self):
@@ -303,22 +713,31 @@ class AggFiscalType(MarkovConsumerType):
         #     dont_change[:] = True
         
         # Determine which agents are in which states right now
-        J = self.CondMrkvArrays[0].shape[0]
-        MicroMrkvPrev = copy(self.MicroMrkvNow)
+        if getattr(self, 'CondMrkvCutoffs_src', None) is not self.CondMrkvArrays:
+            self.make_cond_mrkv_cutoffs()
+        I = min(self.MacroMrkvArray.shape[0], self.CondMrkvCutoffs.shape[0])
+        J = self.CondMrkvCutoffs.shape[1]
+        MicroMrkvPrev = np.asarray(self.MicroMrkvNow)
+        MacroMrkvNow = np.broadcast_to(self.MacroMrkvNow, MicroMrkvPrev.shape)
         MicroMrkvNow = np.zeros(self.AgentCount,dtype=int)
-        MicroMrkvBoolArray = np.zeros((J,self.AgentCount))
-        for j in range(J):
-            MicroMrkvBoolArray[j,:] = MicroMrkvPrev == j
-        
-        # Draw new Markov states for each agent
-        for i in range(self.MacroMrkvArray.shape[0]):
-            Cutoffs = np.cumsum(self.CondMrkvArrays[i],axis=1)
-            macro_match = self.MacroMrkvNow == i
-            for j in range(J):
-                these = np.logical_and(macro_match, MicroMrkvBoolArray[j,:])
-                MicroMrkvNow[these] = np.searchsorted(Cutoffs[j,:],unemployment_draw[these]).astype(int)
+        these = np.logical_and(MacroMrkvNow < I, MicroMrkvPrev < J)
+
+        # Draw new Markov states for each agent: gather each agent's cumulative
+        # transition row and count the cutoffs below its draw, which is exactly
+        # what np.searchsorted returns for that row
+        Cutoffs = self.CondMrkvCutoffs[MacroMrkvNow[these], MicroMrkvPrev[these], :]
+        MicroMrkvNow[these] = np.sum(Cutoffs < unemployment_draw[these][:,None], axis=1)
         MicroMrkvNow[dont_change] = MicroMrkvNow[dont_change]
         self.MicroMrkvNow = MicroMrkvNow.astype(int)
+
+    def make_cond_mrkv_cutoffs(self):
+        '''
+        Stack the cumulative conditional (micro) transition probabilities into
+        a single array indexed by (macro state, micro state now, micro state next).
+        The array is rebuilt whenever CondMrkvArrays is swapped out.
+        '''
+        self.CondMrkvCutoffs = np.stack([np.cumsum(CondMrkvArray,axis=1) for CondMrkvArray in self.CondMrkvArrays])
+        self.CondMrkvCutoffs_src = self.CondMrkvArrays
         
     def get_micro_markov_states(self):
         self.shocks['unemployment_draw'] = Uniform(seed=self.RNG.integers(2**31-1)).draw(self.AgentCount)
@@ -423,18 +842,24 @@ class AggFiscalType(MarkovConsumerType):
         MPCnow = np.zeros(self.AgentCount) + np.nan
         CratioNow = self.get_Cratio_now()
         J = self.MrkvArray[0].shape[0]
-        
-        MrkvBoolArray = np.zeros((J,self.AgentCount), dtype=bool)
-        for j in range(J):
-            MrkvBoolArray[j,:] = j == self.MrkvNowPcvd # agents choose control based on *perceived* Markov state
-        
-        for t in range(self.T_cycle):
-            right_t = t == self.t_cycle
-            for j in range(J):
-                these = np.logical_and(right_t, MrkvBoolArray[j,:])
-                cNrmNow[these] = self.solution[t].cFunc[j](self.state_now['mNrm'][these], CratioNow[these])
-                # Marginal propensity to consume
-                MPCnow[these]  = self.solution[t].cFunc[j].derivativeX(self.state_now['mNrm'][these], CratioNow[these])
+
+        # Sort agents once by (t_cycle, perceived Markov state) so that each
+        # non-empty group is a contiguous slice; agents choose control based
+        # on *perceived* Markov state
+        order, bounds = group_agents_by_state(self.t_cycle*J + self.MrkvNowPcvd, self.T_cycle*J)
+        mNrm_sorted   = self.state_now['mNrm'][order]
+        Cratio_sorted = CratioNow[order]
+        cNrm_sorted   = np.zeros(order.size) + np.nan
+        MPC_sorted    = np.zeros(order.size) + np.nan
+        for g in np.flatnonzero(np.diff(bounds)):
+            t, j = divmod(g, J)
+            these = slice(bounds[g], bounds[g+1])
+            cFunc = self.solution[t].cFunc[j]
+            cNrm_sorted[these] = cFunc(mNrm_sorted[these], Cratio_sorted[these])
+            # Marginal propensity to consume
+            MPC_sorted[these]  = cFunc.derivativeX(mNrm_sorted[these], Cratio_sorted[these])
+        cNrmNow[order] = cNrm_sorted
+        MPCnow[order]  = MPC_sorted
         self.controls['cNrm'] = cNrmNow
         self.state_now['cNrm'] = cNrmNow
         self.MPCNow  = MPCnow
@@ -443,12 +868,111 @@ class AggFiscalType(MarkovConsumerType):
         self.state_now['cLvl_splurge'] = (1.0-self.Splurge)*self.state_now['cLvl'] + self.Splurge*self.state_now['pLvl']*self.shocks['TranShk']*self.AggDemandFac   #added last term relaive to Edmund's Version
         
     def reset(self):
-        return # do nothing           
-            
-            
+        return # do nothing
+
+
+def group_agents_by_state(state, StateCount):
+    '''
+    Sorts agents by a discrete state index so that agents sharing a state
+    occupy a contiguous block, letting a per-state function be evaluated once
+    per non-empty state rather than via a boolean mask over all agents.
+
+    Parameters
+    ----------
+    state : np.array
+        Integer array of discrete states, one per agent.  Agents whose state
+        lies outside [0, StateCount) are left out of every group.
+    StateCount : int
+        Number of possible discrete states.
+
+    Returns
+    -------
+    order : np.array
+        Indices of the grouped agents, sorted by state (stable within a state).
+    bounds : np.array
+        Array of size StateCount+1; agents in state j are order[bounds[j]:bounds[j+1]].
+    '''
+    state = np.asarray(state).astype(int)
+    valid = np.logical_and(state >= 0, state < StateCount)
+    if not np.all(valid):
+        idx = np.flatnonzero(valid)
+        order = idx[np.argsort(state[idx], kind='stable')]
+    else:
+        order = np.argsort(state, kind='stable')
+    counts = np.bincount(state[valid], minlength=StateCount)
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    return order, bounds
+
+
+def grid_lottery(grid, x):
+    '''
+    Splits each value in x between the two points of grid around it, with weights
+    that preserve its mean; values beyond the ends of the grid go to the nearest end.
+
+    Parameters
+    ----------
+    grid : np.array
+        Increasing gridpoints.
+    x : np.array
+        Values to put on the grid.
+
+    Returns
+    -------
+    i : np.array
+        Index of the gridpoint below each value.
+    w : np.array
+        Weight on grid[i]; the rest goes to grid[i+1].
+    '''
+    i = np.clip(np.searchsorted(grid, x) - 1, 0, grid.size - 2)
+    w = np.clip((grid[i+1] - x)/(grid[i+1] - grid[i]), 0., 1.)
+    return i, w
+
+
+def lottery_matched_shocks(GridStep, PermShk, prob):
+    '''
+    Returns the permanent shocks PermShk pulled toward their mean, just enough
+    that their lotteries on a grid evenly spaced in logs (as grid_lottery makes
+    them) have the same mean and variance as PermShk.  A lottery keeps the mean of
+    each shock but adds to its variance, and over many periods the extra variance
+    would spread permanent income much more than simulate() does.  If even the
+    mean shock adds too much variance, every shock becomes the mean.
+
+    Parameters
+    ----------
+    GridStep : float
+        Distance between the logs of neighbouring gridpoints.
+    PermShk : np.array
+        Permanent shocks.
+    prob : np.array
+        Probability of each shock.
+
+    Returns
+    -------
+    PermShkMatched : np.array
+        Shocks to put on the grid in place of PermShk.
+    '''
+    Mean = np.dot(prob, PermShk)
+    Target = np.dot(prob, PermShk**2)
+    def lottery_second_moment(c):
+        Shk = Mean + c*(PermShk - Mean)
+        lo = np.exp(np.floor(np.log(Shk)/GridStep)*GridStep)
+        hi = lo*np.exp(GridStep)
+        return np.dot(prob, (lo + hi)*Shk - lo*hi)
+    # The second moment rises with c, so bisect on it
+    cLo, cHi = 0., 1.
+    if lottery_second_moment(cLo) < Target:
+        for it in range(60):
+            c = 0.5*(cLo + cHi)
+            if lottery_second_moment(c) > Target:
+                cHi = c
+            else:
+                cLo = c
+    return Mean + cLo*(PermShk - Mean)
+
+
 def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,PermGroFac,
                                  MrkvArray,BoroCnstArt,aXtraGrid, Cgrid, CFunc, ADFunc,
-                                 num_experiment_periods, num_base_MrkvStates):
+                                 num_experiment_periods, num_base_MrkvStates, EGMkernel=False):
     '''
     Solves a single period consumption-saving problem with risky income and
     stochastic transitions between discrete states, in a Markov fashion.  Has
@@ -489,6 +1013,11 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
     aXtraGrid: np.array
         Array of "extra" end-of-period asset values-- assets above the
         absolute minimum acceptable level.
+    EGMkernel: bool
+        If True, end-of-period marginal value is computed by the compiled kernels
+        in EGMKernels.py, from the gridpoints that next period's consumption
+        functions were built on (when solution_next has them).  The solution is
+        the same either way, up to differences of order 1e-15.
     Returns
     -------
     solution : ConsumerSolution
@@ -498,18 +1027,50 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
         market resources mNrmMin.  All of these attributes are lists or arrays, 
         with elements corresponding to the current Markov state.  E.g.
         solution.cFunc[0] is the consumption function when in the i=0 Markov
-        state this period.
+        state this period.  The gridpoints the consumption functions are built
+        on are kept in solution.cFuncGrids, for use by the compiled kernels.
     '''
     # Get sizes of grids
     aCount = aXtraGrid.size
     Ccount = Cgrid.size
     StateCount = MrkvArray.shape[0]
+    aGrid = np.insert(aXtraGrid, 0, 0.0)
+    cFuncCnst_f = np.array([[0.0, 0.0], [1.0, 1.0]])
+    cFuncCnst_x = np.array([BoroCnstArt, BoroCnstArt+1.0])
+    cFuncCnst_y = np.array([0.0, 1.0])
+    cFuncGridsNext = getattr(solution_next, 'cFuncGrids', None)
     
     # Loop through next period's states, assuming we reach each one at a time.
     # Construct EndOfPrdvP_cond functions for each state.
     EndOfPrdvPfunc_cond = []
     BoroCnstNat_cond = []
+    EndOfPrdvPnvrs_cond = np.empty((StateCount, aCount+1, Ccount))
+    BoroCnstNat_cond_grid = np.empty((StateCount, Ccount))
     for j in range(StateCount):
+        if EGMkernel and cFuncGridsNext is not None:
+            # Same as below, but working from the gridpoints of next period's
+            # consumption function rather than from tiled arrays
+            ShkPrbsNext = IncShkDstn[j].pmv
+            PermShkValsNext = IncShkDstn[j].atoms[0]
+            ShkCount = ShkPrbsNext.size
+            RecState = np.floor(j/num_base_MrkvStates) % 2 == 1
+            Cnext_array = np.repeat(np.reshape(Cgrid, (Ccount, 1)), ShkCount, axis=1)
+            TranShkValsNext = ADFunc(Cnext_array, RecState)*IncShkDstn[j].atoms[1]
+            aNrmMin_candidates = solution_next.mNrmMin[j](Cnext_array) - TranShkValsNext
+            BoroCnstNat_vec = np.max(aNrmMin_candidates, axis=1)
+            aNrmNow = np.reshape(BoroCnstNat_vec, (Ccount, 1)) + aXtraGrid
+            EndOfPrdvP = calc_EndOfPrdvP_cond(aNrmNow, Cgrid, ShkPrbsNext, PermShkValsNext, TranShkValsNext,
+                                              Rfree[j], PermGroFac[j], DiscFac, CRRA,
+                                              cFuncGridsNext[0][j], cFuncGridsNext[1][j], cFuncGridsNext[2][j],
+                                              cFuncCnst_f, cFuncCnst_x, cFuncCnst_y)
+            EndOfPrdvPfunc_cond.append(None)
+            BoroCnstNat_cond.append(LinearInterp(Cgrid, BoroCnstNat_vec))
+            BoroCnstNat_cond_grid[j] = BoroCnstNat_vec
+            EndOfPrdvPnvrs_cond[j, 0, :] = 0.0
+            EndOfPrdvPnvrs_cond[j, 1:, :] = np.transpose(EndOfPrdvP**(-1./CRRA))
+            continue
+        
+
         # Unpack next period's solution
         vPfuncNext = solution_next.vPfunc[j]
         mNrmMinNext = solution_next.mNrmMin[j]
@@ -564,15 +1125,16 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
         # Make the conditional end-of-period marginal value function
         BoroCnstNat = LinearInterp(Cgrid, BoroCnstNat_vec)
         EndOfPrdvPnvrs = np.concatenate((np.zeros((Ccount, 1)), EndOfPrdvP**(-1./CRRA)), axis=1)
-        EndOfPrdvPnvrsFunc_base = BilinearInterp(np.transpose(EndOfPrdvPnvrs), np.insert(aXtraGrid, 0, 0.0), Cgrid)
+        EndOfPrdvPnvrsFunc_base = BilinearInterp(np.transpose(EndOfPrdvPnvrs), aGrid, Cgrid)
         EndOfPrdvPnvrsFunc = VariableLowerBoundFunc2D(EndOfPrdvPnvrsFunc_base, BoroCnstNat)
         EndOfPrdvPfunc_cond.append(MargValueFunc2D(EndOfPrdvPnvrsFunc, CRRA))
         BoroCnstNat_cond.append(BoroCnstNat)
+        BoroCnstNat_cond_grid[j] = BoroCnstNat_vec
+        EndOfPrdvPnvrs_cond[j] = np.transpose(EndOfPrdvPnvrs)
         
     # Prepare some objects that are the same across all current states
     aXtra_tiled = np.tile(np.reshape(aXtraGrid, (1, aCount)), (Ccount, 1))
-    cFuncCnst = BilinearInterp(np.array([[0.0, 0.0], [1.0, 1.0]]),
-                               np.array([BoroCnstArt, BoroCnstArt+1.0]), np.array([0.0, 1.0]))
+    cFuncCnst = BilinearInterp(cFuncCnst_f, cFuncCnst_x, cFuncCnst_y)
 
     # Now loop through *this* period's discrete states, calculating end-of-period
     # marginal value (weighting across state transitions), then construct consumption
@@ -580,13 +1142,17 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
     cFuncNow = []
     vPfuncNow = []
     mNrmMinNow = []
+    mNrmGridNow = np.empty((StateCount, Ccount, aCount+1))
+    cNrmGridNow = np.empty((StateCount, Ccount, aCount+1))
+    BoroCnstNatGridNow = np.empty((StateCount, Ccount))
     for i in range(StateCount):
         # Find natural borrowing constraint for this state by Cratio NOTE THIS CODE IS NOT 100% CHECKED AND SHOULD BE LOOKED OVER
         aNrmMin_candidates = np.zeros((StateCount, Ccount)) + np.nan
-        for j in range(StateCount):
-            if MrkvArray[i, j] > 0.:  # Irrelevant if transition is impossible
-                Cnext = CFunc[i][j](Cgrid)
-                aNrmMin_candidates[j, :] = BoroCnstNat_cond[j](Cnext)
+        NextStates = np.flatnonzero(MrkvArray[i] > 0.)  # Irrelevant if transition is impossible
+        Cnext_by_state = np.empty((NextStates.size, Ccount))
+        for idx, j in enumerate(NextStates):
+            Cnext_by_state[idx] = CFunc[i][j](Cgrid)
+            aNrmMin_candidates[j, :] = BoroCnstNat_cond[j](Cnext_by_state[idx])
         aNrmMin_vec = np.nanmax(aNrmMin_candidates, axis=0)
         BoroCnstNat_vec = aNrmMin_vec
 
@@ -603,14 +1169,16 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
         # mNrmMinNow.append(mNrmMin)
         
         # Loop through feasible transitions and calculate end-of-period marginal value
-        EndOfPrdvP = np.zeros((Ccount, aCount))
-        for j in range(StateCount):
-            if MrkvArray[i, j] > 0.:
-                Cnext = CFunc[i][j](Cgrid)
-                Cnext_tiled = np.tile(np.reshape(Cnext, (Ccount, 1)), (1, aCount))
+        if EGMkernel:
+            EndOfPrdvP = calc_EndOfPrdvP(aNrmNow_tiled, Cnext_by_state, MrkvArray[i, NextStates], NextStates,
+                                         aGrid, Cgrid, EndOfPrdvPnvrs_cond, BoroCnstNat_cond_grid, CRRA, LivPrb[i])
+        else:
+            EndOfPrdvP = np.zeros((Ccount, aCount))
+            for idx, j in enumerate(NextStates):
+                Cnext_tiled = np.tile(np.reshape(Cnext_by_state[idx], (Ccount, 1)), (1, aCount))
                 temp = EndOfPrdvPfunc_cond[j](aNrmNow_tiled, Cnext_tiled)
                 EndOfPrdvP += MrkvArray[i, j]*temp                    
-        EndOfPrdvP *= LivPrb[i] # Account for survival out of the current state
+            EndOfPrdvP *= LivPrb[i] # Account for survival out of the current state
         
         # Calculate consumption and the endogenous mNrm gridpoints for this state
         cNrmNow = EndOfPrdvP**(-1./CRRA)
@@ -622,10 +1190,13 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
             c_temp = np.insert(cNrmNow[n, :], 0, 0.0)  # Add point at bottom
             m_temp = np.insert(mNrmNow[n, :] - BoroCnstNat_vec[n], 0, 0.0)
             cFuncBaseByC_list.append(LinearInterp(m_temp, c_temp))
+            mNrmGridNow[i, n] = m_temp
+            cNrmGridNow[i, n] = c_temp
             # Add the C-specific consumption function to the list
             
         # Construct the unconstrained consumption function by combining the C-specific functions
         BoroCnstNat = LinearInterp(Cgrid, BoroCnstNat_vec)
+        BoroCnstNatGridNow[i] = BoroCnstNat_vec
         cFuncBase = LinearInterpOnInterp1D(cFuncBaseByC_list, Cgrid)
         cFuncUnc = VariableLowerBoundFunc2D(cFuncBase, BoroCnstNat)
 
@@ -640,6 +1211,7 @@ def solveAggConsMarkovALT(solution_next,IncShkDstn,LivPrb,DiscFac,CRRA,Rfree,Per
 
     # Pack up and return the solution
     solution_now = ConsumerSolution(cFunc=cFuncNow, vPfunc=vPfuncNow, mNrmMin=mNrmMinNow)
+    solution_now.cFuncGrids = (mNrmGridNow, cNrmGridNow, BoroCnstNatGridNow)
     return solution_now
 
 
@@ -673,7 +1245,10 @@ class AggregateDemandEconomy(Market):
             EconomyMrkvNow = self.EconomyMrkvNow_hist[self.Shk_idx-1]   
         EconomyMrkvNext = self.EconomyMrkvNow_hist[self.Shk_idx]
         if hasattr(self,'base_AggCons'):
-            cLvl_all_splurge = np.concatenate([this_cLvl for this_cLvl in cLvl_splurge])      
+            if len(cLvl_splurge) == 1: # e.g. reaped from a FusedPopulation
+                cLvl_all_splurge = cLvl_splurge[0]
+            else:
+                cLvl_all_splurge = np.concatenate([this_cLvl for this_cLvl in cLvl_splurge])      
             AggCons   = np.sum(cLvl_all_splurge)
             self.Cratio = AggCons/self.base_AggCons[self.Shk_idx] 
             CratioNext = self.CFunc[EconomyMrkvNow*self.num_base_MrkvStates][EconomyMrkvNext*self.num_base_MrkvStates](self.Cratio)
@@ -751,38 +1326,34 @@ class AggregateDemandEconomy(Market):
             ThisType.EconomyMrkvNow_hist = self.EconomyMrkvNow_hist
             ThisType.hit_with_recession_shock(shock_type)
             PopCount += ThisType.AgentCount
-        self.make_history()
-        
+        if getattr(self, 'fused_simulation', False):
+            population = self.make_history_fused()
+        else:
+            population = None
+            self.make_history()
         
+        # Histories of all agents, type by type along the second axis
+        def stack_agents(var_name, source='history'):
+            if population is not None:
+                return getattr(population, source)[var_name]
+            return np.concatenate([getattr(ThisType, source)[var_name] for ThisType in self.agents], axis=1)
            
         # Extract simulated consumption, labor income, and weight data
-        cNrm_all    = np.concatenate([ThisType.history['cNrm'] for ThisType in self.agents], axis=1)
-        Mrkv_hist   = np.concatenate([ThisType.shock_history['Mrkv'] for ThisType in self.agents], axis=1)
-        pLvl_all    = np.concatenate([ThisType.history['pLvl'] for ThisType in self.agents], axis=1)
-        TranShk_all = np.concatenate([ThisType.shock_history['TranShk'] for ThisType in self.agents], axis=1)
-        mNrm_all    = np.concatenate([ThisType.history['mNrm'] for ThisType in self.agents], axis=1)
-        aNrm_all    = np.concatenate([ThisType.history['aNrm'] for ThisType in self.agents], axis=1)
-        cLvl_all    = np.concatenate([ThisType.history['cLvl'] for ThisType in self.agents], axis=1)
-        cLvl_all_splurge = np.concatenate([ThisType.history['cLvl_splurge'] for ThisType in self.agents], axis=1)
+        cNrm_all    = stack_agents('cNrm')
+        Mrkv_hist   = stack_agents('Mrkv', 'shock_history')
+        pLvl_all    = stack_agents('pLvl')
+        TranShk_all = stack_agents('TranShk', 'shock_history')
+        mNrm_all    = stack_agents('mNrm')
+        aNrm_all    = stack_agents('aNrm')
+        cLvl_all    = stack_agents('cLvl')
+        cLvl_all_splurge = stack_agents('cLvl_splurge')
         
         IndIncome = pLvl_all*TranShk_all*np.array(self.history['AggDemandFacPrev'])[:,None]
         AggIncome = np.sum(IndIncome,1)
         AggCons   = np.sum(cLvl_all_splurge,1)
         
-        # Function calculates the net present value of X, which can be income or consumption
-        # Periods defintes the horizon of the NPV measure, R the interest rate at which future income is discounted
-        def calculate_NPV(X,Periods,R):
-            NPV_discount = np.zeros(Periods)
-            for t in range(Periods):
-                NPV_discount[t] = 1/(R**t)
-            NPV = np.zeros(Periods)
-            for t in range(Periods):
-                NPV[t] = np.sum(X[0:t+1]*NPV_discount[0:t+1])    
-            return NPV
-
-        # calculate NPV
-        NPV_AggIncome = calculate_NPV(AggIncome,self.act_T,ThisType.Rfree[0])
-        NPV_AggCons   = calculate_NPV(AggCons,self.act_T,ThisType.Rfree[0])
+        # calculate NPV of income and consumption at every horizon, in one pass
+        NPV_AggIncome, NPV_AggCons = calculate_NPV(np.vstack((AggIncome, AggCons)),self.act_T,ThisType.Rfree[0])
         
         # calculate Cratio_hist
         if hasattr(self,'base_AggCons'):
@@ -825,6 +1396,29 @@ class AggregateDemandEconomy(Market):
                 
         return return_dict
 
+    def make_history_fused(self):
+        '''
+        Does the same as make_history, but simulates all agent types at once as
+        a FusedPopulation rather than calling each type's market_action in turn.
+        Requires the agents to read their shocks from shock_history, as they do
+        in run_experiment.
+        
+        Returns
+        -------
+        population : FusedPopulation
+            The stacked population, holding the histories of all agents.
+        '''
+        self.reset()
+        population = FusedPopulation(self.agents)
+        for t in range(self.act_T):
+            self.sow()
+            population.simulate_one_period(self.sow_state['Cratio'], self.sow_state['AggDemandFac'])
+            self.reap_state['cLvl_splurge'] = [population.state_now['cLvl_splurge']]
+            self.mill()
+            self.store()
+        population.finish()
+        return population
+
     def calc_CFunc(self):
         StateCount = self.MrkvArray[0].shape[0]
         CFunc_all = []
@@ -878,13 +1472,131 @@ class AggregateDemandEconomy(Market):
         self.stored_solutions = dict()
         self.store_ADsolution('baseline')
             
-    def store_ADsolution(self, name):
+    def store_ADsolution(self, name, inputs_hash=None, ADiterations=0):
+        '''
+        Keep the current CFunc and agent solutions under the given name. If
+        ADsolution_cache_dir is set and inputs_hash is given, the solution is
+        also written to disk so that later runs (or other processes) can reuse it.
+        '''
         self.stored_solutions[name] = Model()
         self.stored_solutions[name].CFunc = copy(self.CFunc)
         self.stored_solutions[name].ADelasticity = self.ADelasticity
+        self.stored_solutions[name].MrkvArray = self.MrkvArray
+        self.stored_solutions[name].ADiterations = ADiterations
         self.stored_solutions[name].agent_solutions = []
         for i in range(len(self.agents)):
             self.stored_solutions[name].agent_solutions.append(copy(self.agents[i].solution))
+        cache_dir = getattr(self, 'ADsolution_cache_dir', None)
+        if cache_dir is None or inputs_hash is None:
+            return
+        os.makedirs(cache_dir, exist_ok=True)
+        # The small CFunc record is read when looking for a seed, the agent
+        # solutions only when the inputs hash matches
+        record = Model()
+        record.CFunc = self.stored_solutions[name].CFunc
+        record.ADelasticity = self.ADelasticity
+        record.MrkvArray = self.MrkvArray
+        record.ADiterations = ADiterations
+        record.inputs_hash = inputs_hash
+        write_pickle_atomic(cache_dir + name + '_solutions.pkl', self.stored_solutions[name].agent_solutions)
+        write_pickle_atomic(cache_dir + name + '_CFunc.pkl', record)
+        
+    def load_ADsolution(self, name, inputs_hash, shock_type):
+        '''
+        Restore the AD solution stored on disk under name if it was computed
+        from inputs with the same hash. Returns True if a solution was loaded.
+        '''
+        cache_dir = getattr(self, 'ADsolution_cache_dir', None)
+        if cache_dir is None:
+            return False
+        record = read_pickle_if_exists(cache_dir + name + '_CFunc.pkl')
+        if record is None or record.inputs_hash != inputs_hash:
+            return False
+        agent_solutions = read_pickle_if_exists(cache_dir + name + '_solutions.pkl')
+        if agent_solutions is None or len(agent_solutions) != len(self.agents):
+            return False
+        self.ADelasticity = record.ADelasticity
+        self.update()
+        self.CFunc = record.CFunc
+        for i in range(len(self.agents)):
+            agent = self.agents[i]
+            agent.CFunc = self.CFunc
+            agent.solution = agent_solutions[i]
+            # Mark the solution as belonging to this shock_type's Markov arrays
+            # so that run_experiment does not solve the agent again
+            agent.update_mrkv_array(shock_type)
+            agent.MrkvArray_prev = agent.MrkvArray
+        self.store_ADsolution(name, ADiterations=record.ADiterations)
+        return True
+    
+    def snapshot_ADsolution_cache(self):
+        '''
+        Reads the CFunc records in ADsolution_cache_dir, newest first, as the
+        on-disk seeds for closest_ADsolution_CFunc. Call it before any AD
+        solution of the run is computed: records written later (e.g. by tasks
+        running at the same time) are never used as seeds, so the result of a
+        run does not depend on the order in which its tasks finish.
+        '''
+        self.ADsolution_seed_records = []
+        cache_dir = getattr(self, 'ADsolution_cache_dir', None)
+        if cache_dir is None or not os.path.isdir(cache_dir):
+            return
+        records = []
+        for filename in os.listdir(cache_dir):
+            if not filename.endswith('_CFunc.pkl'):
+                continue
+            record = read_pickle_if_exists(cache_dir + filename)
+            if record is not None:
+                records.append((-os.path.getmtime(cache_dir + filename), filename[:-len('_CFunc.pkl')], record))
+        self.ADsolution_seed_records = [(key, record) for (order, key, record) in sorted(records, key=lambda x: x[:2])]
+    
+    def closest_ADsolution_CFunc(self, name):
+        '''
+        Returns the CFunc of the stored AD equilibrium whose Markov array is
+        closest to the current one, to use as the starting guess of the AD
+        iteration, or None if there is no such equilibrium. The candidates are
+        the equilibria stored in memory and those on disk when
+        snapshot_ADsolution_cache was called. Only fully iterated equilibria of
+        the same dimension are considered; ties go to the most recently stored one.
+        '''
+        records = [record for (key, record) in reversed(list(self.stored_solutions.items())) if key != name]
+        records += [record for (key, record) in getattr(self, 'ADsolution_seed_records', [])
+                    if key != name and key not in self.stored_solutions]
+        best_CFunc = None
+        best_dist = np.inf
+        for record in records:
+            if record.ADiterations <= 1 or len(record.CFunc) != len(self.CFunc):
+                continue
+            if len(record.MrkvArray) != len(self.MrkvArray) or \
+                    any(A.shape != B.shape for (A, B) in zip(record.MrkvArray, self.MrkvArray)):
+                continue
+            dist = max(np.max(np.abs(A - B)) for (A, B) in zip(record.MrkvArray, self.MrkvArray))
+            if dist < best_dist:
+                best_dist = dist
+                best_CFunc = record.CFunc
+        return best_CFunc
+    
+    def AD_inputs_hash(self, shock_type, num_max_iterations, convergence_cutoff, experiment_dict):
+        '''
+        Hash of everything that solveAD_Recession's result depends on: every
+        parameter of the economy and of each agent type (at its current value),
+        the Markov arrays and income distributions of every shock type, the
+        grids, the agents' starting states, the baseline path of aggregate
+        consumption, and the settings of the AD iteration and of the experiments
+        it runs (experiment_dict). Parameters that the AD iteration sets itself
+        (the economy's ADelasticity, and the agents' experiment settings that
+        run_experiment assigns from experiment_dict) are left out, so the hash
+        does not depend on which experiments ran before, and so is the size of
+        the shock history cache, which does not change the results.
+        '''
+        agent_keys = ['Splurge', 'T_sim', 'tolerance', 'AgentCount', 'DiscFac', 'seed', 'aXtraGrid', 'Cgrid',
+                      'IncShkDstn', 'MrkvArray', 'CondMrkvArrays', 'aNrm_base', 'pLvl_base', 'Mrkv_base']
+        economy_keys = ['base_AggCons', 'act_T', 'CgridBase', 'MrkvArray']
+        return hash_inputs(shock_type, num_max_iterations, convergence_cutoff, experiment_dict,
+                           AD_hash_attributes(self, economy_keys, exclude=['ADelasticity']),
+                           [AD_hash_attributes(agent, agent_keys, exclude=['use_prestate', 'shock_type', 'UpdatePrb',
+                                                                           'shock_history_cache_size'])
+                            for agent in self.agents])
                        
     def restore_ADsolution(self,name):
         self.CFunc = self.stored_solutions[name].CFunc
@@ -897,9 +1609,34 @@ class AggregateDemandEconomy(Market):
         for agent in self.agents:
             agent.make_idiosyncratic_shock_histories()
             
-    def solve(self):
+    def clear_shock_history_caches(self):
+        '''
+        Frees the shock histories that the agents have kept from past experiments;
+        call this when a family of experiments (with the same shock type and macro
+        histories) is done.
+        '''
+        for agent in self.agents:
+            agent.clear_shock_history_cache()
+            
+    def solve(self, warm_start=False):
+        '''
+        Solve each agent type. With warm_start=True, each type's backward
+        iteration starts from its current solution instead of the terminal period.
+        '''
         for agent in self.agents:
+            if warm_start and hasattr(agent, 'solution'):
+                agent.solution_warm_start = agent.solution[0]
             agent.solve()
+            agent.solution_warm_start = None
+
+    def solve_for_experiment(self, shock_type):
+        '''
+        Swap in each agent's Markov arrays for shock_type and re-solve the agents
+        whose MrkvArray changed, exactly as run_experiment does before simulating.
+        '''
+        for agent in self.agents:
+            agent.update_mrkv_array(shock_type)
+            agent.solve_if_changed()
             
     def Macro_2_Micro_CFunc(self, MacroCFunc):
         '''
@@ -943,24 +1680,77 @@ class AggregateDemandEconomy(Market):
         print('Total Diff in CFunc: ', Total_Diff)
         return Total_Diff
     
+    def AD_CFunc_pairs(self):
+        '''
+        Returns the (from, to) macro state pairs whose Cratio intercepts are
+        solved for in the AD fixed point of solveAD_Recession, in order.
+        '''
+        n = self.num_experiment_periods
+        return [(0,3)] + [(2*j+3,2*j+5) for j in range(n-1)] + [(2*n+1,1), (1,1)]
+    
+    def anderson_CFunc_step(self, Old_Cfunc, MacroCFunc, X_hist, G_hist):
+        '''
+        Makes the next guess for CFunc in solveAD_Recession by Anderson
+        acceleration on the vector of Cratio intercepts, rather than a damped
+        step towards the newly implied intercepts.  X_hist and G_hist hold the
+        previous guesses and implied intercepts and are updated in place.
+        '''
+        nb = self.num_base_MrkvStates
+        pairs = self.AD_CFunc_pairs()
+        X_hist.append(np.array([Old_Cfunc[i*nb][j*nb].intercept for (i,j) in pairs]))
+        G_hist.append(np.array([MacroCFunc[i][j].intercept for (i,j) in pairs]))
+        del X_hist[:-(self.Cfunc_iter_memory+1)]
+        del G_hist[:-(self.Cfunc_iter_memory+1)]
+        x_next = anderson_update(X_hist, G_hist, self.Cfunc_iter_stepsize)
+        
+        dim = int(len(self.CFunc)/nb)
+        MacroCFunc_next = [[CRule(1.0,0.0) for i in range(dim)] for j in range(dim)]
+        for (i,j), x in zip(pairs, x_next):
+            MacroCFunc_next[i][j] = CRule(x,0.0)
+        return self.Macro_2_Micro_CFunc(MacroCFunc_next)
+    
     def solveAD_Recession(self, num_max_iterations, convergence_cutoff=1E-3, name = None, shock_type = "recession"):
+        # Reuse a stored solution computed from the same inputs, if there is one
+        recession_dict = {
+             'shock_type' : shock_type,
+             'UpdatePrb': 1.0,
+             'Splurge': 0.32,
+             }
+        inputs_hash = None
+        if name != None and getattr(self, 'ADsolution_cache_dir', None) is not None:
+            inputs_hash = self.AD_inputs_hash(shock_type, num_max_iterations, convergence_cutoff, recession_dict)
+            if self.load_ADsolution(name, inputs_hash, shock_type):
+                print("Loaded stored AD solution " + name)
+                return
+        
         #reset Cfunc
         dim = len(self.CFunc)
         self.CFunc = [[CRule(1.0,0.0) for i in range(dim)] for j in range(dim)]
-        for agent in self.agents:
-            agent.CFunc = self.CFunc
-        print("Presolving")
-        self.solve()
+        # Optionally start from the closest stored AD equilibrium instead. A single 
+        # iteration is the first round AD effect, which has to start from no AD.
+        seed_CFunc = None
+        if getattr(self, 'ADsolution_seed', False) and num_max_iterations > 1:
+            seed_CFunc = self.closest_ADsolution_CFunc(name)
+        if seed_CFunc is None:
+            for agent in self.agents:
+                agent.CFunc = self.CFunc
+            print("Presolving")
+            self.solve()
                 
         self.ADelasticity = self.demand_ADelasticity
         self.update()    
-        recession_dict = {
-             'shock_type' : shock_type,
-             'UpdatePrb': 1.0,
-             'Splurge': 0.32,
-             }
+        if seed_CFunc is not None:
+            self.CFunc = [[CRule(seed_CFunc[i][j].intercept, seed_CFunc[i][j].slope) for j in range(dim)] for i in range(dim)]
+            for agent in self.agents:
+                agent.CFunc = self.CFunc
+            print("Presolving from the closest stored AD solution")
+            self.solve()
         dim = int(len(self.CFunc)/self.num_base_MrkvStates)
         MacroCFunc = [[CRule(1.0,0.0) for i in range(dim)] for j in range(dim)]  
+        iter_method = getattr(self, 'Cfunc_iter_method', 'damped')
+        warm_start  = getattr(self, 'Cfunc_iter_warm_start', False)
+        X_hist = []
+        G_hist = []
         for i in range(num_max_iterations):
             print("Iteration ", i+1,":")
             recession_dict['EconomyMrkv_init'] = list(np.arange(1,self.num_experiment_periods+1)*2+1) + [1]*12 + [0]*20
@@ -982,19 +1772,22 @@ class AggregateDemandEconomy(Market):
             Old_Cfunc  = self.CFunc
             New_Cfunc  = self.Macro_2_Micro_CFunc(MacroCFunc)
             
-            step = self.Cfunc_iter_stepsize 
-            dim = int(len(self.CFunc))
-            Step_Cfunc = [[CRule(1.0,0.0) for i in range(dim)] for j in range(dim)]
-            for ii in range(dim):
-                for jj in range(dim):
-                    Step_Cfunc[ii][jj].slope      = Old_Cfunc[ii][jj].slope     + step*(New_Cfunc[ii][jj].slope-Old_Cfunc[ii][jj].slope)
-                    Step_Cfunc[ii][jj].intercept  = Old_Cfunc[ii][jj].intercept + step*(New_Cfunc[ii][jj].intercept-Old_Cfunc[ii][jj].intercept)
+            if iter_method == 'anderson':
+                Step_Cfunc = self.anderson_CFunc_step(Old_Cfunc, MacroCFunc, X_hist, G_hist)
+            else:
+                step = self.Cfunc_iter_stepsize 
+                dim = int(len(self.CFunc))
+                Step_Cfunc = [[CRule(1.0,0.0) for i in range(dim)] for j in range(dim)]
+                for ii in range(dim):
+                    for jj in range(dim):
+                        Step_Cfunc[ii][jj].slope      = Old_Cfunc[ii][jj].slope     + step*(New_Cfunc[ii][jj].slope-Old_Cfunc[ii][jj].slope)
+                        Step_Cfunc[ii][jj].intercept  = Old_Cfunc[ii][jj].intercept + step*(New_Cfunc[ii][jj].intercept-Old_Cfunc[ii][jj].intercept)
                     
             self.CFunc = Step_Cfunc
             for agent in self.agents:
                 agent.CFunc = self.CFunc
             print("solving again...")
-            self.solve()
+            self.solve(warm_start=warm_start)
             
             
             Total_Diff = self.Compare_CFunc_Convergence(Old_Cfunc,self.CFunc)
@@ -1006,7 +1799,7 @@ class AggregateDemandEconomy(Market):
                 print("Convergence criterion not reached.")
                 
         if name != None:
-            self.store_ADsolution(name)
+            self.store_ADsolution(name, inputs_hash, ADiterations=i+1)
             
             
     def solveAD_Check_Recession(self, num_max_iterations, convergence_cutoff=1E-3, name = None):
@@ -1020,6 +1813,344 @@ class AggregateDemandEconomy(Market):
             
             
 
+class FusedPopulation():
+    '''
+    The simulated agents of a list of AggFiscalTypes stacked type by type into
+    single arrays, so that each period is simulated with one set of array
+    operations for the whole population instead of one per type. Each type's
+    state arrays become views into the stacked arrays, which lets births, which
+    use each type's own random number generator, still be done by the type.
+    
+    This replicates AgentType.simulate for AggFiscalTypes that read their
+    shocks from shock_history; the types must share num_base_MrkvStates and 
+    the number of Markov states. As in AggFiscalType.get_states, MacroMrkvNow
+    and MicroMrkvNow are split out of each period's Markov state.
+    '''
+    def __init__(self, agents):
+        self.agents = agents
+        counts = [ThisType.AgentCount for ThisType in agents]
+        bounds = np.concatenate([[0], np.cumsum(counts)]).astype(int)
+        self.slices = [slice(bounds[i], bounds[i+1]) for i in range(len(agents))]
+        self.type_id = np.repeat(np.arange(len(agents)), counts)
+        self.t_sim = agents[0].t_sim
+        self.T_sim = agents[0].T_sim
+        self.track_vars = agents[0].track_vars
+        self.num_base_MrkvStates = agents[0].num_base_MrkvStates
+        self.StateCount = agents[0].MrkvArray[0].shape[0]
+        self.T_cycle = max(ThisType.T_cycle for ThisType in agents)
+        def stack(arrays):
+            return np.concatenate(arrays)
+        
+        # Stack idiosyncratic states and point each type's arrays at its block;
+        # aggregate states such as PlvlAgg stay with each type
+        self.state_now = dict()
+        for var in agents[0].state_now:
+            if all(isinstance(ThisType.state_now[var], np.ndarray) and ThisType.state_now[var].size == ThisType.AgentCount 
+                   for ThisType in agents):
+                self.state_now[var] = stack([ThisType.state_now[var] for ThisType in agents]).astype(float)
+        self.t_age = stack([ThisType.t_age for ThisType in agents])
+        self.t_cycle = stack([ThisType.t_cycle for ThisType in agents])
+        self.Mrkv = stack([ThisType.shocks['Mrkv'] for ThisType in agents]).astype(int)
+        for (ThisType, these) in zip(agents, self.slices):
+            for var in self.state_now:
+                ThisType.state_now[var] = self.state_now[var][these]
+            ThisType.t_age = self.t_age[these]
+            ThisType.t_cycle = self.t_cycle[these]
+            ThisType.shocks['Mrkv'] = self.Mrkv[these]
+        
+        # Shock histories, and per agent copies of the type level parameters
+        self.shock_history = dict()
+        for var in agents[0].shock_vars:
+            self.shock_history[var] = np.concatenate([ThisType.shock_history[var] for ThisType in agents], axis=1)
+        self.shocks = dict()
+        self.RfreeTable = np.stack([ThisType.Rfree for ThisType in agents])
+        self.T_cycle_all = np.repeat([ThisType.T_cycle for ThisType in agents], counts)
+        self.Splurge = np.repeat([ThisType.Splurge for ThisType in agents], counts)
+        self.how_many_update = np.repeat([int(round(ThisType.UpdatePrb*ThisType.AgentCount)) for ThisType in agents], counts)
+        
+        # Perceived Markov states carry over from the previous simulation; types
+        # that have none yet take the actual state in the first period
+        self.Pcvd_missing = np.repeat([not hasattr(ThisType, 'MrkvNowPcvd') for ThisType in agents], counts)
+        self.MrkvNowPcvd = np.zeros(bounds[-1], dtype=int)
+        for (ThisType, these) in zip(agents, self.slices):
+            if hasattr(ThisType, 'MrkvNowPcvd'):
+                self.MrkvNowPcvd[these] = ThisType.MrkvNowPcvd
+        
+        self.MacroMrkvNow = np.floor_divide(self.Mrkv, self.num_base_MrkvStates)
+        self.MicroMrkvNow = np.remainder(self.Mrkv, self.num_base_MrkvStates)
+        
+        self.history = dict()
+        for var_name in self.track_vars:
+            self.history[var_name] = np.empty((self.T_sim, bounds[-1])) + np.nan
+                
+    def simulate_one_period(self, Cratio, AggDemandFac):
+        '''
+        Simulate one period for every agent, as AggFiscalType.simulate(1) does
+        for the agents of one type.
+        
+        Parameters
+        ----------
+        Cratio : float
+            This period's ratio of aggregate consumption to its baseline level.
+        AggDemandFac : float
+            This period's aggregate demand factor.
+        '''
+        t = self.t_sim
+        # Deaths and births; newborns' states are drawn by their own type
+        for ThisType in self.agents:
+            ThisType.t_sim = t
+            ThisType.get_mortality()
+            
+        for var_name in self.shock_history:
+            self.shocks[var_name] = self.shock_history[var_name][t]
+        self.shocks['Mrkv'] = self.shocks['Mrkv'].astype(int)
+        Mrkv = self.shocks['Mrkv']
+        PermShk = self.shocks['PermShk']
+        TranShk = self.shocks['TranShk']
+        
+        # Transition to this period's states
+        state = self.state_now
+        RfreeNow = self.RfreeTable[self.type_id, Mrkv]
+        for ThisType in self.agents:
+            ThisType.state_now['PlvlAgg'] = ThisType.state_now['PlvlAgg']*ThisType.PermShkAggNow
+        state['pLvl'][:] = state['pLvl']*PermShk
+        state['bNrm'][:] = RfreeNow/PermShk*state['aNrm']
+        state['mNrm'][:] = state['bNrm'] + TranShk*AggDemandFac
+        
+        # Only updaters change their perception of the macro Markov state
+        update = self.shocks['update_draw'] < self.how_many_update
+        if np.any(self.Pcvd_missing):
+            self.MrkvNowPcvd[self.Pcvd_missing] = Mrkv[self.Pcvd_missing]
+            update = np.logical_and(update, np.logical_not(self.Pcvd_missing))
+            self.Pcvd_missing[:] = False
+        self.MrkvNowPcvd[update] = Mrkv[update]
+        nb = self.num_base_MrkvStates
+        self.MrkvNowPcvd = np.remainder(Mrkv,nb) + nb*np.floor_divide(self.MrkvNowPcvd,nb)
+        self.MacroMrkvNow = np.floor_divide(Mrkv,nb)
+        self.MicroMrkvNow = np.remainder(Mrkv,nb)
+        
+        # Consumption, evaluated once for each group of agents that share a 
+        # type, t_cycle and perceived Markov state
+        J = self.StateCount
+        group = (self.type_id*self.T_cycle + self.t_cycle)*J + self.MrkvNowPcvd
+        group[np.logical_or(self.MrkvNowPcvd >= J, self.t_cycle >= self.T_cycle_all)] = -1
+        order, bounds = group_agents_by_state(group, len(self.agents)*self.T_cycle*J)
+        mNrm_sorted = state['mNrm'][order]
+        cNrm_sorted = np.zeros(order.size) + np.nan
+        for g in np.flatnonzero(np.diff(bounds)):
+            i, tj = divmod(g, self.T_cycle*J)
+            t_cycle, j = divmod(tj, J)
+            these = slice(bounds[g], bounds[g+1])
+            cFunc = self.agents[i].solution[t_cycle].cFunc[j]
+            cNrm_sorted[these] = cFunc(mNrm_sorted[these], Cratio*np.ones(bounds[g+1]-bounds[g]))
+        cNrm = np.zeros(self.type_id.size) + np.nan
+        cNrm[order] = cNrm_sorted
+        state['cNrm'][:] = cNrm
+        state['cLvl'][:] = cNrm*state['pLvl']
+        state['cLvl_splurge'][:] = (1.0-self.Splurge)*state['cLvl'] + self.Splurge*state['pLvl']*TranShk*AggDemandFac
+        
+        # End of period assets, and time moves on
+        state['aNrm'][:] = state['mNrm'] - cNrm
+        state['aLvl'][:] = state['aNrm']*state['pLvl']
+        self.t_age += 1
+        self.t_cycle += 1
+        self.t_cycle[self.t_cycle == self.T_cycle_all] = 0
+        
+        for var_name in self.track_vars:
+            if var_name in state:
+                self.history[var_name][t] = state[var_name]
+            elif var_name in self.shocks:
+                self.history[var_name][t] = self.shocks[var_name]
+            else:
+                self.history[var_name][t] = getattr(self, var_name)
+        self.t_sim += 1
+        
+    def finish(self):
+        '''
+        Hand each type its block of the histories and of the final states.
+        '''
+        for (ThisType, these) in zip(self.agents, self.slices):
+            ThisType.t_sim = self.t_sim
+            for var_name in self.history:
+                ThisType.history[var_name] = self.history[var_name][:, these]
+            for var_name in self.shocks:
+                ThisType.shocks[var_name] = self.shocks[var_name][these]
+            ThisType.controls['cNrm'] = self.state_now['cNrm'][these]
+            ThisType.MrkvNowPcvd = self.MrkvNowPcvd[these].copy()
+            ThisType.MacroMrkvNow = self.MacroMrkvNow[these].copy()
+            ThisType.MicroMrkvNow = self.MicroMrkvNow[these].copy()
+            
+
+def anderson_update(X_hist, G_hist, step=1.0):
+    '''
+    One step of (type-II) Anderson acceleration for a fixed point x = G(x).
+    With a single past guess this is the damped step x + step*(G(x)-x).
+    
+    Parameters
+    ----------
+    X_hist : [np.array]
+        Past guesses of x, oldest first.
+    G_hist : [np.array]
+        G evaluated at each guess in X_hist.
+    step : float
+        Damping (mixing) parameter.
+        
+    Returns
+    -------
+    x_next : np.array
+        Next guess of x.
+    '''
+    x = X_hist[-1]
+    f = G_hist[-1] - X_hist[-1]
+    if len(X_hist) == 1:
+        return x + step*f
+    F_hist = [G - X for (G, X) in zip(G_hist, X_hist)]
+    dF = np.column_stack([F_hist[k+1] - F_hist[k] for k in range(len(F_hist)-1)])
+    dX = np.column_stack([X_hist[k+1] - X_hist[k] for k in range(len(X_hist)-1)])
+    gamma = np.linalg.lstsq(dF, f, rcond=None)[0]
+    x_next = (x - dX.dot(gamma)) + step*(f - dF.dot(gamma))
+    if not np.all(np.isfinite(x_next)):
+        return x + step*f
+    return x_next
+
+
+def AD_hash_attributes(obj, keys, exclude=()):
+    '''
+    Returns the attributes of an agent type or economy that AD_inputs_hash
+    covers: every parameter (at its current value), the given keys, and the
+    Markov arrays and income distributions of every shock type (attributes
+    starting with MrkvArray_, CondMrkvArrays_ or IncShkDstn_, except the
+    *_prev records of the last solution), less the excluded names.
+    '''
+    names = set(obj.parameters) | set(keys)
+    names |= {name for name in vars(obj) if name.startswith(('MrkvArray_', 'CondMrkvArrays_', 'IncShkDstn_'))
+              and not name.endswith('_prev')}
+    return {name : getattr(obj, name, None) for name in sorted(names - set(exclude))}
+
+
+def write_pickle_atomic(filename, obj):
+    '''
+    Pickle obj to filename through a temporary file, so that other processes
+    never see a partly written file.
+    '''
+    tmp_filename = filename + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_filename, 'wb') as handle:
+        pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_filename, filename)
+
+
+def read_pickle_if_exists(filename):
+    '''
+    Returns the object pickled in filename, or None if it does not exist or
+    cannot be read.
+    '''
+    if not os.path.isfile(filename):
+        return None
+    try:
+        with open(filename, 'rb') as handle:
+            return pickle.load(handle)
+    except Exception:
+        return None
+
+
+class SolutionCache():
+    '''
+    Least-recently-used store of agent solutions, keyed by a hash of the inputs
+    to the solver, holding at most max_bytes of (pickled) solutions.  Copies of
+    an agent type share its cache: deepcopy returns the cache itself.  Agent
+    types also keep their counterfactual shock histories in one.
+    '''
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.solutions = OrderedDict()
+        self.sizes = dict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get(self, key):
+        '''
+        Returns the solution stored under key, or None if there is none.
+        '''
+        if key not in self.solutions:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.solutions.move_to_end(key)
+        return self.solutions[key]
+
+    def put(self, key, solution):
+        '''
+        Store solution under key, evicting the least recently used solutions
+        until the cache fits in max_bytes.  Solutions that are larger than
+        max_bytes on their own, or cannot be pickled, are not stored.
+        '''
+        try:
+            size = len(pickle.dumps(solution, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return
+        if size > self.max_bytes:
+            return
+        if key in self.solutions:
+            self.total_bytes -= self.sizes[key]
+        self.solutions[key] = solution
+        self.solutions.move_to_end(key)
+        self.sizes[key] = size
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            (old_key, old_solution) = self.solutions.popitem(last=False)
+            self.total_bytes -= self.sizes.pop(old_key)
+
+    def clear(self):
+        self.solutions.clear()
+        self.sizes.clear()
+        self.total_bytes = 0
+
+
+class LinearPhaseOut(Model):
+    '''
+    A phase-out rule for transfers: the share of the transfer received is one
+    below the permanent income level PhaseOutStart, zero above PhaseOutEnd, and
+    falls linearly in between.
+    '''
+    def __init__(self, PhaseOutStart, PhaseOutEnd):
+        self.PhaseOutStart = PhaseOutStart
+        self.PhaseOutEnd = PhaseOutEnd
+        self.distance_criteria = ['PhaseOutStart', 'PhaseOutEnd']
+        
+    def __call__(self, pLvl):
+        share = 1-(pLvl-self.PhaseOutStart)/(self.PhaseOutEnd-self.PhaseOutStart)
+        return np.clip(share, 0.0, 1.0)
+    
+    
+class TransferSchedule(Model):
+    '''
+    A class to represent a one-time transfer of TransferLvl to each agent, scaled
+    by a phase-out rule that maps permanent income levels to the share of the 
+    transfer received. Any function of a pLvl array can be used as the rule.
+    '''
+    def __init__(self, TransferLvl, PhaseOut):
+        self.TransferLvl = TransferLvl
+        self.PhaseOut = PhaseOut
+        self.distance_criteria = ['TransferLvl', 'PhaseOut']
+        
+    def __call__(self, pLvl):
+        '''
+        Transfer received by agents with permanent income levels pLvl.
+        '''
+        return self.TransferLvl*self.PhaseOut(pLvl)
+    
+    def normalized(self, pLvl):
+        '''
+        Transfer received by agents with permanent income levels pLvl, relative
+        to their permanent income.
+        '''
+        return self.TransferLvl/pLvl*self.PhaseOut(pLvl)
+
+
 class CRule(Model):
     '''
     A class to represent agent beliefs about aggregate consumption dynamics.
@@ -7,7 +7,8 @@ distribution can vary with the discrete state.
 
 import numpy as np
 import scipy.sparse as sp
-from copy import deepcopy
+import scipy.sparse.linalg  # noqa: F401 (makes sp.linalg.eigs available)
+from numba import njit
 
 from HARK import AgentType
 from HARK.ConsumptionSaving.ConsIndShockModel import (
@@ -37,8 +38,6 @@ from HARK.rewards import (
 from HARK.utilities import (
     jump_to_grid_1D,
     jump_to_grid_2D,
-    gen_tran_matrix_1D,
-    gen_tran_matrix_2D
 )
 
 __all__ = ["ConsMarkovSolver", "MarkovConsumerType"]
@@ -1257,88 +1256,45 @@ class MarkovConsumerType(IndShockConsumerType):
                 self.IncShkDstn[0][m].pmv = self.IncShkDstn[0][m].pmv * self.IncShkDstn[0][m].atoms[0]
 
     def calc_transition_matrix(self, shk_dstn = None): 
+        """
+        Calculates the transition matrix (or, with cycles = 1, one transition matrix
+        per period) over Markov states, normalized market resources and, unless the
+        neutral measure is used, permanent income.  Entry (i, j) is the probability
+        of moving from gridpoint j to gridpoint i, so a distribution D moves forward
+        as tran_matrix @ D and an expectation vector X backward as tran_matrix.T @ X.
+
+        The matrices are stored as scipy.sparse CSR matrices: each column only has
+        two (four with permanent income) entries per income shock and reachable
+        Markov state, plus the gridpoints that newborns start at.
+
+        Parameters
+        ----------
+        shk_dstn : [DiscreteDistribution] or [[DiscreteDistribution]], optional
+            Income shock distribution for each Markov state (for each period if
+            cycles = 1). The default is self.IncShkDstn.
+
+        Returns
+        -------
+        None
+        """
 
         if self.cycles == 0: 
             if shk_dstn == None:
                 shk_dstn = self.IncShkDstn[0]
-        
-            dist_mGrid =  self.dist_mGrid
-            dist_pGrid = self.dist_pGrid
-            
-            n_p = len(dist_pGrid) # number of permanent shock points
+
             n_m = len(self.MrkvArray[0]) # number of Markov states
             n_a = self.dist_mGrid.size # number of cash on hand gridpoints
 
             self.cPol_Grid = np.zeros((n_m, n_a))
             self.aPol_Grid = np.zeros((n_m, n_a))
-                
-            self.tran_matrix = np.zeros((n_m, n_a, n_m, n_a))
-            
-            Rfree = self.Rfree[0]        
-            bNext = np.zeros((n_m, n_a))
-      
-            shk_prbs =  np.zeros((n_m, self.TranShkCount * self.PermShkCount))
-            tran_shks = np.zeros((n_m, self.TranShkCount * self.PermShkCount))
-            perm_shks = np.zeros((n_m, self.TranShkCount * self.PermShkCount))
-            
+
             # produce C and A grids           
             for m in range(n_m):
-                self.cPol_Grid[m] = self.solution[0].cFunc[m](dist_mGrid)
-                self.aPol_Grid[m] = dist_mGrid - self.cPol_Grid[m]
-            
-                bNext[m] = Rfree * self.aPol_Grid[m]
-                shk_prbs[m] = shk_dstn[m].pmv
-                tran_shks[m] = shk_dstn[m].atoms[1]
-                perm_shks[m] = shk_dstn[m].atoms[0]
-    
-            LivPrb = self.LivPrb[0][0] # Update probability of staying alive this period
-
-            tran_matrix_ss = None
-            mrkv_array = self.MrkvArray[0]
+                self.cPol_Grid[m] = self.solution[0].cFunc[m](self.dist_mGrid)
+                self.aPol_Grid[m] = self.dist_mGrid - self.cPol_Grid[m]
 
-            if len(dist_pGrid) == 1:
-                tran_mat = np.zeros((n_m, n_a, n_m, n_a))
-                # 
-                for m in range(n_m):
-                    for mp in range(n_m):   
-                        if  mrkv_array[m, mp] > 0:  
-                            NewBornDist = jump_to_grid_1D(np.ones_like(tran_shks[mp]), 
-                                                          shk_prbs[mp], 
-                                                          dist_mGrid)
-                            t_mat = mrkv_array[m, mp] * gen_tran_matrix_1D(dist_mGrid,
-                                                                           bNext[m],
-                                                                           shk_prbs[mp],
-                                                                           perm_shks[mp],
-                                                                           tran_shks[mp],
-                                                                           LivPrb,
-                                                                           NewBornDist)
-                            tran_mat[mp, :, m, :] = t_mat
-
-                self.tran_matrix = tran_mat.reshape(n_m * n_a, n_m * n_a)
-
-            else:
-                # for each markov state, n_a * n_p possible states
-                tran_mat = np.zeros((n_m, n_a * n_p, n_m, n_a * n_p))
-
-                for m in range(n_m):
-                    for mp in range(n_m):   
-                        if  mrkv_array[m, mp] > 0:  
-                            NewBornDist = jump_to_grid_2D(np.ones_like(tran_shks[mp]), 
-                                                          np.ones_like(tran_shks[mp]), 
-                                                          shk_prbs[mp], 
-                                                          dist_mGrid, 
-                                                          dist_pGrid)
-                            t_mat = mrkv_array[m, mp] * gen_tran_matrix_2D(dist_mGrid,
-                                                                           dist_pGrid,
-                                                                           bNext[m],
-                                                                           shk_prbs[mp],
-                                                                           perm_shks[mp],
-                                                                           tran_shks[mp],
-                                                                           LivPrb,
-                                                                           NewBornDist)
-                            tran_mat[mp, :, m, :] = t_mat
-
-                self.tran_matrix = tran_mat.reshape(n_m * n_a * n_p, n_m * n_a * n_p)
+            self.tran_matrix = self.make_tran_matrix(self.aPol_Grid, shk_dstn, self.MrkvArray[0], 
+                                                     self.Rfree[0], self.LivPrb[0][0], self.dist_pGrid)
 
         elif self.cycles > 1:
             print('calc_transition_matrix requires cycles = 0 or cycles = 1')
@@ -1347,11 +1303,7 @@ class MarkovConsumerType(IndShockConsumerType):
 
             if shk_dstn == None:
                 shk_dstn = self.IncShkDstn
-        
-            dist_mGrid = self.dist_mGrid
-            dist_pGrid = self.dist_pGrid
 
-            n_p = len(dist_pGrid[0])
             n_m = len(self.MrkvArray[0]) # number of Markov states
             n_a = self.dist_mGrid.size # number of cash on hand gridpoints
             bigT = self.T_cycle
@@ -1367,72 +1319,75 @@ class MarkovConsumerType(IndShockConsumerType):
                 else:
                     dist_pGrid = self.dist_pGrid #If here then use prespecified permanent income grid
 
-                Rfree = self.Rfree[t][0]
-  
-                bNext = np.zeros((n_m, n_a))
-            
-                shk_prbs =  np.zeros((n_m, self.TranShkCount * self.PermShkCount))
-                tran_shks = np.zeros((n_m, self.TranShkCount * self.PermShkCount))
-                perm_shks = np.zeros((n_m, self.TranShkCount * self.PermShkCount))
-
                 # produce C and A grids
                 for m in range(n_m):
-                    self.cPol_Grid[t][m] = self.solution[t].cFunc[m](dist_mGrid)
-                    self.aPol_Grid[t][m] = dist_mGrid - self.cPol_Grid[t][m]
-                        
-                    bNext[m] = Rfree * self.aPol_Grid[t][m]
-                    shk_prbs[m] = shk_dstn[t][m].pmv
-                    tran_shks[m] = shk_dstn[t][m].atoms[1]
-                    perm_shks[m] = shk_dstn[t][m].atoms[0]
-    
-                LivPrb = self.LivPrb[t][0] # Update probability of staying alive this period
-            
-                if len(dist_pGrid) == 1: 
-                    mrkv_array = self.MrkvArray[t]
-                    tran_mat = np.zeros((n_m, n_a, n_m, n_a))
-
-                    for m in range(n_m):
-                        for mp in range(n_m):   
-                            if  mrkv_array[m, mp] > 0:  
-                                NewBornDist = jump_to_grid_1D(np.ones_like(tran_shks[mp]), 
-                                                              shk_prbs[mp], 
-                                                              dist_mGrid)
-                                t_mat = mrkv_array[m, mp] * gen_tran_matrix_1D(dist_mGrid,
-                                                                               bNext[m],
-                                                                               shk_prbs[mp],
-                                                                               perm_shks[mp],
-                                                                               tran_shks[mp],
-                                                                               LivPrb,
-                                                                               NewBornDist)
-                                tran_mat[mp, :, m, :] = t_mat
-
-                    tran_mat = tran_mat.reshape(n_m * n_a, n_m * n_a)
-                    self.tran_matrix.append(deepcopy(tran_mat))
+                    self.cPol_Grid[t][m] = self.solution[t].cFunc[m](self.dist_mGrid)
+                    self.aPol_Grid[t][m] = self.dist_mGrid - self.cPol_Grid[t][m]
 
-                else:
-                    mrkv_array = self.MrkvArray[t]
-                    tran_mat = np.zeros((n_m, n_a * n_p, n_m, n_a * n_p))
-
-                    for m in range(n_m):
-                        for mp in range(n_m):   
-                            if  mrkv_array[m, mp] > 0:  
-                                NewBornDist = jump_to_grid_2D(np.ones_like(tran_shks[mp]),
-                                                              np.ones_like(tran_shks[mp]), 
-                                                              shk_prbs[mp], 
-                                                              dist_mGrid,
-                                                              dist_pGrid)
-                                t_mat = mrkv_array[m, mp] * gen_tran_matrix_2D(dist_mGrid,
-                                                                               dist_pGrid,
-                                                                               bNext[m],
-                                                                               shk_prbs[mp],
-                                                                               perm_shks[mp],
-                                                                               tran_shks[mp],
-                                                                               LivPrb,
-                                                                               NewBornDist)
-                                tran_mat[mp, :, m, :] = t_mat
-
-                    tran_mat = tran_mat.reshape(n_m * n_a * n_p, n_m * n_a * n_p)
-                    self.tran_matrix.append(deepcopy(tran_mat)) 
+                self.tran_matrix.append(self.make_tran_matrix(self.aPol_Grid[t], shk_dstn[t], self.MrkvArray[t], 
+                                                              self.Rfree[t][0], self.LivPrb[t][0], dist_pGrid))
+
+    def make_tran_matrix(self, aPol_Grid, shk_dstn, mrkv_array, Rfree, LivPrb, dist_pGrid):
+        """
+        Builds the sparse transition matrix of one period, given end-of-period
+        assets at each point of dist_mGrid in each Markov state.
+
+        Parameters
+        ----------
+        aPol_Grid : np.array
+            End-of-period assets at dist_mGrid, of shape (n_m, n_a).
+        shk_dstn : [DiscreteDistribution]
+            Next period's income shock distribution in each Markov state.
+        mrkv_array : np.array
+            Markov transition probabilities, of shape (n_m, n_m).
+        Rfree : float
+            Interest factor.
+        LivPrb : float
+            Probability of surviving to next period.
+        dist_pGrid : np.array
+            Grid of permanent income, or np.array([1]) with the neutral measure.
+
+        Returns
+        -------
+        tran_matrix : scipy.sparse.csr_matrix
+            Transition matrix of shape (n_m*n_a*n_p, n_m*n_a*n_p), ordered by
+            Markov state, then market resources, then permanent income.
+        """
+        dist_mGrid = self.dist_mGrid
+        n_m = mrkv_array.shape[0]
+        n_p = len(dist_pGrid)
+        n_s = dist_mGrid.size * n_p # number of gridpoints in each Markov state
+
+        rows = []
+        cols = []
+        vals = []
+        for mp in range(n_m):
+            shk_prbs = shk_dstn[mp].pmv
+            perm_shks = shk_dstn[mp].atoms[0]
+            tran_shks = shk_dstn[mp].atoms[1]
+            if n_p == 1:
+                NewBornDist = jump_to_grid_1D(np.ones_like(tran_shks), shk_prbs, dist_mGrid)
+            else:
+                NewBornDist = jump_to_grid_2D(np.ones_like(tran_shks), np.ones_like(tran_shks), 
+                                              shk_prbs, dist_mGrid, dist_pGrid)
+            for m in range(n_m):
+                if mrkv_array[m, mp] > 0:
+                    bNext = Rfree * aPol_Grid[m]
+                    if n_p == 1:
+                        r, c, v = gen_tran_entries_1D(dist_mGrid, bNext, shk_prbs, perm_shks, tran_shks, 
+                                                      LivPrb, NewBornDist)
+                    else:
+                        r, c, v = gen_tran_entries_2D(dist_mGrid, dist_pGrid, bNext, shk_prbs, perm_shks, 
+                                                      tran_shks, LivPrb, NewBornDist)
+                    rows.append(r + mp*n_s)
+                    cols.append(c + m*n_s)
+                    vals.append(mrkv_array[m, mp] * v)
+
+        # Duplicate entries are summed when converting to CSR
+        tran_matrix = sp.coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), 
+                                    shape=(n_m*n_s, n_m*n_s)).tocsr()
+        tran_matrix.eliminate_zeros()
+        return tran_matrix
 
     def compute_steady_state(self, harmenberg = True, num_pointsP = 25):
         # Compute steady state to perturb around
@@ -1494,8 +1449,96 @@ class MarkovConsumerType(IndShockConsumerType):
             transition_matrix = [self.tran_matrix]
 
         eigen, ergodic_distr = sp.linalg.eigs(
-            transition_matrix[0], v0 = np.ones(len(transition_matrix[0])), k = 1, which = "LM"
+            transition_matrix[0], v0 = np.ones(transition_matrix[0].shape[0]), k = 1, which = "LM"
         )  # Solve for ergodic distribution
 
         ergodic_distr = ergodic_distr.real / np.sum(ergodic_distr.real)
         self.vec_erg_dstn = ergodic_distr
+
+
+@njit(cache=True)
+def jump_to_grid_index(grid, x):
+    """
+    Index of the gridpoint just below x and the weight on it, splitting x
+    between grid[i] and grid[i+1] as HARK's jump_to_grid_1D does.  Values
+    outside the grid go to its first or last point with weight one.
+    """
+    n = grid.size
+    if x <= grid[0]:
+        return 0, 0, 1.0
+    if x >= grid[n-1]:
+        return n-1, n-1, 1.0
+    i = np.searchsorted(grid, x, side='right') - 1
+    return i, i+1, (grid[i+1] - x) / (grid[i+1] - grid[i])
+
+
+@njit(cache=True)
+def gen_tran_entries_1D(dist_mGrid, bNext, shk_prbs, perm_shks, tran_shks, LivPrb, NewBornDist):
+    """
+    Nonzero entries of HARK's gen_tran_matrix_1D, as (rows, cols, vals) arrays
+    for a sparse COO matrix.  Entries may repeat and should be summed.
+    """
+    n_a = dist_mGrid.size
+    n_shk = shk_prbs.size
+    newborn_pts = np.nonzero(NewBornDist)[0]
+    size = n_a*(2*n_shk + newborn_pts.size)
+    rows = np.empty(size, dtype=np.int64)
+    cols = np.empty(size, dtype=np.int64)
+    vals = np.empty(size)
+    idx = 0
+    for i in range(n_a):
+        for k in range(n_shk):
+            lo, hi, w = jump_to_grid_index(dist_mGrid, bNext[i] / perm_shks[k] + tran_shks[k])
+            rows[idx] = lo
+            cols[idx] = i
+            vals[idx] = LivPrb * shk_prbs[k] * w
+            rows[idx+1] = hi
+            cols[idx+1] = i
+            vals[idx+1] = LivPrb * shk_prbs[k] * (1.0 - w)
+            idx += 2
+        for j in newborn_pts:
+            rows[idx] = j
+            cols[idx] = i
+            vals[idx] = (1.0 - LivPrb) * NewBornDist[j]
+            idx += 1
+    return rows, cols, vals
+
+
+@njit(cache=True)
+def gen_tran_entries_2D(dist_mGrid, dist_pGrid, bNext, shk_prbs, perm_shks, tran_shks, LivPrb, NewBornDist):
+    """
+    Nonzero entries of HARK's gen_tran_matrix_2D, as (rows, cols, vals) arrays
+    for a sparse COO matrix.  Entries may repeat and should be summed.
+    """
+    n_a = dist_mGrid.size
+    n_p = dist_pGrid.size
+    n_shk = shk_prbs.size
+    newborn_pts = np.nonzero(NewBornDist)[0]
+    size = n_a*n_p*(4*n_shk + newborn_pts.size)
+    rows = np.empty(size, dtype=np.int64)
+    cols = np.empty(size, dtype=np.int64)
+    vals = np.empty(size)
+    idx = 0
+    for i in range(n_a):
+        for j in range(n_p):
+            col = i*n_p + j
+            for k in range(n_shk):
+                mlo, mhi, mw = jump_to_grid_index(dist_mGrid, bNext[i] / perm_shks[k] + tran_shks[k])
+                plo, phi, pw = jump_to_grid_index(dist_pGrid, dist_pGrid[j] * perm_shks[k])
+                prb = LivPrb * shk_prbs[k]
+                rows[idx] = mlo*n_p + plo
+                vals[idx] = prb * mw * pw
+                rows[idx+1] = mlo*n_p + phi
+                vals[idx+1] = prb * mw * (1.0 - pw)
+                rows[idx+2] = mhi*n_p + plo
+                vals[idx+2] = prb * (1.0 - mw) * pw
+                rows[idx+3] = mhi*n_p + phi
+                vals[idx+3] = prb * (1.0 - mw) * (1.0 - pw)
+                cols[idx:idx+4] = col
+                idx += 4
+            for nb in newborn_pts:
+                rows[idx] = nb
+                cols[idx] = col
+                vals[idx] = (1.0 - LivPrb) * NewBornDist[nb]
+                idx += 1
+    return rows, cols, vals
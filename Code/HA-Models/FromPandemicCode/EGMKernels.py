@@ -0,0 +1,210 @@
+'''
+This file has numba-compiled kernels for the one period solver solveAggConsMarkovALT.
+They compute end-of-period marginal value directly from the gridpoints that define
+the consumption functions, instead of building tiled arrays and evaluating HARK
+interpolator objects on them.  Every kernel repeats the arithmetic of the HARK
+interpolator it replaces operation by operation, so the results match up to the
+last bit or two of the power function (numpy and numba use different pow code).
+'''
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def interp_pos(x_list, x):
+    '''
+    Position of x in the sorted array x_list, as np.searchsorted(x_list, x)
+    clipped to [1, len(x_list)-1], which is how HARK's interpolators pick the
+    segment to interpolate (or extrapolate) on.
+    '''
+    n = x_list.size
+    lo = 0
+    hi = n
+    while lo < hi:
+        mid = (lo + hi)//2
+        if x_list[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < 1:
+        lo = 1
+    if lo > n - 1:
+        lo = n - 1
+    return lo
+
+
+@njit(cache=True)
+def linear_interp_eval(x_list, y_list, x):
+    '''
+    Evaluates LinearInterp(x_list, y_list) (without lower extrapolation) at x.
+    '''
+    i = interp_pos(x_list, x)
+    alpha = (x - x_list[i-1])/(x_list[i] - x_list[i-1])
+    if x < x_list[0]:
+        return np.nan
+    return (1.0 - alpha)*y_list[i-1] + alpha*y_list[i]
+
+
+@njit(cache=True)
+def bilinear_interp_eval(f_values, x_list, y_list, x, y):
+    '''
+    Evaluates BilinearInterp(f_values, x_list, y_list) at (x, y).
+    '''
+    i = interp_pos(x_list, x)
+    j = interp_pos(y_list, y)
+    alpha = (x - x_list[i-1])/(x_list[i] - x_list[i-1])
+    beta = (y - y_list[j-1])/(y_list[j] - y_list[j-1])
+    return ((1 - alpha)*(1 - beta)*f_values[i-1, j-1] + (1 - alpha)*beta*f_values[i-1, j]
+            + alpha*(1 - beta)*f_values[i, j-1] + alpha*beta*f_values[i, j])
+
+
+@njit(cache=True)
+def sum_like_numpy(a):
+    '''
+    Sum of a 1D array, adding up in the same order as np.sum (pairwise, in
+    blocks of eight) so that the result is identical to it.
+    '''
+    n = a.size
+    if n < 8:
+        res = 0.
+        for i in range(n):
+            res += a[i]
+        return res
+    elif n <= 128:
+        r = a[0:8].copy()
+        i = 8
+        while i < n - (n % 8):
+            for k in range(8):
+                r[k] += a[i+k]
+            i += 8
+        res = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+        while i < n:
+            res += a[i]
+            i += 1
+        return res
+    else:
+        n2 = n//2
+        n2 -= n2 % 8
+        return sum_like_numpy(a[0:n2]) + sum_like_numpy(a[n2:n])
+
+
+@njit(cache=True)
+def cFunc_eval(mNrmGrid, cNrmGrid, BoroCnstNatGrid, Cgrid, cFuncCnst_f, cFuncCnst_x, cFuncCnst_y, m, C):
+    '''
+    Evaluates a consumption function made by solveAggConsMarkovALT at (m, C),
+    from the gridpoints it was built on.  This is LowerEnvelope2D(cFuncUnc, cFuncCnst),
+    where cFuncUnc is a LinearInterpOnInterp1D over Cgrid of LinearInterps with
+    gridpoints mNrmGrid[n] and cNrmGrid[n], shifted by the natural borrowing
+    constraint LinearInterp(Cgrid, BoroCnstNatGrid).
+    '''
+    x = m - linear_interp_eval(Cgrid, BoroCnstNatGrid, C)
+    n = interp_pos(Cgrid, C)
+    alpha = (C - Cgrid[n-1])/(Cgrid[n] - Cgrid[n-1])
+    cUnc = ((1 - alpha)*linear_interp_eval(mNrmGrid[n-1], cNrmGrid[n-1], x)
+            + alpha*linear_interp_eval(mNrmGrid[n], cNrmGrid[n], x))
+    cCnst = bilinear_interp_eval(cFuncCnst_f, cFuncCnst_x, cFuncCnst_y, m, C)
+    if np.isnan(cUnc):
+        return cCnst
+    if np.isnan(cCnst):
+        return cUnc
+    return min(cUnc, cCnst)
+
+
+@njit(cache=True)
+def calc_EndOfPrdvP_cond(aNrmNow, Cgrid, ShkPrbs, PermShkVals, TranShkVals, Rfree, PermGroFac,
+                         DiscFac, CRRA, mNrmGrid, cNrmGrid, BoroCnstNatGrid,
+                         cFuncCnst_f, cFuncCnst_x, cFuncCnst_y):
+    '''
+    End-of-period marginal value of assets, conditional on reaching one Markov
+    state next period, at every (Cgrid, aNrm) gridpoint.
+
+    Parameters
+    ----------
+    aNrmNow : np.array
+        End-of-period assets, of shape (Ccount, aCount).
+    Cgrid : np.array
+        Grid of aggregate consumption ratios.
+    ShkPrbs, PermShkVals : np.array
+        Probabilities and permanent shocks of next period's income shock distribution.
+    TranShkVals : np.array
+        Transitory shocks, already scaled by aggregate demand, of shape (Ccount, ShkCount).
+    Rfree, PermGroFac, DiscFac, CRRA : float
+        Interest factor, permanent income growth factor, discount factor and
+        risk aversion in the next period's state.
+    mNrmGrid, cNrmGrid, BoroCnstNatGrid : np.array
+        Gridpoints of next period's consumption function in this state.
+    cFuncCnst_f, cFuncCnst_x, cFuncCnst_y : np.array
+        Gridpoints of the constrained consumption function.
+
+    Returns
+    -------
+    EndOfPrdvP : np.array
+        End-of-period marginal value, of shape (Ccount, aCount).
+    '''
+    Ccount, aCount = aNrmNow.shape
+    ShkCount = ShkPrbs.size
+    EndOfPrdvP = np.empty((Ccount, aCount))
+    vPnext = np.empty(ShkCount)
+    PermGroFacShk = PermGroFac*PermShkVals
+    RfreePermShk = Rfree*PermShkVals**(-CRRA)
+    for n in range(Ccount):
+        C = Cgrid[n]
+        for k in range(aCount):
+            RfreeaNrm = Rfree*aNrmNow[n, k]
+            for s in range(ShkCount):
+                mNrmNext = RfreeaNrm/PermGroFacShk[s] + TranShkVals[n, s]
+                cNext = cFunc_eval(mNrmGrid, cNrmGrid, BoroCnstNatGrid, Cgrid,
+                                   cFuncCnst_f, cFuncCnst_x, cFuncCnst_y, mNrmNext, C)
+                vPnext[s] = RfreePermShk[s]*cNext**(-CRRA)*ShkPrbs[s]
+            EndOfPrdvP[n, k] = DiscFac*sum_like_numpy(vPnext)
+    return EndOfPrdvP
+
+
+@njit(cache=True)
+def calc_EndOfPrdvP(aNrmNow, Cnext, TransPrbs, NextStates, aGrid, Cgrid, EndOfPrdvPnvrs,
+                    BoroCnstNat, CRRA, LivPrb):
+    '''
+    End-of-period marginal value of assets in one Markov state this period,
+    weighting the conditional marginal value functions of next period's
+    states by their transition probabilities.
+
+    Parameters
+    ----------
+    aNrmNow : np.array
+        End-of-period assets, of shape (Ccount, aCount).
+    Cnext : np.array
+        Next period's aggregate consumption ratio for each next state and each
+        point of Cgrid, of shape (len(NextStates), Ccount).
+    TransPrbs : np.array
+        Probability of moving to each state in NextStates.
+    NextStates : np.array
+        Indices of next period's states that can be reached.
+    aGrid, Cgrid : np.array
+        Gridpoints of the conditional marginal value functions.
+    EndOfPrdvPnvrs : np.array
+        Pseudo-inverse conditional marginal value at (aGrid, Cgrid), for every
+        next state, of shape (StateCount, aGrid.size, Ccount).
+    BoroCnstNat : np.array
+        Natural borrowing constraint at Cgrid for every next state, of shape (StateCount, Ccount).
+    CRRA, LivPrb : float
+        Risk aversion and survival probability.
+
+    Returns
+    -------
+    EndOfPrdvP : np.array
+        End-of-period marginal value, of shape (Ccount, aCount).
+    '''
+    Ccount, aCount = aNrmNow.shape
+    EndOfPrdvP = np.zeros((Ccount, aCount))
+    for idx in range(NextStates.size):
+        j = NextStates[idx]
+        for n in range(Ccount):
+            C = Cnext[idx, n]
+            aNrmMin = linear_interp_eval(Cgrid, BoroCnstNat[j], C)
+            for k in range(aCount):
+                vPnvrs = bilinear_interp_eval(EndOfPrdvPnvrs[j], aGrid, Cgrid, aNrmNow[n, k] - aNrmMin, C)
+                EndOfPrdvP[n, k] += TransPrbs[idx]*vPnvrs**(-CRRA)
+    for n in range(Ccount):
+        for k in range(aCount):
+            EndOfPrdvP[n, k] *= LivPrb
+    return EndOfPrdvP
@@ -45,6 +45,7 @@ from EstimParameters import init_dropout, init_highschool, init_college, init_AD
      data_medianLWPI, data_EducShares, data_WealthShares, Rfree_base, \
      GICmaxBetas, theGICfactor, minBeta
 from AggFiscalModel import AggFiscalType, AggregateDemandEconomy
+from ParallelTools import num_workers_from_env, can_fork, ResidentTypePool, TaskScheduler
 mystr = lambda x : '{:.2f}'.format(x)
 mystr4 = lambda x : '{:.4f}'.format(x)
 
@@ -55,7 +56,30 @@ print('Parameters: R = '+str(round(Rfree_base[0],3))+', CRRA = '+str(round(CRRA,
 
 # %%
 # -----------------------------------------------------------------------------
-def calcEstimStats(Agents):
+def getWealthDstn(ThisType, use_histograms=False):
+    '''
+    Returns the end-of-period normalized assets, liquid wealth and permanent income
+    of an AgentType's agents, and the weight of each.  These are the simulated
+    agents, with weight one each, or the gridpoints of the type's wealth_histogram
+    (see AggFiscalType.calc_wealth_histogram) with weights summing to AgentCount.
+    
+    Parameters
+    ----------
+    ThisType : AgentType
+        A simulated AgentType, or one with a wealth_histogram.
+    use_histograms : boolean, optional
+        If true, use the type's wealth_histogram. The default is False.
+        
+    Returns
+    -------
+    aNrm, aLvl, pLvl, weights : np.array
+    '''
+    if use_histograms:
+        hist = ThisType.wealth_histogram
+        return hist['aNrm'], hist['aLvl'], hist['pLvl'], hist['prob']*ThisType.AgentCount
+    return ThisType.state_now['aNrm'], ThisType.state_now['aLvl'], ThisType.state_now['pLvl'], np.ones(ThisType.AgentCount)
+# -----------------------------------------------------------------------------
+def calcEstimStats(Agents, use_histograms=False):
     '''
     Calculate the average LW/PI-ratio and total LW / total PI for each education
     type. Also calculate the 20th, 40th, 60th, and 80th percentile points of the
@@ -67,6 +91,9 @@ def calcEstimStats(Agents):
     ----------
     Agents : [AgentType]
         List of AgentTypes in the economy.
+    use_histograms : boolean, optional
+        If true, use each type's wealth_histogram instead of its simulated agents.
+        The default is False.
         
     Returns
     -------
@@ -79,12 +106,11 @@ def calcEstimStats(Agents):
         The 20th, 40th, 60th, and 80th percentile points of the Lorenz curve for 
         (liquid) wealth.
     '''
+    Dstns = [getWealthDstn(ThisType, use_histograms) for ThisType in Agents]
 
-    aLvlAll = np.concatenate([(1-ThisType.Splurge)*ThisType.state_now["aLvl"] for ThisType in Agents])
-    numAgents = 0
-    for ThisType in Agents: 
-        numAgents += ThisType.AgentCount
-    weights = np.ones(numAgents) / numAgents      # just using equal weights for now
+    aLvlAll = np.concatenate([(1-ThisType.Splurge)*Dstn[1] for ThisType, Dstn in zip(Agents, Dstns)])
+    weights = np.concatenate([Dstn[3] for Dstn in Dstns])
+    weights = weights / np.sum(weights)      # a type has weight AgentCount, spread over its agents or gridpoints
 
     # Lorenz points:
     LorenzPts = 100*get_lorenz_shares(aLvlAll, weights=weights, percentiles = [0.2, 0.4, 0.6, 0.8] )
@@ -93,20 +119,20 @@ def calcEstimStats(Agents):
     LWoPI = [0]*num_types 
     medianLWPI = [0]*num_types 
     for e in range(num_types):
+        TypesByEd = Agents[e*DiscFacCount:(e+1)*DiscFacCount]
+        DstnsByEd = Dstns[e*DiscFacCount:(e+1)*DiscFacCount]
         aNrmAll_byEd = []
-        aNrmAll_byEd = np.concatenate([(1-ThisType.Splurge)*ThisType.state_now['aNrm'] for ThisType in \
-                          Agents[e*DiscFacCount:(e+1)*DiscFacCount]])
+        aNrmAll_byEd = np.concatenate([(1-ThisType.Splurge)*Dstn[0] for ThisType, Dstn in zip(TypesByEd, DstnsByEd)])
         # aNrmAll_byEd = np.concatenate([ThisType.state_now['aNrm'] for ThisType in \
         #                   Agents[e*DiscFacCount:(e+1)*DiscFacCount]])
-        weights = np.ones(len(aNrmAll_byEd))/len(aNrmAll_byEd)
+        weights = np.concatenate([Dstn[3] for Dstn in DstnsByEd])
+        weights = weights/np.sum(weights)
         avgLWPI[e] = np.dot(aNrmAll_byEd, weights) * 100
         
         aLvlAll_byEd = []
-        aLvlAll_byEd = np.concatenate([(1-ThisType.Splurge)*ThisType.state_now["aLvl"] for ThisType in \
-                          Agents[e*DiscFacCount:(e+1)*DiscFacCount]])
+        aLvlAll_byEd = np.concatenate([(1-ThisType.Splurge)*Dstn[1] for ThisType, Dstn in zip(TypesByEd, DstnsByEd)])
         pLvlAll_byEd = []
-        pLvlAll_byEd = np.concatenate([ThisType.state_now['pLvl'] for ThisType in \
-                          Agents[e*DiscFacCount:(e+1)*DiscFacCount]])
+        pLvlAll_byEd = np.concatenate([Dstn[2] for Dstn in DstnsByEd])
         LWoPI[e] = np.dot(aLvlAll_byEd, weights) / np.dot(pLvlAll_byEd, weights) * 100
 
         medianLWPI[e] = 100*get_percentiles(aNrmAll_byEd,weights=weights,percentiles=[0.5])
@@ -115,7 +141,7 @@ def calcEstimStats(Agents):
 
     return Stats(avgLWPI, LWoPI, medianLWPI, LorenzPts) 
 # -----------------------------------------------------------------------------
-def calcWealthShareByEd(Agents):
+def calcWealthShareByEd(Agents, use_histograms=False):
     '''
     Calculate the share of total wealth held by each education type. 
     Assumption: Agents is organized by EducType and there are DiscFacCount
@@ -126,25 +152,29 @@ def calcWealthShareByEd(Agents):
     Agents : [AgentType]
         List of all AgentTypes in the economy. They are assumed to differ in 
         their EducType attribute.
+    use_histograms : boolean, optional
+        If true, use each type's wealth_histogram instead of its simulated agents.
+        The default is False.
 
     Returns
     -------
     WealthShares : np.array(float)
         The share of total liquid wealth held by each education type. 
     '''
-    aLvlAll = np.concatenate([(1-ThisType.Splurge)*ThisType.state_now["aLvl"] for ThisType in Agents])
+    Dstns = [getWealthDstn(ThisType, use_histograms) for ThisType in Agents]
+    aLvlAll = np.concatenate([(1-ThisType.Splurge)*Dstn[1]*Dstn[3] for ThisType, Dstn in zip(Agents, Dstns)])
     totLiqWealth = np.sum(aLvlAll)
     
     WealthShares = [0]*num_types
     for e in range(num_types):
         aLvlAll_byEd = []
-        aLvlAll_byEd = np.concatenate([(1-ThisType.Splurge)*ThisType.state_now["aLvl"] for ThisType in \
-                                       Agents[e*DiscFacCount:(e+1)*DiscFacCount]])
+        aLvlAll_byEd = np.concatenate([(1-ThisType.Splurge)*Dstn[1]*Dstn[3] for ThisType, Dstn in \
+                                       zip(Agents[e*DiscFacCount:(e+1)*DiscFacCount], Dstns[e*DiscFacCount:(e+1)*DiscFacCount])])
         WealthShares[e] = np.sum(aLvlAll_byEd)/totLiqWealth * 100
     
     return np.array(WealthShares)
 # -----------------------------------------------------------------------------
-def calcLorenzPts(Agents):
+def calcLorenzPts(Agents, use_histograms=False):
     '''
     Calculate the 20th, 40th, 60th, and 80th percentile points of the
     Lorenz curve for (liquid) wealth for the given set of Agents. 
@@ -153,6 +183,9 @@ def calcLorenzPts(Agents):
     ----------
     Agents : [AgentType]
         List of AgentTypes.
+    use_histograms : boolean, optional
+        If true, use each type's wealth_histogram instead of its simulated agents.
+        The default is False.
 
     Returns
     -------
@@ -160,11 +193,10 @@ def calcLorenzPts(Agents):
         The 20th, 40th, 60th, and 80th percentile points of the Lorenz curve for 
         (liquid) wealth.
     '''
-    aLvlAll = np.concatenate([(1-ThisType.Splurge)*ThisType.state_now["aLvl"] for ThisType in Agents])
-    numAgents = 0
-    for ThisType in Agents: 
-        numAgents += ThisType.AgentCount
-    weights = np.ones(numAgents) / numAgents      # just using equal weights for now
+    Dstns = [getWealthDstn(ThisType, use_histograms) for ThisType in Agents]
+    aLvlAll = np.concatenate([(1-ThisType.Splurge)*Dstn[1] for ThisType, Dstn in zip(Agents, Dstns)])
+    weights = np.concatenate([Dstn[3] for Dstn in Dstns])
+    weights = weights / np.sum(weights)      # a type has weight AgentCount, spread over its agents or gridpoints
     
     # Lorenz points:
     LorenzPts = 100*get_lorenz_shares(aLvlAll, weights=weights, percentiles = [0.2, 0.4, 0.6, 0.8] )
@@ -677,7 +709,7 @@ for e in range(num_types):
     for b in range(DiscFacCount):
         DiscFac = DiscFacDstns[e].atoms[0][b]
         AgentCount = int(np.floor(AgentCountTotal*data_EducShares[e]*DiscFacDstns[e].pmv[b]))
-        ThisType = deepcopy(BaseTypeList[e])
+        ThisType = BaseTypeList[e].spawn()
         ThisType.AgentCount = AgentCount
         ThisType.DiscFac = DiscFac
         ThisType.seed = n
@@ -703,12 +735,90 @@ AggDemandEconomy.save_state()
 baseline_commands = ['solve()', 'initialize_sim()', 'simulate()', 'save_state()', 'unpack_cFunc()']
 multi_thread_commands_fake(TypeList, baseline_commands)
 
+# With more than one worker (HAFISCAL_NUM_WORKERS), the education groups are estimated
+# concurrently, and the objective functions solve and simulate the types in worker
+# processes that keep their own copies of TypeList (see makeEstimPool). The pool is
+# only used when estimating; printing results needs the full types here.
+num_workers = num_workers_from_env()
+EstimPool = None
+
+# With warmStartSims, the objective functions simulate only the last burn_in_periods
+# quarters of each type's simulation, restarting from a snapshot of the type's first
+# full simulation (see AggFiscalType.simulate_ergodic). The snapshot is fixed, so the
+# objectives do not depend on the order of evaluations. Printed results always use
+# full simulations.
+warmStartSims = False
+
+# With useHistograms, the objective functions compute the estimation moments from
+# each type's distribution of wealth on a grid (see AggFiscalType.calc_wealth_histogram)
+# instead of from simulated agents, so they have no simulation noise at all.
+# Takes precedence over warmStartSims. Printed results always use full simulations.
+useHistograms = False
+
+def makeEstimPool(num_pool_workers):
+    '''
+    Returns a ResidentTypePool holding TypeList for the objective functions, or
+    None if num_pool_workers is 1 or worker processes cannot be forked.
+    '''
+    if num_pool_workers > 1 and can_fork():
+        outputs = ['aLvl', 'aNrm', 'pLvl']
+        if useHistograms:
+            commands = ['solve', 'calc_wealth_histogram']
+            outputs = ['wealth_histogram']
+        elif warmStartSims:
+            commands = ['solve', 'simulate_ergodic']
+        else:
+            commands = ['solve', 'initialize_sim', 'simulate']
+        return ResidentTypePool(TypeList, commands, outputs, num_pool_workers)
+    return None
+
 
 output_keys = ['NPV_AggIncome', 'NPV_AggCons', 'AggIncome', 'AggCons']
 
 
 #%% Objective functions
 # -----------------------------------------------------------------------------
+def simulateTypesInPool(Agents):
+    '''
+    Solve and simulate Agents in EstimPool, whose workers hold a type for each
+    entry of Agents, and store the simulated aLvl, aNrm and pLvl in each type's
+    state_now (or, with useHistograms, its wealth_histogram).  Those are all
+    that calcEstimStats and calcLorenzPts use.
+    
+    Parameters
+    ----------
+    Agents : [AgentType]
+        List of AgentTypes, ordered as in TypeList.
+    '''
+    type_params = [{'DiscFac' : ThisType.DiscFac, 'AgentCount' : ThisType.AgentCount, 
+                    'seed' : ThisType.seed} for ThisType in Agents]
+    results = EstimPool.run(type_params)
+    for ThisType, result in zip(Agents, results):
+        for var in result:
+            if var in ThisType.state_now:
+                ThisType.state_now[var] = result[var]
+            else:
+                setattr(ThisType, var, result[var])
+# -----------------------------------------------------------------------------
+def setWarmStarts(Agents, PrevAgents):
+    '''
+    Give each type in Agents the snapshots that simulate_ergodic made for the type
+    in the same position of PrevAgents (the previous evaluation of the objective
+    function), so that it is warm-started from the same reference simulation.
+    simulate_ergodic only uses a snapshot made with the same seed, number of
+    agents and income process.
+    
+    Parameters
+    ----------
+    Agents : [AgentType]
+        List of AgentTypes about to be simulated.
+    PrevAgents : [AgentType]
+        List of AgentTypes simulated in the previous evaluation, in the same order.
+    '''
+    for ThisType, PrevType in zip(Agents, PrevAgents):
+        if hasattr(PrevType, 'warm_start_snapshots'):
+            ThisType.warm_start_snapshots = PrevType.warm_start_snapshots
+# -----------------------------------------------------------------------------
 def betasObjFunc(betas, spreads, GICfactors, target_option=1, print_mode=False, print_file=False, filename='DefaultResultsFile.txt'):
     '''
     Objective function for the estimation of discount factor distributions for the 
@@ -770,7 +880,7 @@ def betasObjFunc(betas, spreads, GICfactors, target_option=1, print_mode=False,
     for e in range(num_types):
         for b in range(DiscFacCount):
             AgentCount = int(np.floor(AgentCountTotal*data_EducShares[e]*dfs[e].pmv[b]))
-            ThisType = deepcopy(BaseTypeList[e])
+            ThisType = BaseTypeList[e].spawn()
             ThisType.AgentCount = AgentCount
             ThisType.DiscFac = dfs[e].atoms[0][b]
             ThisType.seed = n + 100
@@ -778,35 +888,46 @@ def betasObjFunc(betas, spreads, GICfactors, target_option=1, print_mode=False,
             n += 1
     base_dict['Agents'] = TypeListNew
 
+    estimating = not (print_mode or print_file)
+    use_histograms = useHistograms and estimating
+    if warmStartSims and estimating and not use_histograms:
+        setWarmStarts(TypeListNew, AggDemandEconomy.agents)
     AggDemandEconomy.agents = TypeListNew
-    AggDemandEconomy.solve()
-
-    AggDemandEconomy.reset()
-    for agent in AggDemandEconomy.agents:
-        agent.initialize_sim()
-        agent.AggDemandFac = 1.0
-        agent.RfreeNow = 1.0
-        agent.CaggNow = 1.0
-
-    AggDemandEconomy.make_history()   
-    AggDemandEconomy.save_state()   
-
-    # Simulate each type to get a new steady state solution 
-    # solve: done in AggDemandEconomy.solve(), initializeSim: done in AggDemandEconomy.reset() 
-    # baseline_commands = ['solve()', 'initializeSim()', 'simulate()', 'saveState()']
-    # baseline_commands = ['simulate()', 'save_state()']
-    baseline_commands = ['solve()', 'initialize_sim()', 'simulate()', 'save_state()', 'unpack_cFunc()']
-    multi_thread_commands_fake(TypeListNew, baseline_commands)
+    if EstimPool is not None and estimating:
+        simulateTypesInPool(TypeListNew)
+    elif use_histograms:
+        multi_thread_commands_fake(TypeListNew, ['solve()', 'calc_wealth_histogram()'])
+    elif warmStartSims and estimating:
+        multi_thread_commands_fake(TypeListNew, ['solve()', 'simulate_ergodic()'])
+    else:
+        AggDemandEconomy.solve()
+    
+        AggDemandEconomy.reset()
+        for agent in AggDemandEconomy.agents:
+            agent.initialize_sim()
+            agent.AggDemandFac = 1.0
+            agent.RfreeNow = 1.0
+            agent.CaggNow = 1.0
     
-    Stats = calcEstimStats(TypeListNew)
+        AggDemandEconomy.make_history()   
+        AggDemandEconomy.save_state()   
+    
+        # Simulate each type to get a new steady state solution 
+        # solve: done in AggDemandEconomy.solve(), initializeSim: done in AggDemandEconomy.reset() 
+        # baseline_commands = ['solve()', 'initializeSim()', 'simulate()', 'saveState()']
+        # baseline_commands = ['simulate()', 'save_state()']
+        baseline_commands = ['solve()', 'initialize_sim()', 'simulate()', 'save_state()', 'unpack_cFunc()']
+        multi_thread_commands_fake(TypeListNew, baseline_commands)
+    
+    Stats = calcEstimStats(TypeListNew, use_histograms)
     
     if target_option == 1:
         sumSquares = 10*np.sum((Stats.medianLWPI-data_medianLWPI)**2)
         sumSquares += np.sum((np.array(Stats.LorenzPts) - data_LorenzPtsAll)**2)
     elif target_option == 2:
-        lp_d = calcLorenzPts(TypeListNew[0:DiscFacCount])
-        lp_h = calcLorenzPts(TypeListNew[DiscFacCount:2*DiscFacCount])
-        lp_c = calcLorenzPts(TypeListNew[2*DiscFacCount:3*DiscFacCount])
+        lp_d = calcLorenzPts(TypeListNew[0:DiscFacCount], use_histograms)
+        lp_h = calcLorenzPts(TypeListNew[DiscFacCount:2*DiscFacCount], use_histograms)
+        lp_c = calcLorenzPts(TypeListNew[2*DiscFacCount:3*DiscFacCount], use_histograms)
         sumSquares = np.sum((np.array(Stats.avgLWPI)-data_avgLWPI)**2)
         sumSquares += np.sum((np.array(lp_d)-data_LorenzPts[0])**2)
         sumSquares += np.sum((np.array(lp_h)-data_LorenzPts[1])**2)
@@ -951,40 +1072,52 @@ def betasObjFuncEduc(beta, spread, GICx, educ_type=2, print_mode=False, print_fi
     n = 0
     for b in range(DiscFacCount):
         AgentCount = int(np.floor(AgentCountTotal*data_EducShares[educ_type]*dfs.pmv[b]))
-        ThisType = deepcopy(BaseTypeList[educ_type])
+        ThisType = BaseTypeList[educ_type].spawn()
         ThisType.AgentCount = AgentCount
         ThisType.DiscFac = dfs.atoms[0][b]
         ThisType.seed = n
         TypeListNewEduc.append(ThisType)
         n += 1
     TypeListAll = AggDemandEconomy.agents
+    TypeListPrev = list(TypeListAll)
     TypeListAll[educ_type*DiscFacCount:(educ_type+1)*DiscFacCount] = TypeListNewEduc
+    estimating = not (print_mode or print_file)
+    use_histograms = useHistograms and estimating
+    if warmStartSims and estimating and not use_histograms:
+        setWarmStarts(TypeListAll, TypeListPrev)
             
     base_dict['Agents'] = TypeListAll
     AggDemandEconomy.agents = TypeListAll
-    AggDemandEconomy.solve()
-
-    AggDemandEconomy.reset()
-    for agent in AggDemandEconomy.agents:
-        agent.initialize_sim()
-        agent.AggDemandFac = 1.0
-        agent.RfreeNow = 1.0
-        agent.CaggNow = 1.0
-
-    AggDemandEconomy.make_history()   
-    AggDemandEconomy.save_state()   
-
-    # Simulate each type to get a new steady state solution 
-    # solve: done in AggDemandEconomy.solve(), initializeSim: done in AggDemandEconomy.reset() 
-    # baseline_commands = ['solve()', 'initializeSim()', 'simulate()', 'saveState()']
-    # baseline_commands = ['simulate()', 'save_state()']
-    baseline_commands = ['solve()', 'initialize_sim()', 'simulate()', 'save_state()']
-    multi_thread_commands_fake(TypeListAll, baseline_commands)
+    if EstimPool is not None and estimating:
+        simulateTypesInPool(TypeListAll)
+    elif use_histograms:
+        multi_thread_commands_fake(TypeListAll, ['solve()', 'calc_wealth_histogram()'])
+    elif warmStartSims and estimating:
+        multi_thread_commands_fake(TypeListAll, ['solve()', 'simulate_ergodic()'])
+    else:
+        AggDemandEconomy.solve()
+    
+        AggDemandEconomy.reset()
+        for agent in AggDemandEconomy.agents:
+            agent.initialize_sim()
+            agent.AggDemandFac = 1.0
+            agent.RfreeNow = 1.0
+            agent.CaggNow = 1.0
+    
+        AggDemandEconomy.make_history()   
+        AggDemandEconomy.save_state()   
+    
+        # Simulate each type to get a new steady state solution 
+        # solve: done in AggDemandEconomy.solve(), initializeSim: done in AggDemandEconomy.reset() 
+        # baseline_commands = ['solve()', 'initializeSim()', 'simulate()', 'saveState()']
+        # baseline_commands = ['simulate()', 'save_state()']
+        baseline_commands = ['solve()', 'initialize_sim()', 'simulate()', 'save_state()']
+        multi_thread_commands_fake(TypeListAll, baseline_commands)
     
-    Stats = calcEstimStats(TypeListAll)
+    Stats = calcEstimStats(TypeListAll, use_histograms)
     
     sumSquares = np.sum((Stats.medianLWPI[educ_type]-data_medianLWPI[educ_type])**2)
-    lp = calcLorenzPts(TypeListNewEduc)
+    lp = calcLorenzPts(TypeListNewEduc, use_histograms)
     sumSquares += np.sum((np.array(lp) - data_LorenzPts[educ_type])**2)
 #    sumSquares = np.sum((Stats.avgLWPI[educ_type]-data_avgLWPI[educ_type])**2)
    
@@ -1036,7 +1169,15 @@ if estimateDiscFacs:
     
     print('Estimation results saved in ' + df_resFileStr)
     
-    for edType in [0,1,2]:
+    def estimateDiscFacEduc(edType, outFileStr, num_pool_workers):
+        '''
+        Estimate the discount factor distribution of one education group and
+        write the estimates to outFileStr. Its distance only depends on the types
+        of that group, so the groups can be estimated in separate processes,
+        each with its own pool of num_pool_workers workers.
+        '''
+        global EstimPool
+        EstimPool = makeEstimPool(num_pool_workers)
         f_temp = lambda x : betasObjFuncEduc(x[0],x[1],x[2], educ_type=edType)
         if edType == 0:
             initValues = [0.75, 0.3, 6]       # Dropouts
@@ -1052,14 +1193,27 @@ if estimateDiscFacs:
         print('Beta = ' + mystr4(opt_params[0]) +'  Nabla = ' + mystr4(opt_params[1]) + 
               ' GIC factor = ' + mystr4(np.exp(opt_params[2])/(1+np.exp(opt_params[2]))))
     
-        if edType == 0:
-            mode = 'w'      # Overwrite old file...
-        else:
-            mode = 'a'      # ...and append further results to the same file 
-        with open(df_resFileStr, mode) as f: 
+        with open(outFileStr, 'w') as f: 
             outStr = repr({'EducationGroup' : edType, 'beta' : opt_params[0], 'nabla' : opt_params[1], 'GICx' : opt_params[2]})
             f.write(outStr+'\n')
-            f.close()
+        if EstimPool is not None:
+            EstimPool.close()
+            EstimPool = None
+    
+    # Run up to three estimations at once, sharing the workers out between them
+    num_educ_workers = min(num_workers, 3)
+    scheduler = TaskScheduler(num_workers=num_educ_workers)
+    for edType in [0,1,2]:
+        scheduler.add_task('EducationGroup'+str(edType), estimateDiscFacEduc, edType, 
+                           df_resFileStr+'.educ'+str(edType), num_workers//num_educ_workers)
+    scheduler.run()
+    
+    # Collect the estimates in one file, in the order of the education groups
+    with open(df_resFileStr, 'w') as f: 
+        for edType in [0,1,2]:
+            with open(df_resFileStr+'.educ'+str(edType), 'r') as f_educ:
+                f.write(f_educ.read())
+            os.remove(df_resFileStr+'.educ'+str(edType))
             
     with open(df_resFileStr, 'a') as f: 
         f.write('\nParameters: R = '+str(round(Rfree_base[0],2))+', CRRA = '+str(round(CRRA,2))
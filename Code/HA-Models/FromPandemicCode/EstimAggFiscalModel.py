@@ -13,6 +13,7 @@ from HARK import Market
 from HARK.metric import distance_metric
 from HARK.core import Model
 from EstimParameters import makeFullMrkvArray, T_sim, makeCondMrkvArrays_base
+from OtherFunctions import calculate_NPV
 from copy import copy, deepcopy
 import matplotlib.pyplot as plt
 
@@ -733,20 +734,8 @@ class AggregateDemandEconomy(Market):
         AggIncome = np.sum(IndIncome,1)
         AggCons   = np.sum(cLvl_all_splurge,1)
         
-        # Function calculates the net present value of X, which can be income or consumption
-        # Periods defintes the horizon of the NPV measure, R the interest rate at which future income is discounted
-        def calculate_NPV(X,Periods,R):
-            NPV_discount = np.zeros(Periods)
-            for t in range(Periods):
-                NPV_discount[t] = 1/(R**t)
-            NPV = np.zeros(Periods)
-            for t in range(Periods):
-                NPV[t] = np.sum(X[0:t+1]*NPV_discount[0:t+1])    
-            return NPV
-
-        # calculate NPV
-        NPV_AggIncome = calculate_NPV(AggIncome,self.act_T,ThisType.Rfree[0])
-        NPV_AggCons   = calculate_NPV(AggCons,self.act_T,ThisType.Rfree[0])
+        # calculate NPV of income and consumption at every horizon, in one pass
+        NPV_AggIncome, NPV_AggCons = calculate_NPV(np.vstack((AggIncome, AggCons)),self.act_T,ThisType.Rfree[0])
         
         # calculate Cratio_hist
         if hasattr(self,'base_AggCons'):
@@ -253,6 +253,13 @@ init_dropout = {"cycles": 0, # This will be overwritten at type construction
                 'UpdatePrb' : 1.0,
                 'Splurge' : Splurge,
                 'track_vars' : [],
+                'solution_cache_size' : 200*2**20, # Bytes of solutions kept per education type, so repeated solves are skipped
+                'burn_in_periods' : 100, # Quarters simulated from the reference simulation's snapshot when warmStartSims is on
+                'hist_mCount' : 200, # Gridpoints of mNrm in calc_wealth_histogram (used when useHistograms is on)
+                'hist_mMax' : 2*aXtraMax, # Highest gridpoint of mNrm in calc_wealth_histogram
+                'hist_pCount' : 400, # Gridpoints of pLvl in calc_wealth_histogram
+                'hist_pStds' : 4.0, # Number of standard deviations of log pLvl the pLvl grid covers
+                'hist_joint_periods' : 50, # Last periods in which calc_wealth_histogram tracks mNrm and pLvl jointly
                 'EducType': 0
                 }
 
@@ -9,6 +9,11 @@ from Parameters import returnParameters
 import scipy.sparse as sp
 import matplotlib.pyplot as plt
 import time
+import json
+import inspect
+import HARK
+from ParallelTools import map_in_forked_pool, num_workers_from_env
+from OtherFunctions import hash_inputs
 
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if parent_dir not in sys.path:
@@ -321,13 +326,18 @@ for ThisType in BaseTypeList:
 
 ##################################################################################################
 
-def compute_type_jacobian(agent, dict, DiscFac, IncDist, IncDist_dx, param):
-    dx = 0.0001
-
+def compute_type_steady_state(agent, DiscFac, IncDist):
+    # Steady state of one type, shared by the Jacobians for all of its shocks
     agent_SS = deepcopy(agent)
     agent_SS.IncShkDstn = deepcopy(IncDist)
     agent_SS.DiscFac = DiscFac
     agent_SS.compute_steady_state()
+    
+    return agent_SS
+
+
+def compute_type_jacobian(agent, agent_SS, dict, DiscFac, IncDist, IncDist_dx, param):
+    dx = 0.0001
 
     C_ss_ThisType = deepcopy(agent_SS.C_ss)
     A_ss_ThisType = deepcopy(agent_SS.A_ss)
@@ -429,35 +439,20 @@ def compute_type_jacobian(agent, dict, DiscFac, IncDist, IncDist_dx, param):
     FinHorizonAgent.calc_transition_matrix() 
 
     ##################################################################################################
-    # period zero shock agent
-
-    Zeroth_col_agent = MarkovConsumerType(**params)
-    Zeroth_col_agent.solution_terminal = deepcopy(agent_SS.solution[0])
-    Zeroth_col_agent.IncShkDstn = params["T_cycle"] * deepcopy(IncDist)
-    Zeroth_col_agent.solve()
+    # Transition matrix of a shock in period zero, with the steady state policy
 
     if param == "transfers" or param =='wage' or param =='tax' or param =='UI_extend' or param =='UI_rr':
-        Zeroth_col_agent.IncShkDstn = deepcopy(agent_inc_dx.IncShkDstn) + (params["T_cycle"]) * deepcopy(agent_SS.IncShkDstn)
+        tranmat_0 = agent_SS.make_tran_matrix(agent_SS.aPol_Grid, agent_inc_dx.IncShkDstn[0], agent_SS.MrkvArray[0], 
+                                              agent_SS.Rfree[0], agent_SS.LivPrb[0][0], agent_SS.dist_pGrid)
     elif param == "job_find":
-        Zeroth_col_agent.MrkvArray = [Mrkv_dx] + (params["T_cycle"] - 1) * agent.MrkvArray
+        tranmat_0 = agent_SS.make_tran_matrix(agent_SS.aPol_Grid, agent_SS.IncShkDstn[0], Mrkv_dx, 
+                                              agent_SS.Rfree[0], agent_SS.LivPrb[0][0], agent_SS.dist_pGrid)
     elif param == "Rfree":
-        Zeroth_col_agent.Rfree = [agent.Rfree + dx] + (params["T_cycle"] - 1) * [agent.Rfree]
-    elif param == "DiscFac":
-        Zeroth_col_agent.DiscFac = [DiscFac + dx] + (params["T_cycle"] - 1) * [DiscFac]
-        
-        
-    # if param != "IncShkDstn" or param =! "wage" or param =!"tax":
-    #     Zeroth_col_agent.IncShkDstn = params["T_cycle"] * deepcopy(agent_SS.IncShkDstn)
-  
-            
-    if param == "DiscFac" or param == "Rfree" or param =="job_find":
-        Zeroth_col_agent.IncShkDstn = params["T_cycle"] * deepcopy(agent_SS.IncShkDstn)
-  
-
-
-    Zeroth_col_agent.neutral_measure = True
-    Zeroth_col_agent.define_distribution_grid()
-    Zeroth_col_agent.calc_transition_matrix()
+        tranmat_0 = agent_SS.make_tran_matrix(agent_SS.aPol_Grid, agent_SS.IncShkDstn[0], agent_SS.MrkvArray[0], 
+                                              (agent.Rfree + dx)[0], agent_SS.LivPrb[0][0], agent_SS.dist_pGrid)
+    else:
+        # A change in the discount factor does not move the distribution until agents act on it
+        tranmat_0 = agent_SS.tran_matrix
 
     #################################################################################################
     # calculate Jacobian
@@ -470,9 +465,6 @@ def compute_type_jacobian(agent, dict, DiscFac, IncDist, IncDist_dx, param):
     c_t_unflat = FinHorizonAgent.cPol_Grid
     a_t_unflat = FinHorizonAgent.aPol_Grid
 
-    A_ss = agent_SS.A_ss
-    C_ss = agent_SS.C_ss
-    
     transition_matrices = FinHorizonAgent.tran_matrix
 
     c_t_flat = np.zeros((params["T_cycle"], int(params["mCount"] * states)))
@@ -484,12 +476,13 @@ def compute_type_jacobian(agent, dict, DiscFac, IncDist, IncDist_dx, param):
 
     tranmat_ss = agent_SS.tran_matrix
 
-    tranmat_t = np.insert(transition_matrices, params["T_cycle"], tranmat_ss, axis = 0)
+    # Sparse (CSR) transition matrices, one per period, with the steady state one last
+    tranmat_t = transition_matrices + [tranmat_ss]
 
     c_t = np.insert(c_t_flat, params["T_cycle"] , c_ss , axis = 0)
     a_t = np.insert(a_t_flat, params["T_cycle"] , a_ss , axis = 0)
 
-    CJAC_perfect, AJAC_perfect = compile_JAC(a_ss, c_ss, a_t, c_t, tranmat_ss, tranmat_t, D_ss, C_ss, A_ss, Zeroth_col_agent, bigT)
+    CJAC_perfect, AJAC_perfect = compile_JAC(a_ss, c_ss, a_t, c_t, tranmat_ss, tranmat_t, tranmat_0, D_ss, bigT)
 
     return CJAC_perfect, AJAC_perfect, C_ss_ThisType, A_ss_ThisType
 
@@ -497,119 +490,48 @@ def compute_type_jacobian(agent, dict, DiscFac, IncDist, IncDist_dx, param):
 
 ##################################################################################################
 
-def compile_JAC(a_ss, c_ss, a_t, c_t, tranmat_ss, tranmat_t, D_ss, C_ss, A_ss, Zeroth_col_agent, bigT):
+def compile_JAC(a_ss, c_ss, a_t, c_t, tranmat_ss, tranmat_t, tranmat_0, D_ss, bigT):
 
+    # Fake news algorithm: the Jacobian columns for shocks announced s periods ahead
+    # differ only in timing, so every column is built from one T x T fake news matrix.
     T = bigT
-
-    # Expectation vectors
-    exp_vecs_a_e = []
-    exp_vec_a_e = a_ss
-    
-    exp_vecs_c_e = []
-    exp_vec_c_e = c_ss
-    
-    for i in range(T):
-        
-        exp_vecs_a_e.append(exp_vec_a_e)
-        exp_vec_a_e = np.dot(tranmat_ss.T, exp_vec_a_e)
-        
-        exp_vecs_c_e.append(exp_vec_c_e)
-        exp_vec_c_e = np.dot(tranmat_ss.T, exp_vec_c_e)
-    
-    
-    exp_vecs_a_e = np.array(exp_vecs_a_e)
-    exp_vecs_c_e = np.array(exp_vecs_c_e)
-
-    
-    da0_s = []
-    dc0_s = []
-
-    for i in range(T):
-        da0_s.append(a_t[T - i] - a_ss)
-        dc0_s.append(c_t[T - i] - c_ss)
-    
-        
-    da0_s = np.array(da0_s)
-    dc0_s = np.array(dc0_s)
-
-    dA0_s = []
-    dC0_s = []
-
-    for i in range(T):
-        dA0_s.append(np.dot(da0_s[i], D_ss))
-        dC0_s.append(np.dot(dc0_s[i], D_ss))
-    
-    dA0_s = np.array(dA0_s)
-    A_curl_s = dA0_s/dx
-    
-    dC0_s = np.array(dC0_s)
-    C_curl_s = dC0_s/dx
-    
-    dlambda0_s = []
-    
-    for i in range(T):
-        dlambda0_s.append(tranmat_t[T - i] - tranmat_ss)
-    
-    dlambda0_s = np.array(dlambda0_s)
-    
-    dD0_s = []
-    
-    for i in range(T):
-        dD0_s.append(np.dot(dlambda0_s[i], D_ss))
-    
-    dD0_s = np.array(dD0_s)
-    D_curl_s = dD0_s/dx
-    
+    D_ss = D_ss[:, 0]
+
+    # Expectation vectors: E_a[i] = (tranmat_ss.T)^i a_ss, stacked into (T, N) matrices
+    tranmat_ss_T = tranmat_ss.T.tocsr()
+    exp_vecs = np.zeros((T, len(a_ss), 2))
+    exp_vecs[0] = np.column_stack((a_ss, c_ss))
+    for i in range(T - 1):
+        exp_vecs[i + 1] = tranmat_ss_T @ exp_vecs[i]
+    exp_vecs_a_e = exp_vecs[:, :, 0]
+    exp_vecs_c_e = exp_vecs[:, :, 1]
+
+    # Change in aggregates (curlyY) and in next period's distribution (curlyD) caused by
+    # a shock s periods ahead; a_t[T - s] is the policy s periods before the horizon ends
+    A_curl_s = (a_t[T:0:-1] - a_ss) @ D_ss / dx
+    C_curl_s = (c_t[T:0:-1] - c_ss) @ D_ss / dx
+    D_curl_s = np.array([(tranmat_t[T - i] - tranmat_ss) @ D_ss for i in range(T)]) / dx
+
+    # Fake news matrix: one product of the stacked expectation vectors with curlyD
     Curl_F_A = np.zeros((T , T))
     Curl_F_C = np.zeros((T , T))
-    
-    # WARNING: SWAPPED THESE LINES TO MAKE DEMO RUN
-    # Curl_F_A[0] = A_curl_s
-    # Curl_F_C[0] = C_curl_s
-    Curl_F_A[0] = A_curl_s.T[0]
-    Curl_F_C[0] = C_curl_s.T[0]
-
-    for i in range(T-1):
-        for j in range(T):
-            Curl_F_A[i + 1][j] = np.dot(exp_vecs_a_e[i], D_curl_s[j])[0]
-            Curl_F_C[i + 1][j] = np.dot(exp_vecs_c_e[i], D_curl_s[j])[0]
-
-    J_A = np.zeros((T, T))
-    J_C = np.zeros((T, T))
-
-    for t in range(T):
-        for s in range(T):
-            if (t ==0) or (s==0):
-                J_A[t][s] = Curl_F_A[t][s]
-                J_C[t][s] = Curl_F_C[t][s]
-                
-            else:
-                J_A[t][s] = J_A[t - 1][s - 1] + Curl_F_A[t][s]
-                J_C[t][s] = J_C[t - 1][s - 1] + Curl_F_C[t][s]
-     
-    # Zeroth Column of the Jacobian
-    Zeroth_col_agent.tran_matrix = np.array(Zeroth_col_agent.tran_matrix)
-    
-    C_t = np.zeros(T)
-    A_t = np.zeros(T)
-    
-    dstn_dot = D_ss
-    
-    for t in range(T):
-        tran_mat_t = Zeroth_col_agent.tran_matrix[t]
-
-        dstn_all = np.dot(tran_mat_t, dstn_dot)
-
-        C = np.dot(c_ss, dstn_all)
-        A = np.dot(a_ss, dstn_all)
-        
-        C_t[t] = C[0]
-        A_t[t] = A[0]
-
-        dstn_dot = dstn_all
-        
-    J_A.T[0] = (A_t - A_ss) / dx
-    J_C.T[0] = (C_t - C_ss) / dx
+    Curl_F_A[0] = A_curl_s
+    Curl_F_C[0] = C_curl_s
+    Curl_F_A[1:] = exp_vecs_a_e[:T - 1] @ D_curl_s.T
+    Curl_F_C[1:] = exp_vecs_c_e[:T - 1] @ D_curl_s.T
+
+    # Jacobian: J[t, s] = J[t - 1, s - 1] + F[t, s], a cumulative sum along diagonals
+    J_A = Curl_F_A.copy()
+    J_C = Curl_F_C.copy()
+    for t in range(1, T):
+        J_A[t, 1:] += J_A[t - 1, :-1]
+        J_C[t, 1:] += J_C[t - 1, :-1]
+
+    # Zeroth Column of the Jacobian: a shock in period zero only moves the distribution
+    # through that period's transition, and its effect is traced by the expectation vectors
+    D_curl_0 = (tranmat_0 - tranmat_ss) @ D_ss / dx
+    J_A[:, 0] = exp_vecs_a_e @ D_curl_0
+    J_C[:, 0] = exp_vecs_c_e @ D_curl_0
 
     return J_C, J_A
 
@@ -628,71 +550,136 @@ num_education_types = 3
 
 
 
-CJAC_all = np.zeros((num_educ_types,  len(DiscFacDstns[0].atoms[0]) , len(shock_params) , bigT , bigT ))
-AJAC_all = np.zeros((num_educ_types,  len(DiscFacDstns[0].atoms[0]) , len(shock_params) , bigT , bigT ))
+def shock_inc_dist(e, param):
+    # Income distribution with the shock to param, for education type e
+    if param=='wage':
+        IncDist_dx = [IncShkDstn_wage_dx[e]]
+        
+    elif param =='tax':
+        IncDist_dx = [IncShkDstn_tax_dx[e]]
+    
+    elif param=='transfers':
+        
+        IncDist_dx = [IncShkDstn_transfers_dx[e]]
+    elif param =='UI_extend':
+        
+        IncDist_dx = [IncShkDstn_ui_extend_dx[e]]
+        
+    elif param =='UI_rr':
+        
+        IncDist_dx = [IncShkDstn_ui_rr_dx[e]]
 
-C_ss_all = np.zeros((num_educ_types,  len(DiscFacDstns[0].atoms[0]) , len(shock_params)))
-A_ss_all = np.zeros((num_educ_types,  len(DiscFacDstns[0].atoms[0]) , len(shock_params)))
+    else:    
+        IncDist_dx = [IncShkDstn[e]]
+        
+    return IncDist_dx
 
-start = time.time()
 
-for e in range(num_educ_types): #education type
-    betas = DiscFacDstns[e].atoms[0]
-    dict = dicts[e]
+##################################################################################################
+# Jacobian farm: the (educ, beta, shock) Jacobians are computed in worker processes
+# (HAFISCAL_NUM_WORKERS, see ParallelTools), which write them straight into memory-mapped
+# .npy files in jacobian_dir. Each finished Jacobian is marked in JAC_done, so an
+# interrupted run picks up where it stopped; the files are started afresh when
+# anything in farm_key changes. Besides the settings, farm_key holds a hash of every
+# input of compute_type_jacobian: the code that computes the Jacobians (the functions
+# above and ConsMarkovModel), each type's parameters (dicts, which include Rfree,
+# LivPrb and MrkvArray), its income distributions with and without each shock, and
+# the job finding and separation rates of the shocked Markov matrix.
+
+jacobian_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'HANK_Jacobians')
+farm_shape = (num_educ_types,  len(DiscFacDstns[0].atoms[0]) , len(shock_params))
+farm_key = {'bigT' : bigT, 'mCount' : mCount, 'dx' : dx, 'shock_params' : shock_params,
+            'betas' : [[float(beta) for beta in DiscFacDstns[e].atoms[0]] for e in range(num_educ_types)]}
+farm_code = [inspect.getsource(func) for func in [create_matrix_U, compute_type_steady_state, compute_type_jacobian,
+                                                  compile_JAC, shock_inc_dist]]
+farm_code.append(inspect.getsource(sys.modules[MarkovConsumerType.__module__]))
+farm_key['inputs_hash'] = hash_inputs(farm_code, HARK.__version__, dicts, IncShkDstn, job_find, job_sep,
+                                      [[shock_inc_dist(e, param) for param in shock_params] for e in range(num_educ_types)])
+farm_arrays = {'CJAC_all' : (np.float64, farm_shape + (bigT, bigT)),
+               'AJAC_all' : (np.float64, farm_shape + (bigT, bigT)),
+               'C_ss_all' : (np.float64, farm_shape),
+               'A_ss_all' : (np.float64, farm_shape),
+               'JAC_done' : (np.bool_, farm_shape)}
+
+
+def open_jacobian_farm(create=False):
+    # Memory-mapped arrays of the Jacobian farm; create=True starts new, empty files
+    farm = {}
+    for name in farm_arrays:
+        path = os.path.join(jacobian_dir, name + '.npy')
+        if create:
+            farm[name] = np.lib.format.open_memmap(path, mode='w+', dtype=farm_arrays[name][0], shape=farm_arrays[name][1])
+        else:
+            farm[name] = np.lib.format.open_memmap(path, mode='r+')
+    return farm
+
+
+def resume_jacobian_farm():
+    # Open the existing farm if it was made with the same settings, or else start a new one
+    key_path = os.path.join(jacobian_dir, 'farm_key.json')
+    try:
+        with open(key_path) as f:
+            resumable = json.load(f) == farm_key
+        farm = open_jacobian_farm()
+        for name in farm_arrays:
+            resumable = resumable and farm[name].shape == farm_arrays[name][1] and farm[name].dtype == farm_arrays[name][0]
+    except (OSError, ValueError):
+        resumable = False
+    if resumable:
+        return farm
+    
+    os.makedirs(jacobian_dir, exist_ok=True)
+    if os.path.exists(key_path):
+        os.remove(key_path)
+    farm = open_jacobian_farm(create=True)
+    with open(key_path, 'w') as f:
+        json.dump(farm_key, f)
+    return farm
+
+
+def compute_farm_jacobians(task):
+    # Worker task: the Jacobians of one (educ, beta) type for the shocks in s_list,
+    # sharing one steady state solution
+    (e, d, s_list) = task
+    farm = open_jacobian_farm()
+    beta = DiscFacDstns[e].atoms[0][d]
     IncDist = [IncShkDstn[e]]
-    # IncDist_dx = [IncShkDstn_dx[e]]
-    for d,beta in enumerate(betas):
-        for s,param in enumerate(shock_params):
-            
-            if param=='wage':
-                IncDist_dx = [IncShkDstn_wage_dx[e]]
-                
-            elif param =='tax':
-                IncDist_dx = [IncShkDstn_tax_dx[e]]
-            
-            elif param=='transfers':
-                
-                IncDist_dx = [IncShkDstn_transfers_dx[e]]
-            elif param =='UI_extend':
-                
-                IncDist_dx = [IncShkDstn_ui_extend_dx[e]]
-                
-            elif param =='UI_rr':
-                
-                IncDist_dx = [IncShkDstn_ui_rr_dx[e]]
+    agent_SS = compute_type_steady_state(BaseTypeList[e], beta, IncDist)
+    for s in s_list:
+        param = shock_params[s]
+        CJac, AJac, C_ss, A_ss = compute_type_jacobian(BaseTypeList[e], agent_SS, dicts[e], beta, IncDist, shock_inc_dist(e, param), param)
+        
+        farm['CJAC_all'][e,d,s] = CJac
+        farm['AJAC_all'][e,d,s] = AJac
+        farm['C_ss_all'][e,d,s] = C_ss
+        farm['A_ss_all'][e,d,s] = A_ss
+        for name in ['CJAC_all', 'AJAC_all', 'C_ss_all', 'A_ss_all']:
+            farm[name].flush()
+        # Mark the Jacobian as finished only once it is on disk
+        farm['JAC_done'][e,d,s] = True
+        farm['JAC_done'].flush()
+    return task
 
 
-            else:    
-                IncDist_dx = [IncShkDstn[e]]
+start = time.time()
 
-                
-                
-                
+farm = resume_jacobian_farm()
+tasks = []
+for e in range(num_educ_types): #education type
+    for d in range(len(DiscFacDstns[e].atoms[0])):
+        s_list = [s for s in range(len(shock_params)) if not farm['JAC_done'][e,d,s]]
+        if len(s_list) > 0:
+            tasks.append((e, d, s_list))
+print('Computing ' + str(sum(len(task[2]) for task in tasks)) + ' of ' + str(farm['JAC_done'].size) + ' Jacobians')
 
-            print(BaseTypeList[e])
+for n, (e, d, s_list) in enumerate(map_in_forked_pool(compute_farm_jacobians, tasks, num_workers_from_env())):
+    print('Finished Jacobians for education type ' + str(e) + ', beta ' + str(d) + ' (' + str(n+1) + ' of ' + str(len(tasks)) + ')')
 
-            CJac, AJac, C_ss, A_ss = compute_type_jacobian(BaseTypeList[e], dict, beta, IncDist, IncDist_dx, param)
-            
-            # if d == 6:
-                
-            #     plt.plot(CJac.T[30])
-            #     plt.show()
-            
-            
-            # if  param == "UI_extend" or param == 'UI_rr':
-                
-            #     plt.plot(CJac.T[0])
-            #     plt.plot(CJac.T[30])
-            #     plt.title(param)
-            #     plt.show()
-                
-            CJAC_all[e,d,s] = CJac
-            AJAC_all[e,d,s] = AJac
-            
-            C_ss_all[e,d,s] = C_ss
-            A_ss_all[e,d,s] = A_ss
-            
+CJAC_all = farm['CJAC_all']
+AJAC_all = farm['AJAC_all']
 
+C_ss_all = farm['C_ss_all']
+A_ss_all = farm['A_ss_all']
 
 print('time taken to compute all jacobians' , time.time() - start)
 
@@ -750,7 +737,7 @@ def compute_average_JAC(CJAC,AJAC):
 CJACs_weighted, AJACs_weighted = compute_average_JAC(CJAC_all,AJAC_all)
 C_ss_sim , A_ss_sim = compute_average_aggregates(C_ss_all , A_ss_all)
     
-print(C_ss,A_ss)
+print(C_ss_all[-1,-1,-1],A_ss_all[-1,-1,-1])
 
 #%%
 
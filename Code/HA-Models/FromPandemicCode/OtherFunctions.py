@@ -1,5 +1,9 @@
 import pickle
 import os.path
+import hashlib
+import numpy as np
+from HARK.distribution import DiscreteDistribution
+from HARK.core import Model
 
 
 
@@ -36,3 +40,48 @@ def getStimulus(simulation_base,simulation_alternative,Gov_Spending):
 def getNPVMultiplier(simulation_base,simulation_alternative,Gov_Spending):
     AddCons = getSimulationDiff(simulation_base,simulation_alternative,'NPV_AggCons')
     return  AddCons/Gov_Spending
+
+def calculate_NPV(X,Periods,R):
+    '''
+    Returns the net present value of X, which can be income or consumption, at
+    every horizon up to Periods: entry t is the sum of X[0:t+1] discounted at
+    the interest rate R.  X may also hold several series in its rows, in which
+    case every series is discounted in the same pass.
+    '''
+    NPV_discount = R**(-np.arange(Periods, dtype=float))
+    return np.cumsum(np.asarray(X)[...,:Periods]*NPV_discount, axis=-1)
+
+
+def hash_inputs(*objs):
+    '''
+    Returns a hex digest that changes whenever any of the given objects change.
+    Handles numbers, strings, None, numpy arrays, discrete distributions, Model
+    objects (by their attributes) and (nested) lists, tuples and dicts of these;
+    anything else is hashed by repr.
+    '''
+    h = hashlib.sha1()
+    def update(obj):
+        if isinstance(obj, np.ndarray):
+            h.update(('array' + str(obj.dtype) + str(obj.shape)).encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, DiscreteDistribution):
+            h.update(b'distribution')
+            update(obj.pmv)
+            update(list(obj.atoms))
+        elif isinstance(obj, (list, tuple)):
+            h.update(('list' + str(len(obj))).encode())
+            for item in obj:
+                update(item)
+        elif isinstance(obj, Model):
+            h.update(type(obj).__name__.encode())
+            update(vars(obj))
+        elif isinstance(obj, dict):
+            h.update(('dict' + str(len(obj))).encode())
+            for key in sorted(obj):
+                update(key)
+                update(obj[key])
+        else:
+            h.update(repr(obj).encode())
+    for obj in objs:
+        update(obj)
+    return h.hexdigest()
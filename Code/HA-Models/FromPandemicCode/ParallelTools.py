@@ -0,0 +1,365 @@
+'''
+This file has helper functions for running independent simulations of a solved
+AggregateDemandEconomy, and independent policy routines, in several processes at once.
+'''
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import traceback
+
+# Economy that forked worker processes run experiments on. Workers are forked
+# after this is set, so each one inherits its own copy-on-write snapshot of the
+# solved economy; nothing is pickled on the way in (the economy holds lambdas).
+SnapshotEconomy = None
+
+# Agent types, commands and output variables that the workers of a
+# ResidentTypePool inherit when they are forked, and keep for their lifetime.
+ResidentTypes = None
+ResidentCommands = None
+ResidentOutputs = None
+
+
+def can_fork():
+    '''
+    Returns True if worker processes can be started with the 'fork' method,
+    which is needed to hand them the economy without pickling it.
+    '''
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def num_workers_from_env(default=1):
+    '''
+    Reads the number of worker processes from the environment variable
+    HAFISCAL_NUM_WORKERS; 0 or a negative value means "use every core".
+    '''
+    num_workers = int(os.environ.get('HAFISCAL_NUM_WORKERS', default))
+    if num_workers <= 0:
+        num_workers = os.cpu_count()
+    return num_workers
+
+
+def run_experiment_on_snapshot(experiment_dict):
+    '''
+    Runs one experiment on this worker's snapshot of the economy.
+    '''
+    return SnapshotEconomy.run_experiment(**experiment_dict)
+
+
+def run_experiments_in_parallel(Economy, experiment_dicts, num_workers):
+    '''
+    Runs Economy.run_experiment once for each dictionary of keyword arguments
+    in experiment_dicts, spread over up to num_workers forked processes.
+
+    Every run starts from the state that Economy is in when this function is
+    called (run_experiment resets each agent's RNG and simulation state), so
+    the results are identical to calling run_experiment serially on Economy.
+    Falls back to a serial loop if num_workers is 1 or fork is unavailable.
+
+    Parameters
+    ----------
+    Economy : AggregateDemandEconomy
+        A solved economy, ready to run experiments.
+    experiment_dicts : [dict]
+        Keyword arguments for each call to run_experiment.
+    num_workers : int
+        Maximum number of worker processes.
+
+    Returns
+    -------
+    results : [dict]
+        Output of run_experiment for each entry of experiment_dicts, in order.
+    '''
+    global SnapshotEconomy
+    num_workers = min(num_workers, len(experiment_dicts))
+    if num_workers <= 1 or not can_fork():
+        return [Economy.run_experiment(**experiment_dict) for experiment_dict in experiment_dicts]
+
+    SnapshotEconomy = Economy
+    try:
+        with multiprocessing.get_context('fork').Pool(processes=num_workers) as pool:
+            results = pool.map(run_experiment_on_snapshot, experiment_dicts, chunksize=1)
+    finally:
+        SnapshotEconomy = None
+    return results
+
+
+def map_in_forked_pool(func, tasks, num_workers):
+    '''
+    Calls func on each entry of tasks in up to num_workers forked processes,
+    which inherit the state of this process when the pool starts, and yields
+    the results in the order the tasks finish.  func must be a module level
+    function.  Falls back to a serial loop if num_workers is 1 or fork is
+    unavailable.
+
+    Parameters
+    ----------
+    func : function
+        Function of one task.
+    tasks : [object]
+        Picklable arguments for each call to func.
+    num_workers : int
+        Maximum number of worker processes.
+
+    Returns
+    -------
+    results : generator
+        Output of func for each task, in the order the tasks finish.
+    '''
+    num_workers = min(num_workers, len(tasks))
+    if num_workers <= 1 or not can_fork():
+        for task in tasks:
+            yield func(task)
+        return
+
+    with multiprocessing.get_context('fork').Pool(processes=num_workers) as pool:
+        for result in pool.imap_unordered(func, tasks, chunksize=1):
+            yield result
+
+
+def run_resident_type(i, params):
+    '''
+    Sets new parameter values on this worker's copy of agent type i, calls the
+    pool's methods on it and returns the requested state variables or attributes.
+    '''
+    ThisType = ResidentTypes[i]
+    for key in params:
+        setattr(ThisType, key, params[key])
+    for method in ResidentCommands:
+        getattr(ThisType, method)()
+    return {var: ThisType.state_now[var] if var in ThisType.state_now else getattr(ThisType, var)
+            for var in ResidentOutputs}
+
+
+def resident_type_worker(conn):
+    '''
+    Main loop of one ResidentTypePool worker: receives a list of (i, params)
+    pairs for the types this worker owns, runs them, and sends back their
+    outputs (or the traceback of the first error) until it receives None.
+    '''
+    while True:
+        tasks = conn.recv()
+        if tasks is None:
+            break
+        try:
+            conn.send([run_resident_type(i, params) for (i, params) in tasks])
+        except Exception:
+            conn.send(RuntimeError(traceback.format_exc()))
+    conn.close()
+
+
+class ResidentTypePool():
+    '''
+    A persistent set of forked worker processes, each of which owns a fixed
+    group of agent types for as long as the pool is open: type i always runs in
+    worker i % num_workers, so whatever state a type keeps between calls (its
+    solution cache, warm-start snapshot, last parameters) is always there when
+    it runs again.  A call to run() sends each type only a few new parameter
+    values, and gets back only the state variables named in outputs, so no
+    agent type is pickled after the workers start.  The types are copied when
+    the pool is created; later changes to them in this process are not seen by
+    the workers.
+    '''
+    def __init__(self, AgentTypes, commands, outputs, num_workers):
+        '''
+        Parameters
+        ----------
+        AgentTypes : [AgentType]
+            Agent types to divide among the workers.
+        commands : [str]
+            Names of the methods to call, without arguments, on a type after
+            setting its parameters, e.g. ['solve', 'simulate'].
+        outputs : [str]
+            Names of the variables in state_now (or else attributes of the type)
+            to send back after the commands.
+        num_workers : int
+            Number of worker processes.
+        '''
+        global ResidentTypes, ResidentCommands, ResidentOutputs
+        if not can_fork():
+            raise RuntimeError('ResidentTypePool needs the fork start method.')
+        for method in commands:
+            if not callable(getattr(AgentTypes[0], method, None)):
+                raise ValueError(method + ' is not a method of the agent types.')
+        self.num_types = len(AgentTypes)
+        num_workers = max(min(num_workers, self.num_types), 1)
+        self.groups = [list(range(w, self.num_types, num_workers)) for w in range(num_workers)]
+        self.conns = []
+        self.workers = []
+        ResidentTypes = AgentTypes
+        ResidentCommands = list(commands)
+        ResidentOutputs = list(outputs)
+        context = multiprocessing.get_context('fork')
+        try:
+            for w in range(num_workers):
+                (conn, worker_conn) = context.Pipe()
+                worker = context.Process(target=resident_type_worker, args=(worker_conn,), daemon=True)
+                worker.start()
+                worker_conn.close()
+                self.conns.append(conn)
+                self.workers.append(worker)
+        finally:
+            ResidentTypes = None
+            ResidentCommands = None
+            ResidentOutputs = None
+
+    def run(self, type_params):
+        '''
+        Parameters
+        ----------
+        type_params : [dict]
+            New parameter values for each agent type, in the order of AgentTypes.
+
+        Returns
+        -------
+        results : [dict]
+            The output variables of each agent type, in the same order.
+        '''
+        if len(type_params) != self.num_types:
+            raise ValueError('Expected parameters for ' + str(self.num_types) + ' agent types.')
+        for (conn, group) in zip(self.conns, self.groups):
+            conn.send([(i, type_params[i]) for i in group])
+        results = [None]*self.num_types
+        errors = []
+        for (conn, group) in zip(self.conns, self.groups):
+            output = conn.recv()
+            if isinstance(output, Exception):
+                errors.append(output)
+                continue
+            for (i, result) in zip(group, output):
+                results[i] = result
+        if errors:
+            raise errors[0]
+        return results
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(None)
+            conn.close()
+        for worker in self.workers:
+            worker.join()
+
+
+def available_memory():
+    '''
+    Returns the number of bytes of memory available for new processes, or None
+    if this cannot be determined on this platform.
+    '''
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1])*1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def process_memory():
+    '''
+    Returns the resident memory of this process in bytes, or None if this
+    cannot be determined on this platform.
+    '''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1])*os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+class TaskScheduler():
+    '''
+    Runs named tasks, each in its own forked process, with at most num_workers
+    running at once. A task starts only after every task in its deps has
+    finished successfully, and (unless nothing else is running) only when the
+    memory available exceeds mem_per_task. Tasks communicate through the files
+    they write, not through return values.
+
+    With num_workers=1, or where fork is unavailable, run() simply calls the
+    tasks one after another in this process, in the order they were added.
+    '''
+    def __init__(self, num_workers=1, mem_per_task=None, poll_interval=5.0):
+        '''
+        Parameters
+        ----------
+        num_workers : int
+            Maximum number of tasks running at once.
+        mem_per_task : int or None
+            Bytes of memory a task is expected to need. If None, the memory
+            used by this process when run() is called is taken as the estimate,
+            since each task works on a copy of the state held here.
+        poll_interval : float
+            Seconds between re-checks of available memory while tasks are
+            waiting for admission.
+        '''
+        self.num_workers = max(1, num_workers)
+        self.mem_per_task = mem_per_task
+        self.poll_interval = poll_interval
+        self.tasks = []
+        self.task_names = set()
+
+    def add_task(self, name, func, *args, deps=(), **kwds):
+        '''
+        Queue func(*args, **kwds) under the given name, to be run after all of
+        the (previously added) tasks named in deps.
+        '''
+        if name in self.task_names:
+            raise ValueError('A task named ' + name + ' was already added.')
+        for dep in deps:
+            if dep not in self.task_names:
+                raise ValueError('Task ' + name + ' depends on unknown task ' + dep + '.')
+        self.tasks.append((name, func, args, kwds, tuple(deps)))
+        self.task_names.add(name)
+
+    def memory_allows(self, mem_per_task):
+        if mem_per_task is None:
+            return True
+        mem_available = available_memory()
+        return mem_available is None or mem_available >= mem_per_task
+
+    def run(self):
+        '''
+        Run all queued tasks and empty the queue. Raises RuntimeError if any
+        task fails; tasks depending on a failed task are skipped.
+        '''
+        tasks = self.tasks
+        self.tasks = []
+        self.task_names = set()
+        if self.num_workers <= 1 or len(tasks) <= 1 or not can_fork():
+            for (name, func, args, kwds, deps) in tasks:
+                func(*args, **kwds)
+            return
+
+        mem_per_task = self.mem_per_task if self.mem_per_task is not None else process_memory()
+        ctx = multiprocessing.get_context('fork')
+        pending = list(tasks)
+        running = dict()
+        done = set()
+        failed = []
+        while pending or running:
+            for task in [task for task in pending if any(dep in failed for dep in task[4])]:
+                print('Skipping task ' + task[0] + ' because a task it depends on failed.')
+                pending.remove(task)
+                failed.append(task[0])
+            ready = [task for task in pending if all(dep in done for dep in task[4])]
+            for task in ready:
+                if len(running) >= self.num_workers:
+                    break
+                if running and not self.memory_allows(mem_per_task):
+                    break
+                (name, func, args, kwds, deps) = task
+                process = ctx.Process(target=func, args=args, kwargs=kwds, name=name)
+                process.start()
+                running[process.sentinel] = (name, process)
+                pending.remove(task)
+            if not running:
+                continue
+            for sentinel in wait(list(running), timeout=self.poll_interval):
+                (name, process) = running.pop(sentinel)
+                process.join()
+                if process.exitcode == 0:
+                    done.add(name)
+                else:
+                    print('Task ' + name + ' failed with exit code ' + str(process.exitcode) + '.')
+                    failed.append(name)
+        if failed:
+            raise RuntimeError('These tasks failed or were skipped: ' + ', '.join(failed))
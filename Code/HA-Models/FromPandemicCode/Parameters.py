@@ -478,6 +478,8 @@ def returnParameters(Parametrization='Baseline',OutputFor='_Main.py'):
                     'UpdatePrb' : 1.0,
                     'Splurge' : Splurge,
                     'track_vars' : [],
+                    'EGMkernel' : False, # Solve with the compiled kernels in EGMKernels.py
+                    'shock_history_cache_size' : 100*2**20, # Bytes of counterfactual shock histories kept per education type, so repeated experiments reuse them
                     'EducType': 0
                     }
     
@@ -577,6 +579,12 @@ def returnParameters(Parametrization='Baseline',OutputFor='_Main.py'):
     num_max_iterations_solvingAD = 15
     convergence_tol_solvingAD = 1E-4
     Cfunc_iter_stepsize       = 1
+    Cfunc_iter_method         = 'damped'  # 'damped' or 'anderson' update of the AD Cratio intercepts
+    Cfunc_iter_memory         = 5         # Number of past iterations used by the Anderson update
+    Cfunc_iter_warm_start     = False     # Start each AD iteration's solve from the previous solution
+    ADsolution_cache          = False     # Keep AD solutions on disk and reuse them if their inputs are unchanged
+    ADsolution_seed           = False     # Start the AD iteration from the closest stored AD solution
+    fused_simulation          = False     # Simulate all agent types together in run_experiment
     act_T = 400
     
     if Parametrization == 'Reduced_Run':
@@ -592,6 +600,12 @@ def returnParameters(Parametrization='Baseline',OutputFor='_Main.py'):
                          'ADelasticity' : 0.0,
                          'demand_ADelasticity' : ADelasticity,
                          'Cfunc_iter_stepsize' : Cfunc_iter_stepsize,
+                         'Cfunc_iter_method' : Cfunc_iter_method,
+                         'Cfunc_iter_memory' : Cfunc_iter_memory,
+                         'Cfunc_iter_warm_start' : Cfunc_iter_warm_start,
+                         'ADsolution_cache' : ADsolution_cache,
+                         'ADsolution_seed' : ADsolution_seed,
+                         'fused_simulation' : fused_simulation,
                          'MrkvArray' : MrkvArray_base_h,
                          'MrkvArray_recession' : MrkvArray_recession_h,
                          'MrkvArray_recessionUI' : MrkvArray_recessionUI_h,
@@ -1,4 +1,14 @@
-def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
+def Simulate(Run_Dict,figs_dir,Parametrization='Baseline',scheduler=None):
+    '''
+    Set up and solve the economy for Parametrization, run the baseline, and run
+    the policy routines selected in Run_Dict. The routines are independent and
+    run as tasks named Parametrization + ':' + shock_type on a TaskScheduler,
+    with up to Run_Dict['num_workers'] at once. If a scheduler is passed, the
+    routines are only added to it (so that other tasks can depend on them) and
+    the caller is responsible for calling scheduler.run().
+    
+    Returns the names of the routine tasks.
+    '''
     
     
     from AggFiscalModel import AggFiscalType, AggregateDemandEconomy
@@ -7,6 +17,7 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
     import numpy as np
     from copy import deepcopy
     from OtherFunctions import saveAsPickleUnderVarName,  saveAsPickle
+    from ParallelTools import run_experiments_in_parallel, TaskScheduler
     import os
     
     from Parameters import returnParameters 
@@ -33,6 +44,7 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
     Run_AD                  = Run_Dict['Run_AD ']
     Run_1stRoundAD          = Run_Dict['Run_1stRoundAD']
     Run_NonAD               = Run_Dict['Run_NonAD'] 
+    num_workers             = Run_Dict.get('num_workers', 1) # processes for the policy routines and recession-length sweeps
     
     
     if Parametrization.find('PVSame')>0:
@@ -65,6 +77,12 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
     InfHorizonTypeAgg_c = AggFiscalType(**init_college)
     InfHorizonTypeAgg_c.cycles = 0
     AggDemandEconomy = AggregateDemandEconomy(**init_ADEconomy)
+    if AggDemandEconomy.ADsolution_cache:
+        # AD solutions are kept with this parametrization's results
+        AggDemandEconomy.ADsolution_cache_dir = figs_dir + 'ADsolution_cache/'
+        if AggDemandEconomy.ADsolution_seed:
+            # Seed the AD iterations only from solutions stored before this run
+            AggDemandEconomy.snapshot_ADsolution_cache()
     InfHorizonTypeAgg_d.get_economy_data(AggDemandEconomy)
     InfHorizonTypeAgg_h.get_economy_data(AggDemandEconomy)
     InfHorizonTypeAgg_c.get_economy_data(AggDemandEconomy)
@@ -103,7 +121,7 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
         for b in range(DiscFacCount):
             DiscFac = DiscFacDstns[e].atoms[0][b]
             AgentCount = int(np.floor(AgentCountTotal*data_EducShares[e]*DiscFacDstns[e].pmv[b]))
-            ThisType = deepcopy(BaseTypeList[e])
+            ThisType = BaseTypeList[e].spawn()
             ThisType.AgentCount = AgentCount
             ThisType.DiscFac = DiscFac
             ThisType.seed = n
@@ -150,6 +168,7 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
         saveAsPickleUnderVarName(base_results_full,figs_dir,locals())
         
         AggDemandEconomy.store_baseline(base_results['AggCons'])     
+        AggDemandEconomy.clear_shock_history_caches()
         t1 = time()
         print('Calculating agg consumption took ' + mystr(t1-t0) + ' seconds.')
         
@@ -162,15 +181,19 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
         t0 = time()
         dictt = base_dict_agg.copy()
         dictt.update(**dict_changes)
-        all_results = []
+        all_dicts = []
         avg_results = dict()
         #  running recession with diferent lengths up to max_recession_duration then averaging the result
         for t in range(max_recession_duration):
             dictt['EconomyMrkv_init'] = list(np.arange(1,AggDemandEconomy.num_experiment_periods+1)*2) + [0]*20 
             dictt['EconomyMrkv_init'][0:t+1] = np.array(dictt['EconomyMrkv_init'][0:t+1]) +1
             print(dictt['EconomyMrkv_init'])
-            this_result = AggDemandEconomy.run_experiment(**dictt, Full_Output = True)
-            all_results += [this_result]
+            all_dicts += [dict(dictt, Full_Output = True)]
+        if sweep_workers > 1:
+            # Solve here once (if needed) rather than in every worker
+            AggDemandEconomy.solve_for_experiment(dictt['shock_type'])
+        # The runs only read the solved economy, so they can be done in parallel
+        all_results = run_experiments_in_parallel(AggDemandEconomy, all_dicts, sweep_workers)
         for key in output_keys:
             avg_results[key] = np.sum(np.array([all_results[t][key]*recession_prob_array[t]  for t in range(max_recession_duration)]), axis=0)   
         t1 = time()
@@ -203,6 +226,7 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
             AggDemandEconomy_Routine.solve()
             results = runExperimentsNoRecessions(changes,AggDemandEconomy_Routine)
             saveAsPickle(shock_type + '_results',results,figs_dir)
+        AggDemandEconomy_Routine.clear_shock_history_caches()
             
     def Run_FullRoutine(shock_type):
         AggDemandEconomy_Routine = deepcopy(AggDemandEconomy)
@@ -269,27 +293,45 @@ def Simulate(Run_Dict,figs_dir,Parametrization='Baseline'):
             [results_firstRoundAD,all_results_firstRoundAD] = runExperimentsAllRecessions(changes,AggDemandEconomy_Routine)
             saveAsPickle(shock_type + '_results_firstRoundAD',results_firstRoundAD,figs_dir)
             saveAsPickle(shock_type + '_all_results_firstRoundAD',all_results_firstRoundAD,figs_dir)
+        
+        # The next routine has other shock types, so its experiments cannot reuse these
+        AggDemandEconomy_Routine.clear_shock_history_caches()
     
 
          
         
     #%% Simulation
-        
+    
+    # Each routine works on its own deepcopy of AggDemandEconomy, so they can run concurrently
+    run_here = scheduler is None
+    if run_here:
+        scheduler = TaskScheduler(num_workers = num_workers)
+    routines = []
     if Run_Recession: 
-        Run_FullRoutine('recession')
+        routines += [(Run_FullRoutine, 'recession')]
     if Run_Check_Recession:
-        Run_FullRoutine('recessionCheck')
+        routines += [(Run_FullRoutine, 'recessionCheck')]
     if Run_UB_Ext_Recession:
-        Run_FullRoutine('recessionUI') 
+        routines += [(Run_FullRoutine, 'recessionUI')]
     if Run_TaxCut_Recession:
-        Run_FullRoutine('recessionTaxCut')
+        routines += [(Run_FullRoutine, 'recessionTaxCut')]
         
     if Run_Check:
-        Run_FullRoutineNoRecessions('Check')
+        routines += [(Run_FullRoutineNoRecessions, 'Check')]
     if Run_UB_Ext:
-        Run_FullRoutineNoRecessions('UI') 
+        routines += [(Run_FullRoutineNoRecessions, 'UI')]
     if Run_TaxCut:
-        Run_FullRoutineNoRecessions('TaxCut')
-  
+        routines += [(Run_FullRoutineNoRecessions, 'TaxCut')]
     
- 
+    # Split the worker budget between concurrent routines and their recession-length sweeps
+    if scheduler.num_workers > 1 and len(routines) > 1:
+        sweep_workers = max(1, num_workers // min(scheduler.num_workers, len(routines)))
+    else:
+        sweep_workers = num_workers
+    task_names = []
+    for (routine, shock_type) in routines:
+        task_names.append(Parametrization + ':' + shock_type)
+        scheduler.add_task(task_names[-1], routine, shock_type)
+    if run_here:
+        scheduler.run()
+    return task_names
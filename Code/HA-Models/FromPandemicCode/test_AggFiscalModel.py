@@ -0,0 +1,454 @@
+"""
+test_AggFiscalModel.py – Tests of the computational shortcuts in AggFiscalModel.py
+
+Each test checks a fast path against the slower computation it replaces, on
+types built from the estimation parameters in EstimParameters.py or, for whole
+experiments, on a small economy with the Reduced_Run parameters of Parameters.py.
+"""
+
+import os
+import pickle
+import sys
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from HARK.distribution import DiscreteDistribution
+from HARK.utilities import get_lorenz_shares, get_percentiles
+
+# The modules in this directory import each other by name, and EstimParameters
+# reads its targets from a path relative to this directory and its settings
+# from the command line, which here belongs to pytest
+this_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, this_dir)
+
+original_cwd = os.getcwd()
+original_argv = sys.argv
+os.chdir(this_dir)
+sys.argv = sys.argv[:1]
+try:
+    from EstimParameters import init_dropout, init_ADEconomy, UBspell_normal
+    from AggFiscalModel import (
+        AggFiscalType,
+        AggregateDemandEconomy,
+        CRule,
+        SolutionCache,
+        anderson_update,
+        group_agents_by_state,
+    )
+    from Parameters import returnParameters
+finally:
+    os.chdir(original_cwd)
+    sys.argv = original_argv
+
+
+def make_type(**kwds):
+    """
+    Make a dropout type with the income distributions of EstimAggFiscalMAIN.py.
+    """
+    economy = AggregateDemandEconomy(**init_ADEconomy)
+    agent = AggFiscalType(**init_dropout)
+    agent.cycles = 0
+    agent.get_economy_data(economy)
+    IncShkDstn_unemp = DiscreteDistribution(
+        np.array([1.0]), [np.array([1.0]), np.array([agent.IncUnemp])]
+    )
+    IncShkDstn_unemp_nob = DiscreteDistribution(
+        np.array([1.0]), [np.array([1.0]), np.array([agent.IncUnempNoBenefits])]
+    )
+    agent.IncShkDstn = [
+        [agent.IncShkDstn[0]] + [IncShkDstn_unemp] * UBspell_normal + [IncShkDstn_unemp_nob]
+    ]
+    agent.AggDemandFac = 1.0
+    agent.RfreeNow = 1.0
+    agent.CaggNow = 1.0
+    agent.Cratio = 1.0
+    agent.EconomyMrkvNow = 0
+    for key, value in kwds.items():
+        setattr(agent, key, value)
+    return agent
+
+
+def make_economy(AgentCountTotal):
+    """
+    Make the economy of Simulate.py with the Reduced_Run parametrization and
+    AgentCountTotal agents, ready to run counterfactual experiments.
+    """
+    [init_dropout, init_highschool, init_college, init_ADEconomy, DiscFacDstns,
+     DiscFacCount, _, _, _, _, UBspell_normal, num_base_MrkvStates,
+     data_EducShares, _, num_experiment_periods, *_] = returnParameters(
+        Parametrization="Reduced_Run", OutputFor="_Main.py"
+    )
+    economy = AggregateDemandEconomy(**init_ADEconomy)
+    BaseTypeList = []
+    for init_dict in [init_dropout, init_highschool, init_college]:
+        ThisType = AggFiscalType(**init_dict)
+        ThisType.cycles = 0
+        ThisType.get_economy_data(economy)
+        BaseTypeList.append(ThisType)
+
+    IncShkDstn_unemp = DiscreteDistribution(
+        np.array([1.0]), [np.array([1.0]), np.array([BaseTypeList[0].IncUnemp])]
+    )
+    IncShkDstn_unemp_nob = DiscreteDistribution(
+        np.array([1.0]), [np.array([1.0]), np.array([BaseTypeList[0].IncUnempNoBenefits])]
+    )
+    for ThisType in BaseTypeList:
+        EmployedIncShkDstn = deepcopy(ThisType.IncShkDstn[0])
+        ThisType.IncShkDstn = [
+            [ThisType.IncShkDstn[0]] + [IncShkDstn_unemp] * UBspell_normal + [IncShkDstn_unemp_nob]
+        ]
+        ThisType.IncShkDstn_base = ThisType.IncShkDstn
+        IncShkDstn_recession = [ThisType.IncShkDstn[0] * (2 * (num_experiment_periods + 1))]
+        ThisType.IncShkDstn_recession = IncShkDstn_recession
+        ThisType.IncShkDstn_recessionUI = IncShkDstn_recession
+        EmployedIncShkDstn.atoms[0][1] = EmployedIncShkDstn.atoms[0][1] * ThisType.TaxCutIncFactor
+        TaxCutStatesIncShkDstn = (
+            [EmployedIncShkDstn] + [IncShkDstn_unemp] * UBspell_normal + [IncShkDstn_unemp_nob]
+        )
+        IncShkDstn_recessionTaxCut = deepcopy(IncShkDstn_recession)
+        for i in range(2 * num_base_MrkvStates, 18 * num_base_MrkvStates):
+            IncShkDstn_recessionTaxCut[0][i] = TaxCutStatesIncShkDstn[np.mod(i, 4)]
+        ThisType.IncShkDstn_recessionTaxCut = IncShkDstn_recessionTaxCut
+        ThisType.IncShkDstn_recessionCheck = deepcopy(IncShkDstn_recession)
+
+    TypeList = []
+    for e in range(len(BaseTypeList)):
+        for b in range(DiscFacCount):
+            ThisType = BaseTypeList[e].spawn()
+            ThisType.AgentCount = int(
+                np.floor(AgentCountTotal * data_EducShares[e] * DiscFacDstns[e].pmv[b])
+            )
+            ThisType.DiscFac = DiscFacDstns[e].atoms[0][b]
+            ThisType.seed = len(TypeList)
+            TypeList.append(ThisType)
+    economy.agents = TypeList
+    economy.solve()
+
+    economy.reset()
+    for agent in economy.agents:
+        agent.initialize_sim()
+        agent.AggDemandFac = 1.0
+        agent.RfreeNow = 1.0
+        agent.CaggNow = 1.0
+    economy.make_history()
+    economy.save_state()
+    economy.switch_to_counterfactual_mode("base")
+    economy.make_idiosyncratic_shock_histories()
+    return economy
+
+
+@pytest.fixture(scope="module")
+def solved_type():
+    agent = make_type(DiscFac=0.96, T_age=None)
+    agent.solve()
+    return agent
+
+
+def wealth_moments(aNrm, aLvl, pLvl, weights):
+    """Median and mean aNrm, aggregate wealth to income, and Lorenz points."""
+    weights = weights / np.sum(weights)
+    return {
+        "median": get_percentiles(aNrm, weights=weights, percentiles=[0.5])[0],
+        "mean": np.dot(aNrm, weights),
+        "LWoPI": np.dot(aLvl, weights) / np.dot(pLvl, weights),
+        "lorenz": get_lorenz_shares(aLvl, weights=weights, percentiles=[0.2, 0.4, 0.6, 0.8]),
+    }
+
+
+def test_calc_wealth_histogram(solved_type):
+    """
+    The histogram has the moments of a large simulation of the same type.  The
+    tolerances are a few standard errors of the simulated moments; T_sim is
+    shortened to keep the simulation quick, but is still longer than
+    hist_joint_periods, so the histogram starts with separate distributions of
+    mNrm and pLvl.
+    """
+    agent = deepcopy(solved_type)
+    agent.T_sim = 100
+    assert agent.T_sim > agent.hist_joint_periods
+    agent.calc_wealth_histogram()
+    hist = agent.wealth_histogram
+    assert np.isclose(np.sum(hist["prob"]), 1.0)
+    hist_moments = wealth_moments(hist["aNrm"], hist["aLvl"], hist["pLvl"], hist["prob"])
+
+    agent.AgentCount = 100000
+    agent.seed = 1
+    agent.reset_rng()
+    agent.initialize_sim()
+    agent.simulate()
+    sim_moments = wealth_moments(
+        agent.state_now["aNrm"], agent.state_now["aLvl"], agent.state_now["pLvl"],
+        np.ones(agent.AgentCount),
+    )
+
+    assert hist_moments["median"] == pytest.approx(sim_moments["median"], rel=0.02)
+    assert hist_moments["mean"] == pytest.approx(sim_moments["mean"], rel=0.01)
+    assert hist_moments["LWoPI"] == pytest.approx(sim_moments["LWoPI"], rel=0.02)
+    np.testing.assert_allclose(hist_moments["lorenz"], sim_moments["lorenz"], atol=0.003)
+
+
+def test_simulate_ergodic(solved_type):
+    """
+    The first call of simulate_ergodic is a full simulation, and a warm-started
+    call repeats it exactly at the same DiscFac.  At another DiscFac, a warm
+    start gives the agents, Markov states and permanent income of a full
+    simulation, assets close to its assets, and the same result each time.
+    """
+    def sim_results(agent):
+        return [agent.state_now["aNrm"].copy(), agent.state_now["pLvl"].copy(),
+                agent.shocks["Mrkv"].copy(), agent.t_age.copy()]
+
+    agent = make_type(DiscFac=0.96, T_age=None, T_sim=60, burn_in_periods=20, AgentCount=2000)
+    agent.solution = solved_type.solution
+    agent.initialize_sim()
+    agent.simulate()
+    full = sim_results(agent)
+    agent.simulate_ergodic()
+    for x, y in zip(sim_results(agent), full):
+        np.testing.assert_array_equal(x, y)
+    agent.simulate_ergodic()
+    for x, y in zip(sim_results(agent), full):
+        np.testing.assert_array_equal(x, y)
+
+    other = make_type(DiscFac=0.95, T_age=None, T_sim=60, burn_in_periods=20, AgentCount=2000)
+    other.solve()
+    other.initialize_sim()
+    other.simulate()
+    other_full = sim_results(other)
+    other.warm_start_snapshots = agent.warm_start_snapshots
+    other.simulate_ergodic()
+    warm = sim_results(other)
+    for x, y in zip(warm[1:], other_full[1:]):
+        np.testing.assert_array_equal(x, y)
+    assert np.mean(warm[0]) == pytest.approx(np.mean(other_full[0]), rel=0.02)
+    assert np.mean(warm[0]) != pytest.approx(np.mean(full[0]), rel=0.02)
+    other.simulate_ergodic()
+    np.testing.assert_array_equal(other.state_now["aNrm"], warm[0])
+
+
+def test_fused_simulation():
+    """
+    Simulating all types at once as a FusedPopulation gives exactly the results
+    of simulating them type by type, in a recession with stimulus checks so
+    that both the macro and micro Markov states change over the experiment.
+    """
+    economy = make_economy(AgentCountTotal=300)
+    economy.switch_shock_type("recessionCheck")
+    economy.solve_for_experiment("recessionCheck")
+    EconomyMrkv_init = list(np.arange(1, economy.num_experiment_periods + 1) * 2) + [0] * 20
+    EconomyMrkv_init[0:3] = np.array(EconomyMrkv_init[0:3]) + 1
+    experiment = {"shock_type": "recessionCheck", "EconomyMrkv_init": EconomyMrkv_init}
+
+    results = []
+    for fused_simulation in [False, True]:
+        this_economy = deepcopy(economy)
+        this_economy.fused_simulation = fused_simulation
+        output = this_economy.run_experiment(**experiment)
+        history = {
+            var_name: np.concatenate([agent.history[var_name] for agent in this_economy.agents], axis=1)
+            for var_name in this_economy.agents[0].history
+        }
+        results.append((output, history, this_economy.history))
+
+    (output, history, economy_history), (fused_output, fused_history, fused_economy_history) = results
+    for key in output:
+        np.testing.assert_array_equal(fused_output[key], output[key], err_msg=key)
+    for var_name in history:
+        np.testing.assert_array_equal(fused_history[var_name], history[var_name], err_msg=var_name)
+    for var_name in economy_history:
+        np.testing.assert_array_equal(
+            fused_economy_history[var_name], economy_history[var_name], err_msg=var_name
+        )
+
+    # The tracked Markov states follow the simulated ones in every period
+    num_base_MrkvStates = economy.num_base_MrkvStates
+    np.testing.assert_array_equal(history["MacroMrkvNow"], output["Mrkv_hist"] // num_base_MrkvStates)
+    np.testing.assert_array_equal(history["MicroMrkvNow"], output["Mrkv_hist"] % num_base_MrkvStates)
+    assert np.unique(history["MacroMrkvNow"]).size > 1
+
+
+def test_group_agents_by_state():
+    """
+    Each group holds exactly the agents in that state, in their original order,
+    and agents in states outside [0, StateCount) are in no group.
+    """
+    rng = np.random.default_rng(0)
+    state = rng.integers(-1, 7, size=500)
+    order, bounds = group_agents_by_state(state, 6)
+    assert bounds.size == 7
+    for j in range(6):
+        np.testing.assert_array_equal(order[bounds[j]:bounds[j + 1]], np.flatnonzero(state == j))
+    assert order.size == np.sum(np.logical_and(state >= 0, state < 6))
+
+
+def test_get_controls(solved_type):
+    """
+    Consumption and MPCs evaluated once per group of agents in the same
+    perceived Markov state are those of evaluating each agent's own cFunc.
+    """
+    rng = np.random.default_rng(0)
+    agent = deepcopy(solved_type)
+    agent.AgentCount = 1000
+    agent.initialize_sim()
+    J = agent.MrkvArray[0].shape[0]
+    agent.state_now["mNrm"] = rng.uniform(0.0, 20.0, size=agent.AgentCount)
+    agent.MrkvNowPcvd = rng.integers(0, J, size=agent.AgentCount)
+    agent.shocks["TranShk"] = np.ones(agent.AgentCount)
+    agent.Cratio = 1.05
+    agent.get_controls()
+
+    cNrm = np.zeros(agent.AgentCount)
+    MPC = np.zeros(agent.AgentCount)
+    for i in range(agent.AgentCount):
+        cFunc = agent.solution[agent.t_cycle[i]].cFunc[agent.MrkvNowPcvd[i]]
+        mNrm = agent.state_now["mNrm"][i : i + 1]
+        cNrm[i] = cFunc(mNrm, np.array([agent.Cratio]))[0]
+        MPC[i] = cFunc.derivativeX(mNrm, np.array([agent.Cratio]))[0]
+    np.testing.assert_allclose(agent.controls["cNrm"], cNrm, rtol=1e-13)
+    np.testing.assert_allclose(agent.MPCNow, MPC, rtol=1e-13)
+
+
+def test_anderson_update():
+    """
+    With one past guess, the Anderson update is the damped step, and it finds
+    the fixed point of a linear map in fewer iterations than damped steps do.
+    """
+    rng = np.random.default_rng(0)
+    A = rng.uniform(size=(6, 6))
+    A *= 0.9 / np.max(np.abs(np.linalg.eigvals(A)))
+    c = rng.uniform(size=6)
+    x_star = np.linalg.solve(np.eye(6) - A, c)
+    G = lambda x: c + A.dot(x)
+
+    x = np.ones(6)
+    np.testing.assert_allclose(anderson_update([x], [G(x)], 0.5), x + 0.5 * (G(x) - x))
+
+    def iterate(step_rule):
+        x = np.ones(6)
+        X_hist, G_hist = [], []
+        for iterations in range(2000):
+            if np.max(np.abs(G(x) - x)) < 1e-10:
+                return x, iterations
+            X_hist.append(x)
+            G_hist.append(G(x))
+            x = step_rule(X_hist[-6:], G_hist[-6:])
+        raise AssertionError("no convergence")
+
+    x_damped, damped_iterations = iterate(lambda X, Gx: anderson_update(X[-1:], Gx[-1:], 0.5))
+    x_anderson, anderson_iterations = iterate(lambda X, Gx: anderson_update(X, Gx, 0.5))
+    np.testing.assert_allclose(x_damped, x_star, atol=1e-9)
+    np.testing.assert_allclose(x_anderson, x_star, atol=1e-9)
+    assert anderson_iterations < damped_iterations
+
+
+def test_anderson_CFunc_step():
+    """
+    Iterating on the Cratio intercepts of the AD fixed point with
+    anderson_CFunc_step converges to the same CFunc as the damped step of
+    solveAD_Recession, with the other CFunc entries left at no AD effect.
+    """
+    rng = np.random.default_rng(1)
+    economy = AggregateDemandEconomy(**init_ADEconomy)
+    economy.num_experiment_periods = 4
+    economy.Cfunc_iter_memory = 5
+    economy.Cfunc_iter_stepsize = 0.5
+    nb = economy.num_base_MrkvStates
+    dim = 2 * economy.num_experiment_periods + 2
+    pairs = economy.AD_CFunc_pairs()
+    A = rng.uniform(size=(len(pairs), len(pairs)))
+    A *= 0.9 / np.max(np.abs(np.linalg.eigvals(A)))
+    c = rng.uniform(size=len(pairs))
+    G = lambda x: c + A.dot(x)
+
+    def intercepts(CFunc):
+        return np.array([CFunc[i * nb][j * nb].intercept for (i, j) in pairs])
+
+    def damped_step(Old_Cfunc, New_Cfunc):
+        step = economy.Cfunc_iter_stepsize
+        return [
+            [CRule(Old.intercept + step * (New.intercept - Old.intercept), Old.slope + step * (New.slope - Old.slope))
+             for (Old, New) in zip(Old_row, New_row)]
+            for (Old_row, New_row) in zip(Old_Cfunc, New_Cfunc)
+        ]
+
+    results = []
+    for method in ["damped", "anderson"]:
+        economy.CFunc = [[CRule(1.0, 0.0) for i in range(dim * nb)] for j in range(dim * nb)]
+        X_hist, G_hist = [], []
+        for iterations in range(2000):
+            x = intercepts(economy.CFunc)
+            if np.max(np.abs(G(x) - x)) < 1e-10:
+                break
+            MacroCFunc = [[CRule(1.0, 0.0) for i in range(dim)] for j in range(dim)]
+            for (i, j), intercept in zip(pairs, G(x)):
+                MacroCFunc[i][j] = CRule(intercept, 0.0)
+            if method == "anderson":
+                economy.CFunc = economy.anderson_CFunc_step(economy.CFunc, MacroCFunc, X_hist, G_hist)
+            else:
+                economy.CFunc = damped_step(economy.CFunc, economy.Macro_2_Micro_CFunc(MacroCFunc))
+        results.append((economy.CFunc, iterations))
+
+    (damped_CFunc, damped_iterations), (anderson_CFunc, anderson_iterations) = results
+    np.testing.assert_allclose(intercepts(anderson_CFunc), intercepts(damped_CFunc), atol=1e-9)
+    np.testing.assert_allclose(intercepts(anderson_CFunc), np.linalg.solve(np.eye(len(pairs)) - A, c), atol=1e-9)
+    assert anderson_iterations < damped_iterations
+    solved = {(i * nb + k, j * nb + l) for (i, j) in pairs for k in range(nb) for l in range(nb)}
+    for ii in range(dim * nb):
+        for jj in range(dim * nb):
+            if (ii, jj) not in solved:
+                assert (anderson_CFunc[ii][jj].intercept, anderson_CFunc[ii][jj].slope) == (1.0, 0.0)
+
+
+def test_EGM_kernel(solved_type):
+    """
+    Solving with the compiled end-of-period marginal value kernel gives the
+    consumption functions of the default solver.
+    """
+    agent = make_type(DiscFac=0.96, T_age=None, EGMkernel=True)
+    agent.solve()
+    assert agent.solution is not solved_type.solution
+    mNrm, Cratio = np.meshgrid(np.linspace(0.0, 30.0, 200), np.linspace(0.9, 1.1, 5))
+    for cFunc, cFunc_default in zip(agent.solution[0].cFunc, solved_type.solution[0].cFunc):
+        np.testing.assert_allclose(cFunc(mNrm, Cratio), cFunc_default(mNrm, Cratio), rtol=0, atol=1e-12)
+
+
+def test_solution_cache():
+    """
+    The cache counts hits and misses, evicts the least recently used entries
+    to stay within max_bytes, skips entries too big to fit, and is shared by copies.
+    """
+    entry = lambda value: np.full(1000, value)
+    size = len(pickle.dumps(entry(0.0), protocol=pickle.HIGHEST_PROTOCOL))
+    cache = SolutionCache(2 * size + size // 2)
+    assert cache.get("a") is None
+    cache.put("a", entry(1.0))
+    cache.put("b", entry(2.0))
+    assert cache.get("a")[0] == 1.0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.put("c", entry(3.0))
+    assert cache.get("b") is None
+    assert cache.get("a")[0] == 1.0 and cache.get("c")[0] == 3.0
+    assert cache.total_bytes == 2 * size
+
+    cache.put("d", np.zeros(10000))
+    assert cache.get("d") is None
+    assert deepcopy(cache) is cache
+    cache.clear()
+    assert cache.get("a") is None and cache.total_bytes == 0
+
+
+def test_solve_from_cache(solved_type):
+    """
+    A copy of a solved type gets the stored solution without solving, while a
+    change to a parameter of its problem changes the key it is stored under.
+    """
+    agent = deepcopy(solved_type)
+    assert agent.solution_cache is solved_type.solution_cache
+    hits = agent.solution_cache.hits
+    agent.solve()
+    assert agent.solution_cache.hits == hits + 1
+    assert agent.solution is solved_type.solution
+    agent.DiscFac = 0.95
+    assert agent.solution_key() != solved_type.solution_key()
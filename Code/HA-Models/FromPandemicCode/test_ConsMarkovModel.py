@@ -0,0 +1,133 @@
+"""
+test_ConsMarkovModel.py – Tests of the sparse transition matrices in ConsMarkovModel.py
+
+The sparse matrices are checked against the dense matrices that HARK's
+gen_tran_matrix_1D and gen_tran_matrix_2D give, assembled block by block as
+calc_transition_matrix did before it built sparse matrices.
+"""
+
+import os
+import sys
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from HARK.ConsumptionSaving.ConsIndShockModel import init_idiosyncratic_shocks
+from HARK.distribution import DiscreteDistributionLabeled
+from HARK.utilities import gen_tran_matrix_1D, gen_tran_matrix_2D, jump_to_grid_1D, jump_to_grid_2D
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ConsMarkovModel import MarkovConsumerType
+
+
+def dense_tran_matrix(agent, aPol_Grid, shk_dstn, mrkv_array, Rfree, LivPrb, dist_pGrid):
+    """
+    The transition matrix of make_tran_matrix, built as a dense array.  HARK's
+    matrix functions are called as plain Python, as numba's parallel thread
+    pool does not survive the forked processes of other tests.
+    """
+    dist_mGrid = agent.dist_mGrid
+    n_m = mrkv_array.shape[0]
+    n_s = dist_mGrid.size * len(dist_pGrid)
+    tran_mat = np.zeros((n_m, n_s, n_m, n_s))
+    for m in range(n_m):
+        for mp in range(n_m):
+            if mrkv_array[m, mp] > 0:
+                shk_prbs = shk_dstn[mp].pmv
+                perm_shks = shk_dstn[mp].atoms[0]
+                tran_shks = shk_dstn[mp].atoms[1]
+                bNext = Rfree * aPol_Grid[m]
+                if len(dist_pGrid) == 1:
+                    NewBornDist = jump_to_grid_1D(np.ones_like(tran_shks), shk_prbs, dist_mGrid)
+                    t_mat = gen_tran_matrix_1D.py_func(
+                        dist_mGrid, bNext, shk_prbs, perm_shks, tran_shks, LivPrb, NewBornDist
+                    )
+                else:
+                    NewBornDist = jump_to_grid_2D(
+                        np.ones_like(tran_shks), np.ones_like(tran_shks), shk_prbs, dist_mGrid, dist_pGrid
+                    )
+                    t_mat = gen_tran_matrix_2D.py_func(
+                        dist_mGrid, dist_pGrid, bNext, shk_prbs, perm_shks, tran_shks, LivPrb, NewBornDist
+                    )
+                tran_mat[mp, :, m, :] = mrkv_array[m, mp] * t_mat
+    return tran_mat.reshape(n_m * n_s, n_m * n_s)
+
+
+@pytest.fixture(scope="module")
+def solved_agent():
+    """A small employed/unemployed agent, solved with an infinite horizon."""
+    params = deepcopy(init_idiosyncratic_shocks)
+    params.update(
+        {
+            "cycles": 0,
+            "MrkvArray": [np.array([[0.9, 0.1], [0.5, 0.5]])],
+            "Rfree": np.array([1.02, 1.02]),
+            "LivPrb": [np.array([0.99, 0.99])],
+            "PermGroFac": [np.array([1.0, 1.0])],
+            "global_markov": False,
+            "mCount": 30,
+            "mFac": 3,
+            "mMin": 1e-4,
+            "mMax": 50,
+        }
+    )
+    agent = MarkovConsumerType(**params)
+    IncShkDstn_unemp = DiscreteDistributionLabeled(
+        np.array([1.0]), np.array([[1.0], [0.3]]), var_names=["PermShk", "TranShk"]
+    )
+    agent.IncShkDstn = [[agent.IncShkDstn[0], IncShkDstn_unemp]]
+    agent.solve()
+    return agent
+
+
+@pytest.mark.parametrize("neutral_measure", [True, False])
+def test_calc_transition_matrix(solved_agent, neutral_measure):
+    """
+    The sparse transition matrix equals the dense one, over market resources
+    alone with the neutral measure and with permanent income otherwise.
+    """
+    agent = deepcopy(solved_agent)
+    agent.neutral_measure = neutral_measure
+    if neutral_measure:
+        agent.define_distribution_grid()
+    else:
+        agent.define_distribution_grid(num_pointsP=5)
+    agent.calc_transition_matrix()
+    dense = dense_tran_matrix(
+        agent, agent.aPol_Grid, agent.IncShkDstn[0], agent.MrkvArray[0],
+        agent.Rfree[0], agent.LivPrb[0][0], agent.dist_pGrid,
+    )
+    np.testing.assert_allclose(agent.tran_matrix.toarray(), dense, rtol=0, atol=1e-14)
+    np.testing.assert_allclose(agent.tran_matrix.sum(axis=0), 1.0, rtol=1e-12)
+
+
+def test_make_tran_matrix_with_shocks(solved_agent):
+    """
+    The matrices of a shock in period zero, which HA-Fiscal-HANK-SAM.py builds
+    from the steady state policy for the zeroth column of its Jacobians, equal
+    the dense matrices for the same shocked income, Markov array or interest rate.
+    """
+    agent = deepcopy(solved_agent)
+    agent.neutral_measure = True
+    agent.define_distribution_grid()
+    agent.calc_transition_matrix()
+
+    dx = 0.0001
+    IncShkDstn_dx = deepcopy(agent.IncShkDstn[0])
+    for dstn in IncShkDstn_dx:
+        dstn.atoms[1] = dstn.atoms[1] + dx
+    Mrkv_dx = agent.MrkvArray[0] + np.array([[-dx, dx], [0.0, 0.0]])
+    for (shk_dstn, mrkv_array, Rfree) in [
+        (IncShkDstn_dx, agent.MrkvArray[0], agent.Rfree[0]),
+        (agent.IncShkDstn[0], Mrkv_dx, agent.Rfree[0]),
+        (agent.IncShkDstn[0], agent.MrkvArray[0], agent.Rfree[0] + dx),
+    ]:
+        tranmat_0 = agent.make_tran_matrix(
+            agent.aPol_Grid, shk_dstn, mrkv_array, Rfree, agent.LivPrb[0][0], agent.dist_pGrid
+        )
+        dense = dense_tran_matrix(
+            agent, agent.aPol_Grid, shk_dstn, mrkv_array, Rfree, agent.LivPrb[0][0], agent.dist_pGrid
+        )
+        np.testing.assert_allclose(tranmat_0.toarray(), dense, rtol=0, atol=1e-14)
+        assert np.abs(tranmat_0 - agent.tran_matrix).max() > 0
@@ -0,0 +1,39 @@
+"""
+test_OtherFunctions.py – Tests of the helper functions in OtherFunctions.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from OtherFunctions import calculate_NPV
+
+
+def loop_NPV(X, Periods, R):
+    """The NPV at every horizon, computed one horizon at a time."""
+    NPV_discount = np.zeros(Periods)
+    for t in range(Periods):
+        NPV_discount[t] = 1 / (R**t)
+    NPV = np.zeros(Periods)
+    for t in range(Periods):
+        NPV[t] = np.sum(X[0 : t + 1] * NPV_discount[0 : t + 1])
+    return NPV
+
+
+def test_calculate_NPV():
+    """
+    The vectorized NPV matches the loop, for one series and for several series
+    discounted in the same pass, and ignores periods after Periods.
+    """
+    rng = np.random.default_rng(0)
+    AggIncome = 1.0 + rng.uniform(size=200)
+    AggCons = 1.0 + rng.uniform(size=200)
+    R = 1.01
+    np.testing.assert_allclose(calculate_NPV(AggIncome, 200, R), loop_NPV(AggIncome, 200, R), rtol=1e-13)
+
+    NPV_AggIncome, NPV_AggCons = calculate_NPV(np.vstack((AggIncome, AggCons)), 150, R)
+    np.testing.assert_allclose(NPV_AggIncome, loop_NPV(AggIncome, 150, R), rtol=1e-13)
+    np.testing.assert_allclose(NPV_AggCons, loop_NPV(AggCons, 150, R), rtol=1e-13)
@@ -0,0 +1,140 @@
+"""
+test_ParallelTools.py – Tests of the TaskScheduler and ResidentTypePool in ParallelTools.py
+
+Tasks report through the files they write, as the policy routines of
+Simulate.py do.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ParallelTools import ResidentTypePool, TaskScheduler, can_fork
+
+
+def write_task(path, requires=(), delay=0.0):
+    """Write path, failing if any file in requires has not been written yet."""
+    time.sleep(delay)
+    for required in requires:
+        if not os.path.exists(required):
+            raise RuntimeError(str(required) + " does not exist yet")
+    with open(path, "w") as f:
+        f.write(str(os.getpid()))
+
+
+def failing_task():
+    raise RuntimeError("this task fails")
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_dependencies(tmp_path, num_workers):
+    """
+    A task starts only after the tasks it depends on have finished, even when
+    they take longer than the tasks that do not depend on them.
+    """
+    a, b, c, d = [str(tmp_path / name) for name in "abcd"]
+    scheduler = TaskScheduler(num_workers=num_workers, mem_per_task=0, poll_interval=0.05)
+    scheduler.add_task("a", write_task, a, delay=0.5)
+    scheduler.add_task("b", write_task, b)
+    scheduler.add_task("c", write_task, c, requires=[a], deps=["a"])
+    scheduler.add_task("d", write_task, d, requires=[b, c], deps=["b", "c"])
+    scheduler.run()
+    assert all(os.path.exists(path) for path in [a, b, c, d])
+    assert scheduler.tasks == []
+
+
+@pytest.mark.skipif(not can_fork(), reason="tasks run in this process without fork")
+def test_tasks_run_in_their_own_processes(tmp_path):
+    paths = [str(tmp_path / name) for name in "ab"]
+    scheduler = TaskScheduler(num_workers=2, mem_per_task=0, poll_interval=0.05)
+    for path in paths:
+        scheduler.add_task(os.path.basename(path), write_task, path)
+    scheduler.run()
+    pids = {int(open(path).read()) for path in paths}
+    assert os.getpid() not in pids
+    assert len(pids) == 2
+
+
+@pytest.mark.skipif(not can_fork(), reason="tasks run in this process without fork")
+def test_failures(tmp_path):
+    """
+    A failed task makes run() raise after the independent tasks have finished,
+    and the tasks that depend on it, directly or not, are skipped.
+    """
+    b, c, d = [str(tmp_path / name) for name in "bcd"]
+    scheduler = TaskScheduler(num_workers=2, mem_per_task=0, poll_interval=0.05)
+    scheduler.add_task("a", failing_task)
+    scheduler.add_task("b", write_task, b, deps=["a"])
+    scheduler.add_task("c", write_task, c, deps=["b"])
+    scheduler.add_task("d", write_task, d, delay=0.2)
+    with pytest.raises(RuntimeError, match="failed or were skipped: a, b, c$"):
+        scheduler.run()
+    assert os.path.exists(d)
+    assert not os.path.exists(b) and not os.path.exists(c)
+
+
+def test_serial_failure_raises():
+    scheduler = TaskScheduler(num_workers=1)
+    scheduler.add_task("a", failing_task)
+    with pytest.raises(RuntimeError, match="this task fails"):
+        scheduler.run()
+
+
+def test_add_task_checks_names():
+    scheduler = TaskScheduler(num_workers=2)
+    scheduler.add_task("a", failing_task)
+    with pytest.raises(ValueError):
+        scheduler.add_task("a", failing_task)
+    with pytest.raises(ValueError):
+        scheduler.add_task("b", failing_task, deps=["c"])
+
+
+class CountingType:
+    """Stands in for an agent type that keeps state between calls."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.fail = False
+        self.state_now = {"calls": None}
+
+    def step(self):
+        if self.fail:
+            raise ValueError(self.name + " failed")
+        self.calls += 1
+        self.state_now["calls"] = self.calls
+        self.pid = os.getpid()
+
+
+@pytest.mark.skipif(not can_fork(), reason="ResidentTypePool needs fork")
+def test_resident_type_pool():
+    """
+    Each type stays in one worker for the life of the pool and keeps its state
+    there, results come back in the order of the types, and an error in one
+    type is raised in this process.
+    """
+    types = [CountingType(str(i)) for i in range(5)]
+    with pytest.raises(ValueError):
+        ResidentTypePool(types, ["no_such_method"], ["calls"], 2)
+    pool = ResidentTypePool(types, ["step"], ["calls", "pid", "name"], 2)
+    try:
+        first = pool.run([{} for _ in types])
+        second = pool.run([{"fail": False} for _ in types])
+        assert [result["name"] for result in second] == [ThisType.name for ThisType in types]
+        assert [result["calls"] for result in first] == [1] * 5
+        assert [result["calls"] for result in second] == [2] * 5
+        assert [result["pid"] for result in first] == [result["pid"] for result in second]
+        assert len({result["pid"] for result in first}) == 2
+        assert os.getpid() not in {result["pid"] for result in first}
+        assert all(ThisType.calls == 0 for ThisType in types)
+
+        with pytest.raises(RuntimeError, match="3 failed"):
+            pool.run([{"fail": i == 3} for i in range(5)])
+        with pytest.raises(ValueError):
+            pool.run([{}])
+    finally:
+        pool.close()
@@ -0,0 +1,23 @@
+#!/bin/bash
+# Build the precomputed multiplier grid (dashboard/multiplier_grid/), which the
+# dashboard uses to answer slider changes by lookup instead of a live solve.
+#
+# The grid is a build artifact: it is not kept in git, and a deployment that
+# should answer from it must ship the directory next to app.ipynb. The run takes
+# several hours on one core, uses every core by default (set
+# HAFISCAL_NUM_WORKERS to limit it) and resumes where it stopped if interrupted.
+
+set -e
+cd "$(dirname "$0")"
+
+JACOBIANS=../Code/HA-Models/FromPandemicCode/HA_Fiscal_Jacs.obj
+if [ ! -e "$JACOBIANS" ]; then
+    echo "❌ $JACOBIANS not found."
+    echo "   Run 'python HA-Fiscal-HANK-SAM.py' in Code/HA-Models/FromPandemicCode first."
+    exit 1
+fi
+
+export HAFISCAL_NUM_WORKERS="${HAFISCAL_NUM_WORKERS:-0}"  # 0 = every core
+echo "🧮 Building the multiplier grid in dashboard/multiplier_grid/ ..."
+python hank_sam.py --precompute
+echo "✅ Multiplier grid complete."
@@ -40,9 +40,9 @@ a Search and Matching (SAM) labor market framework. The model features:
 The main workflow:
 1. Calibrate labor market parameters and steady-state distributions
 2. Calibrate general equilibrium values (production, government, bonds)
-3. Load pre-computed household Jacobians from pickle files
+3. Load pre-computed household Jacobians from pickle files (on first use)
 4. Define sequence-jacobian model blocks for GE interactions
-5. Create different model variants for policy experiments
+5. Create different model variants for policy experiments (built on demand)
 6. Run policy experiments and compute fiscal multipliers
 7. Generate plots comparing policies under different monetary regimes
 
@@ -56,19 +56,20 @@ Key Results:
 import numpy as np
 from copy import deepcopy
 import scipy.sparse as sp
-import matplotlib.pyplot as plt
 import pickle
+import json
+import os
+import sys
+import multiprocessing
+import threading
+import itertools
+from collections import OrderedDict
 from pathlib import Path
 
-# Import updated plotting functions
-from plotting_functions import (
-    plot_multipliers_three_experiments,
-    plot_consumption_irfs_three_experiments
-)
+import multipliers as mult
 
-import sequence_jacobian as sj
-from sequence_jacobian.classes import JacobianDict, SteadyStateDict
-from sequence_jacobian import create_model
+# sequence_jacobian and matplotlib are imported where they are first needed
+# (SECTION 5 and the plotting functions), which keeps importing this module fast
 
 # ═════════════════════════════════════════════════════════════════════════════
 # SECTION 1: GLOBAL PARAMETERS AND CALIBRATION
@@ -349,11 +350,28 @@ def calibrate_general_equilibrium(N_ss, ss_dstn):
 # ═════════════════════════════════════════════════════════════════════════════
 # These blocks define the general equilibrium relationships in the model.
 # Each block represents an equation or system that determines endogenous variables.
-# The @sj decorators specify whether blocks are simple algebraic (@sj.simple) or
-# require numerical solving (@sj.solved).
+# The decorators mark whether blocks are simple algebraic (@simple_block) or
+# require numerical solving (@solved_block); the functions are turned into
+# sequence-jacobian blocks when a model is first built (see build_block).
+
+
+def simple_block(block_function):
+    """Mark a function as a simple sequence-jacobian block."""
+    block_function.solved_block_options = None
+    return block_function
+
 
+def solved_block(**options):
+    """Mark a function as a solved sequence-jacobian block (options as for sj.solved)."""
 
-@sj.simple
+    def mark(block_function):
+        block_function.solved_block_options = options
+        return block_function
+
+    return mark
+
+
+@simple_block
 def unemployment1(U1, U2, U3, U4, U5):
     """
     Aggregate unemployment rate calculation.
@@ -370,7 +388,7 @@ def unemployment1(U1, U2, U3, U4, U5):
     return U
 
 
-@sj.simple
+@simple_block
 def marginal_cost(HC, Z):
     """
     Firm's marginal cost of production.
@@ -389,7 +407,7 @@ def marginal_cost(HC, Z):
     return MC
 
 
-@sj.solved(unknowns={"HC": (-10, 10.0)}, targets=["HC_resid"], solver="brentq")
+@solved_block(unknowns={"HC": (-10, 10.0)}, targets=["HC_resid"], solver="brentq")
 def hiring_cost(HC, Z, phi, job_sep, r_ante, w):
     """
     Hiring cost determination from firm's first-order condition.
@@ -415,7 +433,7 @@ def hiring_cost(HC, Z, phi, job_sep, r_ante, w):
     return HC_resid
 
 
-@sj.solved(unknowns={"w": (-10, 10.0)}, targets=["wage_resid"], solver="brentq")
+@solved_block(unknowns={"w": (-10, 10.0)}, targets=["wage_resid"], solver="brentq")
 def wage_(w, N, phi_w):
     """
     Wage determination with real wage rigidity.
@@ -438,7 +456,7 @@ def wage_(w, N, phi_w):
     return wage_resid
 
 
-@sj.solved(unknowns={"pi": (-0.1, 0.1)}, targets=["nkpc_resid"], solver="brentq")
+@solved_block(unknowns={"pi": (-0.1, 0.1)}, targets=["nkpc_resid"], solver="brentq")
 def Phillips_Curve(pi, MC, Y, r_ante, kappa_p):
     """
     New Keynesian Phillips Curve with Rotemberg pricing.
@@ -464,7 +482,7 @@ def Phillips_Curve(pi, MC, Y, r_ante, kappa_p):
     return nkpc_resid
 
 
-@sj.solved(unknowns={"i": (-0.5, 0.4)}, targets=["taylor_resid"], solver="brentq")
+@solved_block(unknowns={"i": (-0.5, 0.4)}, targets=["taylor_resid"], solver="brentq")
 def taylor(i, pi, Y, ev, rho_r, phi_y, phi_pi):
     """
     Standard Taylor rule for monetary policy.
@@ -489,7 +507,7 @@ def taylor(i, pi, Y, ev, rho_r, phi_y, phi_pi):
     return taylor_resid
 
 
-@sj.solved(unknowns={"i": (-0.5, 0.4)}, targets=["taylor_resid"], solver="brentq")
+@solved_block(unknowns={"i": (-0.5, 0.4)}, targets=["taylor_resid"], solver="brentq")
 def taylor_lagged(i, pi, Y, ev, rho_r, phi_y, phi_pi, lag):
     """
     Taylor rule with lagged responses.
@@ -516,7 +534,7 @@ def taylor_lagged(i, pi, Y, ev, rho_r, phi_y, phi_pi, lag):
     return taylor_resid
 
 
-@sj.simple
+@simple_block
 def matching(theta, chi):
     """
     Cobb-Douglas matching function.
@@ -537,7 +555,7 @@ def matching(theta, chi):
     return eta, phi
 
 
-@sj.solved(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
+@solved_block(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
 def fiscal(
     B,
     N,
@@ -610,7 +628,7 @@ def fiscal(
     return fiscal_resid, UI_extension_cost, debt, UI_rr_cost
 
 
-@sj.simple
+@simple_block
 def fiscal_rule(B, phi_b, deficit_T):
     """
     Tax rate determination under fiscal rule.
@@ -631,7 +649,7 @@ def fiscal_rule(B, phi_b, deficit_T):
     return tau
 
 
-@sj.solved(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
+@solved_block(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
 def fiscal_G(B, N, qb, w, v, pi, UI, U1, U2, transfers, phi_G, tau, deficit_T):
     """
     Government budget with endogenous G (for tax shock experiments).
@@ -671,7 +689,7 @@ def fiscal_G(B, N, qb, w, v, pi, UI, U1, U2, transfers, phi_G, tau, deficit_T):
     return fiscal_resid, tax_cost
 
 
-@sj.simple
+@simple_block
 def fiscal_rule_G(B, phi_G, deficit_T):
     """
     Government consumption under fiscal rule.
@@ -690,7 +708,7 @@ def fiscal_rule_G(B, phi_G, deficit_T):
     return G
 
 
-@sj.simple
+@simple_block
 def production(Z, N):
     """
     Aggregate production function.
@@ -708,7 +726,7 @@ def production(Z, N):
     return Y
 
 
-@sj.simple
+@simple_block
 def ex_post_longbonds_rate(qb):
     """
     Ex-post return on long-term bonds.
@@ -728,7 +746,7 @@ def ex_post_longbonds_rate(qb):
     return r
 
 
-@sj.solved(unknowns={"qb": (0.1, 30.0)}, targets=["lbp_resid"], solver="brentq")
+@solved_block(unknowns={"qb": (0.1, 30.0)}, targets=["lbp_resid"], solver="brentq")
 def longbonds_price(qb, r_ante):
     """
     No-arbitrage pricing of long-term government bonds.
@@ -748,7 +766,7 @@ def longbonds_price(qb, r_ante):
     return lbp_resid
 
 
-@sj.simple
+@simple_block
 def vacancies(N, phi, job_sep):
     """
     Vacancy determination from employment dynamics.
@@ -769,7 +787,7 @@ def vacancies(N, phi, job_sep):
     return v
 
 
-@sj.simple
+@simple_block
 def mkt_clearing(C, G, A, qb, B, w, N, U1, U2, U3, U4, U5):
     """
     Market clearing conditions.
@@ -802,7 +820,7 @@ def mkt_clearing(C, G, A, qb, B, w, N, U1, U2, U3, U4, U5):
     return goods_mkt, asset_mkt, Y_priv
 
 
-@sj.simple
+@simple_block
 def fisher_clearing(r_ante, pi, i):
     """
     Fisher equation linking nominal and real interest rates.
@@ -822,7 +840,7 @@ def fisher_clearing(r_ante, pi, i):
     return fisher_resid
 
 
-@sj.simple
+@simple_block
 def fisher_clearing_fixed_real_rate(pi):
     """
     Fisher equation with fixed real rate.
@@ -840,7 +858,7 @@ def fisher_clearing_fixed_real_rate(pi):
     return i
 
 
-@sj.solved(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
+@solved_block(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
 def fiscal_fixed_real_rate(
     B, N, G, w, v, pi, phi_b, UI, U1, U2, U3, U4, transfers, UI_extend, deficit_T, UI_rr
 ):
@@ -870,7 +888,7 @@ def fiscal_fixed_real_rate(
     return fiscal_resid, UI_extension_cost, UI_rr_cost
 
 
-@sj.solved(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
+@solved_block(unknowns={"B": (0.0, 10)}, targets=["fiscal_resid"], solver="brentq")
 def fiscal_G_fixed_real_rate(
     B, N, w, v, pi, UI, U1, U2, transfers, phi_G, tau, deficit_T
 ):
@@ -920,65 +938,63 @@ Z_ss = ge_params["Z_ss"]
 Y_ss = ge_params["Y_ss"]
 pi_ss = ge_params["pi_ss"]
 
-# Define steady state dictionary
-SteadyState_Dict = SteadyStateDict(
-    {
-        "asset_mkt": 0.0,
-        "goods_mkt": 0.0,
-        "arg_fisher_resid": 0.0,
-        "lbp_resid": 0.0,
-        "fiscal_resid": 0.0,
-        "labor_evo_resid": 0.0,
-        "taylor_resid": 0.0,
-        "nkpc_resid": 0.0,
-        "epsilon_p": epsilon_p,
-        "U": (1 - N_ss),
-        "U1": ss_dstn[1],
-        "U2": ss_dstn[2],
-        "U3": ss_dstn[3],
-        "U4": ss_dstn[4],
-        "U5": ss_dstn[5],
-        "HC": MC_ss * Z_ss,
-        "MC": MC_ss,
-        "C": C_ss_sim,
-        "r": r_ss,
-        "r_ante": r_ss,
-        "Y": Y_ss,
-        "B": B_ss,
-        "G": G_ss,
-        "A": A_ss_sim,
-        "tau": tau_ss,
-        "eta": eta_ss,
-        "phi_b": phi_b,
-        "phi_w": phi_w,
-        "N": N_ss,
-        "phi": phi_ss,
-        "v": v_ss,
-        "ev": 0.0,
-        "Z": Z_ss,
-        "job_sep": job_sep,
-        "w": wage_ss,
-        "pi": pi_ss,
-        "i": r_ss,
-        "qb": qb_ss,
-        "varphi": varphi,
-        "rho_r": rho_r,
-        "kappa_p": kappa_p_ss,
-        "phi_pi": phi_pi,
-        "phi_y": phi_y,
-        "chi": chi_ss,
-        "theta": theta_ss,
-        "UI": UI,
-        "transfers": 0.0,
-        "UI_extend": 0.0,
-        "deficit_T": -1,
-        "UI_extension_cost": 0.0,
-        "UI_rr": 0.0,
-        "debt": qb_ss * B_ss,
-        "tax_cost": tau_ss * wage_ss * N_ss,
-        "lag": -1,
-    }
-)
+# Steady state values (wrapped in a SteadyStateDict by the model registry)
+STEADY_STATE_VALUES = {
+    "asset_mkt": 0.0,
+    "goods_mkt": 0.0,
+    "arg_fisher_resid": 0.0,
+    "lbp_resid": 0.0,
+    "fiscal_resid": 0.0,
+    "labor_evo_resid": 0.0,
+    "taylor_resid": 0.0,
+    "nkpc_resid": 0.0,
+    "epsilon_p": epsilon_p,
+    "U": (1 - N_ss),
+    "U1": ss_dstn[1],
+    "U2": ss_dstn[2],
+    "U3": ss_dstn[3],
+    "U4": ss_dstn[4],
+    "U5": ss_dstn[5],
+    "HC": MC_ss * Z_ss,
+    "MC": MC_ss,
+    "C": C_ss_sim,
+    "r": r_ss,
+    "r_ante": r_ss,
+    "Y": Y_ss,
+    "B": B_ss,
+    "G": G_ss,
+    "A": A_ss_sim,
+    "tau": tau_ss,
+    "eta": eta_ss,
+    "phi_b": phi_b,
+    "phi_w": phi_w,
+    "N": N_ss,
+    "phi": phi_ss,
+    "v": v_ss,
+    "ev": 0.0,
+    "Z": Z_ss,
+    "job_sep": job_sep,
+    "w": wage_ss,
+    "pi": pi_ss,
+    "i": r_ss,
+    "qb": qb_ss,
+    "varphi": varphi,
+    "rho_r": rho_r,
+    "kappa_p": kappa_p_ss,
+    "phi_pi": phi_pi,
+    "phi_y": phi_y,
+    "chi": chi_ss,
+    "theta": theta_ss,
+    "UI": UI,
+    "transfers": 0.0,
+    "UI_extend": 0.0,
+    "deficit_T": -1,
+    "UI_extension_cost": 0.0,
+    "UI_rr": 0.0,
+    "debt": qb_ss * B_ss,
+    "tax_cost": tau_ss * wage_ss * N_ss,
+    "lag": -1,
+}
 
 
 def load_jacobians():
@@ -991,6 +1007,8 @@ def load_jacobians():
     Returns:
         tuple: (Jacobian_Dict, Jacobian_Dict_by_educ, Jacobian_Dict_UI_extend_real)
     """
+    from sequence_jacobian.classes import JacobianDict
+
     # Define base path relative to root directory (one above dashboard)
     base_path = Path(__file__).parent.parent / "Code/HA-Models/FromPandemicCode"
 
@@ -1093,34 +1111,86 @@ def apply_splurge_behavior(Jacobian_Dict):
 
 
 # ═════════════════════════════════════════════════════════════════════════════
-# SECTION 5: MODEL CREATION
+# SECTION 5: MODEL REGISTRY
 # ═════════════════════════════════════════════════════════════════════════════
+# The household Jacobians, the steady state dictionary and the GE model variants
+# are built the first time they are needed and then kept in model_registry, so
+# importing this module does not load the Jacobians or import sequence_jacobian.
+# They remain available as module attributes (hank_sam.HANK_SAM etc.) through
+# the module __getattr__ below, which builds them on first access.
+
 
-# Load and prepare Jacobians
-Jacobian_Dict, Jacobian_Dict_by_educ, Jacobian_Dict_UI_extend_real = load_jacobians()
-Jacobian_Dict = apply_splurge_behavior(Jacobian_Dict)
-Jacobian_Dict_UI_extend_real = apply_splurge_behavior(Jacobian_Dict_UI_extend_real)
-
-# Compute unemployment Jacobians
-UJAC = compute_unemployment_jacobian(markov_array_ss, ss_dstn, num_mrkv)
-
-# (Un)employment rate Jacobians
-UJAC_dict = JacobianDict(
-    {
-        "N": {"eta": UJAC[0]},
-        "U1": {"eta": UJAC[1]},
-        "U2": {"eta": UJAC[2]},
-        "U3": {"eta": UJAC[3]},
-        "U4": {"eta": UJAC[4]},
-        "U5": {"eta": UJAC[5]},
+def build_block(block_function):
+    """
+    Turn a function marked with @simple_block or @solved_block into a sequence-jacobian block.
+
+    Args:
+        block_function: Block function from SECTION 3
+
+    Returns:
+        Block: SimpleBlock or SolvedBlock
+    """
+    import sequence_jacobian as sj
+
+    if block_function.solved_block_options is None:
+        return sj.simple(block_function)
+    return sj.solved(**block_function.solved_block_options)(block_function)
+
+
+def build_household_jacobians():
+    """Load the household Jacobians and apply splurge behavior."""
+    Jacobian_Dict, Jacobian_Dict_by_educ, Jacobian_Dict_UI_extend_real = load_jacobians()
+    return {
+        "Jacobian_Dict": apply_splurge_behavior(Jacobian_Dict),
+        "Jacobian_Dict_by_educ": Jacobian_Dict_by_educ,
+        "Jacobian_Dict_UI_extend_real": apply_splurge_behavior(
+            Jacobian_Dict_UI_extend_real
+        ),
     }
-)
 
-# Create models
-HANK_SAM = create_model(
-    [
-        Jacobian_Dict,
-        Jacobian_Dict_by_educ,
+
+def build_unemployment_jacobians():
+    """Compute the (un)employment rate Jacobians with respect to eta."""
+    from sequence_jacobian.classes import JacobianDict
+
+    UJAC = compute_unemployment_jacobian(markov_array_ss, ss_dstn, num_mrkv)
+    UJAC_dict = JacobianDict(
+        {
+            "N": {"eta": UJAC[0]},
+            "U1": {"eta": UJAC[1]},
+            "U2": {"eta": UJAC[2]},
+            "U3": {"eta": UJAC[3]},
+            "U4": {"eta": UJAC[4]},
+            "U5": {"eta": UJAC[5]},
+        }
+    )
+    return {"UJAC": UJAC, "UJAC_dict": UJAC_dict}
+
+
+def build_steady_state():
+    """Wrap STEADY_STATE_VALUES in a SteadyStateDict."""
+    from sequence_jacobian.classes import SteadyStateDict
+
+    return {"SteadyState_Dict": SteadyStateDict(STEADY_STATE_VALUES)}
+
+
+# Builders of the registry entries other than the models; each builder returns
+# every entry it produces, so entries that come from one file are loaded once
+REGISTRY_BUILDERS = {
+    "Jacobian_Dict": build_household_jacobians,
+    "Jacobian_Dict_by_educ": build_household_jacobians,
+    "Jacobian_Dict_UI_extend_real": build_household_jacobians,
+    "UJAC": build_unemployment_jacobians,
+    "UJAC_dict": build_unemployment_jacobians,
+    "SteadyState_Dict": build_steady_state,
+}
+
+# Blocks of each GE model variant: names of registry entries (Jacobians) or
+# block functions from SECTION 3
+GE_MODEL_BLOCKS = {
+    "HANK_SAM": [
+        "Jacobian_Dict",
+        "Jacobian_Dict_by_educ",
         fiscal,
         longbonds_price,
         ex_post_longbonds_rate,
@@ -1130,7 +1200,7 @@ HANK_SAM = create_model(
         taylor,
         Phillips_Curve,
         marginal_cost,
-        UJAC_dict,
+        "UJAC_dict",
         hiring_cost,
         wage_,
         vacancies,
@@ -1138,13 +1208,9 @@ HANK_SAM = create_model(
         fisher_clearing,
         mkt_clearing,
     ],
-    name="HARK_HANK",
-)
-
-HANK_SAM_tax_rate_shock = create_model(
-    [
-        Jacobian_Dict,
-        Jacobian_Dict_by_educ,
+    "HANK_SAM_tax_rate_shock": [
+        "Jacobian_Dict",
+        "Jacobian_Dict_by_educ",
         fiscal_G,
         longbonds_price,
         ex_post_longbonds_rate,
@@ -1154,7 +1220,7 @@ HANK_SAM_tax_rate_shock = create_model(
         taylor,
         Phillips_Curve,
         marginal_cost,
-        UJAC_dict,
+        "UJAC_dict",
         hiring_cost,
         wage_,
         vacancies,
@@ -1162,13 +1228,9 @@ HANK_SAM_tax_rate_shock = create_model(
         fisher_clearing,
         mkt_clearing,
     ],
-    name="HARK_HANK",
-)
-
-HANK_SAM_lagged_taylor_rule = create_model(
-    [
-        Jacobian_Dict,
-        Jacobian_Dict_by_educ,
+    "HANK_SAM_lagged_taylor_rule": [
+        "Jacobian_Dict",
+        "Jacobian_Dict_by_educ",
         fiscal,
         longbonds_price,
         ex_post_longbonds_rate,
@@ -1178,7 +1240,7 @@ HANK_SAM_lagged_taylor_rule = create_model(
         taylor_lagged,
         Phillips_Curve,
         marginal_cost,
-        UJAC_dict,
+        "UJAC_dict",
         hiring_cost,
         wage_,
         vacancies,
@@ -1186,20 +1248,16 @@ HANK_SAM_lagged_taylor_rule = create_model(
         fisher_clearing,
         mkt_clearing,
     ],
-    name="HARK_HANK",
-)
-
-HANK_SAM_fixed_real_rate = create_model(
-    [
-        Jacobian_Dict,
-        Jacobian_Dict_by_educ,
+    "HANK_SAM_fixed_real_rate": [
+        "Jacobian_Dict",
+        "Jacobian_Dict_by_educ",
         fiscal_fixed_real_rate,
         fiscal_rule,
         production,
         matching,
         Phillips_Curve,
         marginal_cost,
-        UJAC_dict,
+        "UJAC_dict",
         hiring_cost,
         wage_,
         vacancies,
@@ -1207,20 +1265,16 @@ HANK_SAM_fixed_real_rate = create_model(
         fisher_clearing_fixed_real_rate,
         mkt_clearing,
     ],
-    name="HARK_HANK",
-)
-
-HANK_SAM_fixed_real_rate_UI_extend_real = create_model(
-    [
-        Jacobian_Dict_UI_extend_real,
-        Jacobian_Dict_by_educ,
+    "HANK_SAM_fixed_real_rate_UI_extend_real": [
+        "Jacobian_Dict_UI_extend_real",
+        "Jacobian_Dict_by_educ",
         fiscal_fixed_real_rate,
         fiscal_rule,
         production,
         matching,
         Phillips_Curve,
         marginal_cost,
-        UJAC_dict,
+        "UJAC_dict",
         hiring_cost,
         wage_,
         vacancies,
@@ -1228,20 +1282,16 @@ HANK_SAM_fixed_real_rate_UI_extend_real = create_model(
         fisher_clearing_fixed_real_rate,
         mkt_clearing,
     ],
-    name="HARK_HANK",
-)
-
-HANK_SAM_tax_cut_fixed_real_rate = create_model(
-    [
-        Jacobian_Dict,
-        Jacobian_Dict_by_educ,
+    "HANK_SAM_tax_cut_fixed_real_rate": [
+        "Jacobian_Dict",
+        "Jacobian_Dict_by_educ",
         fiscal_G_fixed_real_rate,
         fiscal_rule_G,
         production,
         matching,
         Phillips_Curve,
         marginal_cost,
-        UJAC_dict,
+        "UJAC_dict",
         hiring_cost,
         wage_,
         vacancies,
@@ -1249,8 +1299,204 @@ HANK_SAM_tax_cut_fixed_real_rate = create_model(
         fisher_clearing_fixed_real_rate,
         mkt_clearing,
     ],
-    name="HARK_HANK",
-)
+}
+
+# Built registry entries by name. The lock is reentrant because building a
+# model fetches its Jacobians from the registry, and it lets the dashboard's
+# experiment threads share one copy of everything.
+model_registry = {}
+model_registry_lock = threading.RLock()
+
+
+def get_model_object(name):
+    """
+    Get a Jacobian dictionary, the steady state dictionary or a GE model variant,
+    building it on first use.
+
+    Args:
+        name: Key of REGISTRY_BUILDERS or GE_MODEL_BLOCKS
+
+    Returns:
+        The registry entry (JacobianDict, SteadyStateDict, model, ...)
+    """
+    with model_registry_lock:
+        if name not in model_registry:
+            if name in GE_MODEL_BLOCKS:
+                model_registry[name] = build_ge_model(name)
+            else:
+                model_registry.update(REGISTRY_BUILDERS[name]())
+        return model_registry[name]
+
+
+def build_ge_model(model_name):
+    """
+    Create a GE model variant from its entry in GE_MODEL_BLOCKS.
+
+    Args:
+        model_name: Name of the model variant in GE_MODEL_BLOCKS
+
+    Returns:
+        Model: sequence-jacobian model
+    """
+    from sequence_jacobian import create_model
+
+    blocks = [
+        get_model_object(block) if isinstance(block, str) else build_block(block)
+        for block in GE_MODEL_BLOCKS[model_name]
+    ]
+    return create_model(blocks, name="HARK_HANK")
+
+
+def get_ge_model(model_name):
+    """Get a GE model variant by name, building it on first use."""
+    return get_model_object(model_name)
+
+
+def build_ge_models():
+    """Build every GE model variant now (e.g. before forking workers or in the background)."""
+    for model_name in GE_MODEL_BLOCKS:
+        get_ge_model(model_name)
+
+
+def __getattr__(name):
+    """Build the registry entries on first access as module attributes (PEP 562)."""
+    if name in REGISTRY_BUILDERS or name in GE_MODEL_BLOCKS:
+        return get_model_object(name)
+    if name == "GE_MODELS":
+        return {model_name: get_ge_model(model_name) for model_name in GE_MODEL_BLOCKS}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Least recently used cache of solved GE systems, keyed by model variant, steady
+# state parameters, unknowns, targets and shocked inputs. Each entry holds one
+# T x T matrix per model output and shocked input (about 30 MB at T = 300), so
+# the cache is bounded by the total size of its matrices rather than by a count.
+# The budget holds the 11 systems of one full set of experiments (about 290 MB),
+# since a smaller one would evict each system before the next run reuses it.
+# The lock lets experiments run in several threads at once (as in the dashboard).
+GE_SOLVER_CACHE_BYTES = 384 * 2**20
+ge_solver_cache = OrderedDict()  # key -> (H_U_factored, G, size in bytes)
+ge_solver_cache_bytes = 0  # Total size of the cached G matrices
+ge_solver_cache_lock = threading.Lock()
+
+
+def clear_ge_solver_cache():
+    """Empty the cache of solved GE systems."""
+    global ge_solver_cache_bytes
+    with ge_solver_cache_lock:
+        ge_solver_cache.clear()
+        ge_solver_cache_bytes = 0
+
+
+def freeze_params(params):
+    """
+    Turn a dictionary of parameters into a hashable tuple, for use as a cache key.
+
+    Args:
+        params: Dictionary of parameter values (scalars or numpy arrays)
+
+    Returns:
+        tuple: Sorted (name, value) pairs, with arrays replaced by their bytes
+    """
+    frozen = []
+    for key in sorted(params):
+        value = params[key]
+        if isinstance(value, np.ndarray):
+            value = (value.dtype.str, value.shape, value.tobytes())
+        frozen.append((key, value))
+    return tuple(frozen)
+
+
+def solve_ge_system(model_name, ss, unknowns, targets, inputs, T=bigT):
+    """
+    Factorize and solve the linearized GE system of a model variant, or get it from the cache.
+
+    The first call for a given model, steady state, unknowns, targets and inputs
+    factorizes H_U (the Jacobian of the targets with respect to the unknowns) and
+    computes the GE Jacobian G of every model output with respect to the inputs.
+    Later calls with the same arguments return the cached result.
+
+    Args:
+        model_name: Name of the model variant in GE_MODEL_BLOCKS
+        ss: Steady state dictionary (SteadyStateDict)
+        unknowns: List of unknowns
+        targets: List of targets
+        inputs: List of shocked inputs
+        T: Time horizon (default bigT)
+
+    Returns:
+        tuple: (H_U_factored, G) – FactoredJacobianDict and JacobianDict
+    """
+    key = (
+        model_name,
+        freeze_params(ss.toplevel),
+        tuple(unknowns),
+        tuple(targets),
+        tuple(inputs),
+        T,
+    )
+    global ge_solver_cache_bytes
+    with ge_solver_cache_lock:
+        if key in ge_solver_cache:
+            ge_solver_cache.move_to_end(key)
+            return ge_solver_cache[key][:2]
+
+    from sequence_jacobian.classes import JacobianDict, FactoredJacobianDict
+    from sequence_jacobian.classes.sparse_jacobians import make_matrix
+
+    # Partial equilibrium Jacobians of all outputs with respect to unknowns and inputs
+    model = get_ge_model(model_name)
+    J = model.jacobian(ss, list(unknowns) + list(inputs), T=T)
+
+    # U_Z = -H_U^{-1} H_Z: response of the unknowns to each input
+    H_U_factored = FactoredJacobianDict(J[targets, unknowns], T)
+    U_Z = H_U_factored @ J[targets, inputs]
+
+    # G = J_Z + J_U U_Z, with the unknowns themselves as outputs too
+    U_Z_and_inputs = U_Z | JacobianDict.identity(inputs)
+    G = U_Z | J.compose(U_Z_and_inputs)
+    G = JacobianDict(
+        {o: {i: make_matrix(G[o, i], T) for i in G[o]} for o in G.outputs},
+        G.outputs,
+        G.inputs,
+        T=T,
+    )
+
+    # Keep the newest entry even if it alone exceeds the budget
+    size = sum(G[o, i].nbytes for o in G.outputs for i in G[o])
+    with ge_solver_cache_lock:
+        if key not in ge_solver_cache:
+            ge_solver_cache[key] = (H_U_factored, G, size)
+            ge_solver_cache_bytes += size
+        while ge_solver_cache_bytes > GE_SOLVER_CACHE_BYTES and len(ge_solver_cache) > 1:
+            ge_solver_cache_bytes -= ge_solver_cache.popitem(last=False)[1][2]
+    return H_U_factored, G
+
+
+def solve_impulse_linear_cached(model_name, ss, unknowns, targets, shocks):
+    """
+    Linear GE impulse responses, as model.solve_impulse_linear, using the solver cache.
+
+    Once the GE system for these arguments has been solved, a new shock costs
+    one product of the cached G matrix with the shock path.
+
+    Args:
+        model_name: Name of the model variant in GE_MODEL_BLOCKS
+        ss: Steady state dictionary (SteadyStateDict)
+        unknowns: List of unknowns
+        targets: List of targets
+        shocks: Dictionary of shock paths, each of length T
+
+    Returns:
+        ImpulseDict: Impulse responses of the shocked inputs, unknowns and all model outputs
+    """
+    from sequence_jacobian.classes import ImpulseDict
+
+    shocks = ImpulseDict(shocks)
+    H_U_factored, G = solve_ge_system(
+        model_name, ss, unknowns, targets, list(shocks.keys()), shocks.T
+    )
+    return G.apply(shocks)
 
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -1272,14 +1518,21 @@ def NPV(irf, length, discount_rate=None):
     """
     if discount_rate is None:
         discount_rate = R
+    return mult.NPV(irf, length, discount_rate)
 
-    NPV_val = 0
-    for i in range(length):
-        NPV_val += irf[i] / discount_rate**i
-    return NPV_val
+
+def report_progress(status_callback, message):
+    """
+    Pass a progress message to status_callback, if one was given.
+
+    The callback runs between the GE solves of an experiment, so it can also stop
+    a computation that is no longer needed by raising an exception.
+    """
+    if status_callback is not None:
+        status_callback(message)
 
 
-def run_ui_extension_experiments(param_overrides=None):
+def run_ui_extension_experiments(param_overrides=None, status_callback=None):
     """
     Run UI extension experiments under different monetary policies.
 
@@ -1294,6 +1547,7 @@ def run_ui_extension_experiments(param_overrides=None):
 
     Args:
         param_overrides: Dictionary of parameter overrides to apply
+        status_callback: Optional function called with a progress message after each GE solve
 
     Returns:
         tuple: Contains IRFs and steady state dictionaries for all three scenarios:
@@ -1303,6 +1557,7 @@ def run_ui_extension_experiments(param_overrides=None):
     """
     if param_overrides is None:
         param_overrides = {}
+    report_progress(status_callback, "UI extension: started (0 of 4)")
 
     # Create shock
     ui_length = param_overrides.get("UI_extension_length", UI_extension_length)
@@ -1311,7 +1566,7 @@ def run_ui_extension_experiments(param_overrides=None):
     shocks_UI_extension = {"UI_extend": dUI_extension}
 
     # Set up steady state dictionary
-    SteadyState_Dict_UI_extend = deepcopy(SteadyState_Dict)
+    SteadyState_Dict_UI_extend = deepcopy(get_model_object("SteadyState_Dict"))
     SteadyState_Dict_UI_extend["phi_b"] = param_overrides.get("phi_b", phi_b)
     SteadyState_Dict_UI_extend["phi_w"] = param_overrides.get(
         "real_wage_rigidity", real_wage_rigidity
@@ -1326,41 +1581,49 @@ def run_ui_extension_experiments(param_overrides=None):
     unknowns = ["theta", "r_ante"]
     targets = ["asset_mkt", "fisher_resid"]
 
-    irfs_UI_extend = HANK_SAM.solve_impulse_linear(
+    irfs_UI_extend = solve_impulse_linear_cached(
+        "HANK_SAM",
         SteadyState_Dict_UI_extend, unknowns, targets, shocks_UI_extension
     )
+    report_progress(status_callback, "UI extension: standard Taylor rule solved (1 of 4)")
 
     # Fixed nominal rate
     SteadyState_Dict_UI_extend_fixed_nominal_rate = deepcopy(SteadyState_Dict_UI_extend)
     SteadyState_Dict_UI_extend_fixed_nominal_rate["phi_pi"] = 0.0
 
-    irfs_UI_extend_fixed_nominal_rate = HANK_SAM.solve_impulse_linear(
+    irfs_UI_extend_fixed_nominal_rate = solve_impulse_linear_cached(
+        "HANK_SAM",
         SteadyState_Dict_UI_extend_fixed_nominal_rate,
         unknowns,
         targets,
         shocks_UI_extension,
     )
+    report_progress(status_callback, "UI extension: fixed nominal rate solved (2 of 4)")
 
     # Fixed real rate
     unknowns_fixed_real_rate = ["theta"]
     targets_fixed_real_rate = ["asset_mkt"]
 
-    irfs_UI_extension_fixed_real_rate = HANK_SAM_fixed_real_rate.solve_impulse_linear(
+    irfs_UI_extension_fixed_real_rate = solve_impulse_linear_cached(
+        "HANK_SAM_fixed_real_rate",
         SteadyState_Dict_UI_extend,
         unknowns_fixed_real_rate,
         targets_fixed_real_rate,
         shocks_UI_extension,
     )
+    report_progress(status_callback, "UI extension: fixed real rate solved (3 of 4)")
 
     # UI extend realizations
     irf_UI_extend_realizations = (
-        HANK_SAM_fixed_real_rate_UI_extend_real.solve_impulse_linear(
+        solve_impulse_linear_cached(
+            "HANK_SAM_fixed_real_rate_UI_extend_real",
             SteadyState_Dict_UI_extend,
             unknowns_fixed_real_rate,
             targets_fixed_real_rate,
             shocks_UI_extension,
         )
     )
+    report_progress(status_callback, "UI extension: realized extensions solved (4 of 4)")
 
     return (
         irfs_UI_extend,
@@ -1372,7 +1635,7 @@ def run_ui_extension_experiments(param_overrides=None):
     )
 
 
-def run_transfer_experiments(param_overrides=None):
+def run_transfer_experiments(param_overrides=None, status_callback=None):
     """
     Run transfer (stimulus check) experiments under different monetary policies.
 
@@ -1388,6 +1651,7 @@ def run_transfer_experiments(param_overrides=None):
 
     Args:
         param_overrides: Dictionary of parameter overrides to apply
+        status_callback: Optional function called with a progress message after each GE solve
 
     Returns:
         tuple: Contains IRFs and configuration for all monetary policy scenarios:
@@ -1397,6 +1661,7 @@ def run_transfer_experiments(param_overrides=None):
     """
     if param_overrides is None:
         param_overrides = {}
+    report_progress(status_callback, "Stimulus check: started (0 of 4)")
 
     # Create shock
     dtransfers = np.zeros(bigT)
@@ -1404,7 +1669,7 @@ def run_transfer_experiments(param_overrides=None):
     shocks_transfers = {"transfers": dtransfers}
 
     # Set up steady state dictionary
-    SteadyState_Dict_transfer = deepcopy(SteadyState_Dict)
+    SteadyState_Dict_transfer = deepcopy(get_model_object("SteadyState_Dict"))
     SteadyState_Dict_transfer["phi_b"] = param_overrides.get("phi_b", phi_b)
     SteadyState_Dict_transfer["phi_w"] = param_overrides.get(
         "real_wage_rigidity", real_wage_rigidity
@@ -1419,9 +1684,11 @@ def run_transfer_experiments(param_overrides=None):
     unknowns = ["theta", "r_ante"]
     targets = ["asset_mkt", "fisher_resid"]
 
-    irfs_transfer = HANK_SAM.solve_impulse_linear(
+    irfs_transfer = solve_impulse_linear_cached(
+        "HANK_SAM",
         SteadyState_Dict_transfer, unknowns, targets, shocks_transfers
     )
+    report_progress(status_callback, "Stimulus check: standard Taylor rule solved (1 of 4)")
 
     # Fixed nominal rate
     SteadyState_Dict_UI_transfer_fixed_nominal_rate = deepcopy(
@@ -1429,23 +1696,27 @@ def run_transfer_experiments(param_overrides=None):
     )
     SteadyState_Dict_UI_transfer_fixed_nominal_rate["phi_pi"] = 0.0
 
-    irfs_transfer_fixed_nominal_rate = HANK_SAM.solve_impulse_linear(
+    irfs_transfer_fixed_nominal_rate = solve_impulse_linear_cached(
+        "HANK_SAM",
         SteadyState_Dict_UI_transfer_fixed_nominal_rate,
         unknowns,
         targets,
         shocks_transfers,
     )
+    report_progress(status_callback, "Stimulus check: fixed nominal rate solved (2 of 4)")
 
     # Fixed real rate
     unknowns_fixed_real_rate = ["theta"]
     targets_fixed_real_rate = ["asset_mkt"]
 
-    irfs_transfer_fixed_real_rate = HANK_SAM_fixed_real_rate.solve_impulse_linear(
+    irfs_transfer_fixed_real_rate = solve_impulse_linear_cached(
+        "HANK_SAM_fixed_real_rate",
         SteadyState_Dict_transfer,
         unknowns_fixed_real_rate,
         targets_fixed_real_rate,
         shocks_transfers,
     )
+    report_progress(status_callback, "Stimulus check: fixed real rate solved (3 of 4)")
 
     # Lagged taylor rule
     SteadyState_Dict_transfers_lagged_nominal_rate = deepcopy(SteadyState_Dict_transfer)
@@ -1453,13 +1724,15 @@ def run_transfer_experiments(param_overrides=None):
     SteadyState_Dict_transfers_lagged_nominal_rate["lag"] = monetary_policy_lag
 
     irfs_transfers_lagged_nominal_rate = (
-        HANK_SAM_lagged_taylor_rule.solve_impulse_linear(
+        solve_impulse_linear_cached(
+            "HANK_SAM_lagged_taylor_rule",
             SteadyState_Dict_transfers_lagged_nominal_rate,
             unknowns,
             targets,
             shocks_transfers,
         )
     )
+    report_progress(status_callback, "Stimulus check: lagged Taylor rule solved (4 of 4)")
 
     return (
         irfs_transfer,
@@ -1471,7 +1744,7 @@ def run_transfer_experiments(param_overrides=None):
     )
 
 
-def run_tax_cut_experiments(param_overrides=None):
+def run_tax_cut_experiments(param_overrides=None, status_callback=None):
     """
     Run tax cut experiments under different monetary policies.
 
@@ -1486,6 +1759,7 @@ def run_tax_cut_experiments(param_overrides=None):
 
     Args:
         param_overrides: Dictionary of parameter overrides to apply
+        status_callback: Optional function called with a progress message after each GE solve
 
     Returns:
         tuple: Contains IRFs and configuration for all scenarios:
@@ -1494,6 +1768,7 @@ def run_tax_cut_experiments(param_overrides=None):
     """
     if param_overrides is None:
         param_overrides = {}
+    report_progress(status_callback, "Tax cut: started (0 of 3)")
 
     # Create shock
     tax_length = param_overrides.get("tax_cut_length", tax_cut_length)
@@ -1502,7 +1777,7 @@ def run_tax_cut_experiments(param_overrides=None):
     shocks_tau = {"tau": dtau}
 
     # Set up steady state dictionary
-    SteadyState_Dict_tax_shock = deepcopy(SteadyState_Dict)
+    SteadyState_Dict_tax_shock = deepcopy(get_model_object("SteadyState_Dict"))
     SteadyState_Dict_tax_shock["phi_G"] = -param_overrides.get(
         "phi_b", phi_b
     )  # G adjusts instead of tau
@@ -1519,28 +1794,34 @@ def run_tax_cut_experiments(param_overrides=None):
     unknowns = ["theta", "r_ante"]
     targets = ["asset_mkt", "fisher_resid"]
 
-    irfs_tau = HANK_SAM_tax_rate_shock.solve_impulse_linear(
+    irfs_tau = solve_impulse_linear_cached(
+        "HANK_SAM_tax_rate_shock",
         SteadyState_Dict_tax_shock, unknowns, targets, shocks_tau
     )
+    report_progress(status_callback, "Tax cut: standard Taylor rule solved (1 of 3)")
 
     # Fixed nominal rate
     SteadyState_Dict_tax_shock_fixed_rate = deepcopy(SteadyState_Dict_tax_shock)
     SteadyState_Dict_tax_shock_fixed_rate["phi_pi"] = 0.0
 
-    irfs_tau_fixed_nominal_rate = HANK_SAM_tax_rate_shock.solve_impulse_linear(
+    irfs_tau_fixed_nominal_rate = solve_impulse_linear_cached(
+        "HANK_SAM_tax_rate_shock",
         SteadyState_Dict_tax_shock_fixed_rate, unknowns, targets, shocks_tau
     )
+    report_progress(status_callback, "Tax cut: fixed nominal rate solved (2 of 3)")
 
     # Fixed real rate
     unknowns_fixed_real_rate = ["theta"]
     targets_fixed_real_rate = ["asset_mkt"]
 
-    irfs_tau_fixed_real_rate = HANK_SAM_tax_cut_fixed_real_rate.solve_impulse_linear(
+    irfs_tau_fixed_real_rate = solve_impulse_linear_cached(
+        "HANK_SAM_tax_cut_fixed_real_rate",
         SteadyState_Dict_tax_shock,
         unknowns_fixed_real_rate,
         targets_fixed_real_rate,
         shocks_tau,
     )
+    report_progress(status_callback, "Tax cut: fixed real rate solved (3 of 3)")
 
     return (
         irfs_tau,
@@ -1551,7 +1832,84 @@ def run_tax_cut_experiments(param_overrides=None):
     )
 
 
-def compute_fiscal_multipliers(horizon_length=20, **param_overrides):
+# Fiscal policy experiments: the function running each one under the standard
+# Taylor rule, a fixed nominal rate and a fixed real rate (the first three IRFs it
+# returns), the IRF of its fiscal cost, the sign of its multipliers, the length
+# parameter it depends on (if any), and the keys of its multipliers and IRFs
+POLICY_EXPERIMENTS = {
+    "transfers": {
+        "label": "Transfers",
+        "run": run_transfer_experiments,
+        "cost": "transfers",
+        "sign": 1.0,
+        "length": None,
+        "multipliers": ["transfers", "transfers_fixed_nominal", "transfers_fixed_real"],
+        "irfs": ["transfer", "transfer_fixed_nominal", "transfer_fixed_real"],
+    },
+    "UI_extend": {
+        "label": "UI Extension",
+        "run": run_ui_extension_experiments,
+        "cost": "UI_extension_cost",
+        "sign": 1.0,
+        "length": "UI_extension_length",
+        "multipliers": ["UI_extend", "UI_extend_fixed_nominal", "UI_extend_fixed_real"],
+        "irfs": ["UI_extend", "UI_extend_fixed_nominal", "UI_extend_fixed_real"],
+    },
+    "tax_cut": {
+        "label": "Tax cut",
+        "run": run_tax_cut_experiments,
+        "cost": "tax_cost",
+        "sign": -1.0,  # Negative because tax cut reduces revenue
+        "length": "tax_cut_length",
+        "multipliers": ["tax_cut", "tax_cut_fixed_nominal", "tax_cut_fixed_real"],
+        "irfs": ["tau", "tau_fixed_nominal", "tau_fixed_real"],
+    },
+}
+MONETARY_REGIMES = ["active taylor rule", "fixed nominal rate", "fixed real rate"]
+
+
+def compute_policy_multipliers(
+    policy, horizon_length=20, status_callback=None, **param_overrides
+):
+    """
+    Compute fiscal multipliers for one policy under the three monetary regimes.
+
+    The fiscal multiplier is defined as:
+        Multiplier(t) = NPV(ΔC, t) / NPV(Fiscal Cost, ∞)
+
+    Args:
+        policy: Key of the policy in POLICY_EXPERIMENTS
+        horizon_length: Number of quarters to compute multipliers (default=20)
+        status_callback: Optional function called with a progress message after
+            each GE solve; it may raise an exception to abandon the computation
+        **param_overrides: Parameter overrides to apply to the experiments
+
+    Returns:
+        dict: 'multipliers' and 'irfs' of this policy, keyed as in compute_fiscal_multipliers
+    """
+    experiment = POLICY_EXPERIMENTS[policy]
+    irfs_by_regime = experiment["run"](param_overrides, status_callback)[:3]
+
+    # Multiplier = Cumulative consumption response / Total fiscal cost,
+    # for all regimes and horizons at once
+    multipliers_by_regime = mult.fiscal_multipliers(
+        np.stack([irf["C"] for irf in irfs_by_regime]),
+        np.stack([irf[experiment["cost"]] for irf in irfs_by_regime]),
+        horizon_length,
+        R,
+        cost_length=300,
+        sign=experiment["sign"],
+    )
+
+    return {
+        "multipliers": dict(zip(experiment["multipliers"], multipliers_by_regime)),
+        "irfs": dict(zip(experiment["irfs"], irfs_by_regime)),
+    }
+
+
+def compute_fiscal_multipliers(
+    horizon_length=20, verbose=True, status_callback=None, **param_overrides
+):
     """
     Compute fiscal multipliers for all policies and monetary regimes.
 
@@ -1567,6 +1925,8 @@ def compute_fiscal_multipliers(horizon_length=20, **param_overrides):
 
     Args:
         horizon_length: Number of quarters to compute multipliers (default=20)
+        verbose: Whether to print a summary of the output multipliers (default=True)
+        status_callback: Optional function called with a progress message after each GE solve
         **param_overrides: Parameter overrides to apply to all experiments
 
     Returns:
@@ -1575,135 +1935,441 @@ def compute_fiscal_multipliers(horizon_length=20, **param_overrides):
             - 'irfs': Full impulse response functions for each experiment
     """
     # Run all experiments with parameter overrides
-    (
-        irfs_UI_extend,
-        irfs_UI_extend_fixed_nominal_rate,
-        irfs_UI_extension_fixed_real_rate,
-        irf_UI_extend_realizations,
-        _,
-        _,
-    ) = run_ui_extension_experiments(param_overrides)
-
-    (
-        irfs_transfer,
-        irfs_transfer_fixed_nominal_rate,
-        irfs_transfer_fixed_real_rate,
-        irfs_transfers_lagged_nominal_rate,
-        _,
-        _,
-    ) = run_transfer_experiments(param_overrides)
-
-    (irfs_tau, irfs_tau_fixed_nominal_rate, irfs_tau_fixed_real_rate, _, _) = (
-        run_tax_cut_experiments(param_overrides)
-    )
-
-    # Initialize multiplier arrays
-    multipliers_transfers = np.zeros(horizon_length)
-    multipliers_UI_extend = np.zeros(horizon_length)
-    multipliers_tax_cut = np.zeros(horizon_length)
-
-    multipliers_transfers_fixed_nominal_rate = np.zeros(horizon_length)
-    multipliers_UI_extensions_fixed_nominal_rate = np.zeros(horizon_length)
-    multipliers_tax_cut_fixed_nominal_rate = np.zeros(horizon_length)
-
-    multipliers_transfers_fixed_real_rate = np.zeros(horizon_length)
-    multipliers_UI_extensions_fixed_real_rate = np.zeros(horizon_length)
-    multipliers_tax_cut_fixed_real_rate = np.zeros(horizon_length)
-
-    # Compute multipliers at each horizon
-    # Multiplier = Cumulative consumption response / Total fiscal cost
-    for i in range(horizon_length):
-        # Fixed nominal rate
-        multipliers_transfers_fixed_nominal_rate[i] = NPV(
-            irfs_transfer_fixed_nominal_rate["C"], i + 1
-        ) / NPV(irfs_transfer_fixed_nominal_rate["transfers"], 300)
-        multipliers_UI_extensions_fixed_nominal_rate[i] = NPV(
-            irfs_UI_extend_fixed_nominal_rate["C"], i + 1
-        ) / NPV(irfs_UI_extend_fixed_nominal_rate["UI_extension_cost"], 300)
-        multipliers_tax_cut_fixed_nominal_rate[i] = -NPV(
-            irfs_tau_fixed_nominal_rate["C"], i + 1
-        ) / NPV(
-            irfs_tau_fixed_nominal_rate["tax_cost"], 300
-        )  # Negative because tax cut reduces revenue
-
-        # Standard taylor rule
-        multipliers_transfers[i] = NPV(irfs_transfer["C"], i + 1) / NPV(
-            irfs_transfer["transfers"], 300
-        )
-        multipliers_UI_extend[i] = NPV(irfs_UI_extend["C"], i + 1) / NPV(
-            irfs_UI_extend["UI_extension_cost"], 300
+    results = {
+        policy: compute_policy_multipliers(
+            policy, horizon_length, status_callback, **param_overrides
         )
-        multipliers_tax_cut[i] = -NPV(irfs_tau["C"], i + 1) / NPV(
-            irfs_tau["tax_cost"], 300
+        for policy in ["UI_extend", "transfers", "tax_cut"]
+    }
+
+    # Print summary multipliers (output multipliers at infinite horizon)
+    if verbose:
+        print("FISCAL MULTIPLIERS SUMMARY")
+        print("=" * 60)
+        for policy, policy_results in results.items():
+            experiment = POLICY_EXPERIMENTS[policy]
+            regime_irfs = [policy_results["irfs"][key] for key in experiment["irfs"]]
+            output_multipliers = NPV(
+                np.stack([irf["Y"] for irf in regime_irfs]), bigT
+            ) / NPV(np.stack([irf[experiment["cost"]] for irf in regime_irfs]), bigT)
+            for regime, output_multiplier in zip(MONETARY_REGIMES, output_multipliers):
+                print(f"{experiment['label']} ({regime}): {output_multiplier:.3f}")
+        print("=" * 60)
+
+    multipliers = {}
+    irfs = {}
+    for regime in range(3):
+        for policy in ["transfers", "UI_extend", "tax_cut"]:
+            mult_key = POLICY_EXPERIMENTS[policy]["multipliers"][regime]
+            multipliers[mult_key] = results[policy]["multipliers"][mult_key]
+    for policy in ["UI_extend", "transfers", "tax_cut"]:
+        irfs.update(results[policy]["irfs"])
+
+    return {"multipliers": multipliers, "irfs": irfs}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Precomputed multiplier grid for the dashboard
+# ─────────────────────────────────────────────────────────────────────────────
+# The dashboard only varies the parameters in MULTIPLIER_GRID_AXES. Running
+# `python hank_sam.py --precompute` solves the model once at every point of this
+# grid and stores the multipliers and consumption IRFs in memory-mapped .npy
+# files in MULTIPLIER_GRID_DIR; the dashboard then answers slider changes with
+# lookup_fiscal_multipliers instead of solving the model. The policy rule
+# coefficients are interpolated (multilinearly) between grid points, while the
+# policy lengths are integers and are looked up exactly.
+
+MULTIPLIER_GRID_DIR = Path(__file__).parent / "multiplier_grid"
+
+# The policy rule coefficients are on the dashboard's slider steps, so every slider
+# stop is a grid point (the fixed nominal rate regime changes sharply in phi_y and
+# phi_b, where interpolation between coarser points would show)
+MULTIPLIER_GRID_AXES = {
+    "phi_pi": np.linspace(1.0, 3.0, 21),
+    "phi_y": np.linspace(0.0, 1.0, 21),
+    "phi_b": np.linspace(0.0, 0.1, 21),
+    "UI_extension_length": np.arange(1, 13),
+    "tax_cut_length": np.arange(1, 17),
+}
+MULTIPLIER_GRID_CONTINUOUS = ["phi_pi", "phi_y", "phi_b"]
+
+# Parameters the dashboard holds fixed, at which the grid is computed
+MULTIPLIER_GRID_FIXED_PARAMS = {
+    "rho_r": 0.0,
+    "kappa_p": 0.065,
+    "real_wage_rigidity": 0.95,
+}
+
+MULTIPLIER_GRID_HORIZON = 20  # Quarters of multipliers stored
+MULTIPLIER_GRID_IRF_LENGTH = 20  # Quarters of consumption IRFs stored
+
+multiplier_grid = None  # Opened grid, loaded on the first lookup
+
+
+def multiplier_grid_key(axes, fixed_params, horizon_length, irf_length):
+    """
+    Settings that a multiplier grid was computed with, as stored in grid_key.json.
+    """
+    return {
+        "axes": {name: [float(x) for x in axes[name]] for name in axes},
+        "fixed_params": {name: float(fixed_params[name]) for name in fixed_params},
+        "horizon_length": horizon_length,
+        "irf_length": irf_length,
+        "bigT": bigT,
+    }
+
+
+def multiplier_grid_arrays(axes, horizon_length, irf_length):
+    """
+    Names, dtypes and shapes of the memory-mapped arrays of a multiplier grid.
+
+    Args:
+        axes: Dictionary of grid values for each parameter in MULTIPLIER_GRID_AXES
+        horizon_length: Number of quarters of multipliers
+        irf_length: Number of quarters of consumption IRFs
+
+    Returns:
+        dict: (dtype, shape) for each array, by file name
+    """
+    shape = tuple(len(axes[name]) for name in MULTIPLIER_GRID_CONTINUOUS)
+    arrays = {"done": (np.bool_, shape)}
+    for policy, experiment in POLICY_EXPERIMENTS.items():
+        length_name = experiment["length"]
+        policy_shape = shape if length_name is None else shape + (len(axes[length_name]),)
+        arrays[policy + "_multipliers"] = (np.float32, policy_shape + (3, horizon_length))
+        arrays[policy + "_C"] = (np.float32, policy_shape + (3, irf_length))
+    return arrays
+
+
+def open_multiplier_grid(grid_dir, arrays=None, mode="r"):
+    """
+    Open the memory-mapped arrays of a multiplier grid.
+
+    Args:
+        grid_dir: Directory of the grid files
+        arrays: Array specifications from multiplier_grid_arrays, needed for mode="w+"
+        mode: "r", "r+" or "w+" (create new, empty files)
+
+    Returns:
+        dict: Memory-mapped arrays by name, and the grid settings under "key"
+    """
+    grid_dir = Path(grid_dir)
+    grid = {}
+    if mode == "w+":
+        for name, (dtype, shape) in arrays.items():
+            grid[name] = np.lib.format.open_memmap(
+                grid_dir / (name + ".npy"), mode="w+", dtype=dtype, shape=shape
+            )
+    else:
+        with open(grid_dir / "grid_key.json") as f:
+            grid["key"] = json.load(f)
+        for path in grid_dir.glob("*.npy"):
+            grid[path.stem] = np.load(path, mmap_mode=mode)
+    return grid
+
+
+def solve_multiplier_grid_point(task):
+    """
+    Solve the model at one point of a multiplier grid and write the results to the grid files.
+
+    Args:
+        task: Tuple (grid_dir, point, params, axes, horizon_length, irf_length) with
+            the index of the point on the grid and the parameter overrides there
+
+    Returns:
+        tuple: The index of the point
+    """
+    grid_dir, point, params, axes, horizon_length, irf_length = task
+    grid = open_multiplier_grid(grid_dir, mode="r+")
+    params = dict(params)
+    num_lengths = max(
+        len(axes[experiment["length"]])
+        for experiment in POLICY_EXPERIMENTS.values()
+        if experiment["length"] is not None
+    )
+
+    # Solve each policy at every length on its axis; each GE system is solved
+    # once and the other lengths only cost a product with its cached GE Jacobian
+    for k in range(num_lengths):
+        for policy, experiment in POLICY_EXPERIMENTS.items():
+            length_name = experiment["length"]
+            if length_name is None:
+                if k > 0:
+                    continue
+                index = point
+            else:
+                if k >= len(axes[length_name]):
+                    continue
+                params[length_name] = int(axes[length_name][k])
+                index = point + (k,)
+            results = compute_policy_multipliers(policy, horizon_length, **params)
+            for regime, (mult_key, irf_key) in enumerate(
+                zip(experiment["multipliers"], experiment["irfs"])
+            ):
+                grid[policy + "_multipliers"][index + (regime,)] = results["multipliers"][mult_key]
+                grid[policy + "_C"][index + (regime,)] = results["irfs"][irf_key]["C"][:irf_length]
+
+    for name in grid:
+        if name not in ["key", "done"]:
+            grid[name].flush()
+
+    # No other grid point shares these GE systems, so free them now rather than
+    # let every worker hold a full cache
+    clear_ge_solver_cache()
+    return point
+
+
+def precompute_fiscal_multipliers(
+    grid_dir=MULTIPLIER_GRID_DIR,
+    axes=None,
+    fixed_params=None,
+    horizon_length=MULTIPLIER_GRID_HORIZON,
+    irf_length=MULTIPLIER_GRID_IRF_LENGTH,
+    num_workers=None,
+):
+    """
+    Solve the model at every point of a parameter grid and store the results.
+
+    Every point runs compute_policy_multipliers, so the grid holds exactly what a
+    live solve returns there. Finished points are marked in the "done" array, so
+    an interrupted run picks up where it stopped as long as the grid settings are
+    unchanged; otherwise the grid is started afresh.
+
+    Args:
+        grid_dir: Directory for the grid files (default MULTIPLIER_GRID_DIR)
+        axes: Grid values for each parameter (default MULTIPLIER_GRID_AXES)
+        fixed_params: Other parameter overrides (default MULTIPLIER_GRID_FIXED_PARAMS)
+        horizon_length: Number of quarters of multipliers to store
+        irf_length: Number of quarters of consumption IRFs to store
+        num_workers: Number of forked worker processes (default: the environment
+            variable HAFISCAL_NUM_WORKERS, or 1; 0 means one per core)
+    """
+    if axes is None:
+        axes = MULTIPLIER_GRID_AXES
+    if fixed_params is None:
+        fixed_params = MULTIPLIER_GRID_FIXED_PARAMS
+    if num_workers is None:
+        num_workers = int(os.environ.get("HAFISCAL_NUM_WORKERS", 1))
+    if num_workers <= 0:
+        num_workers = os.cpu_count()
+    grid_dir = Path(grid_dir)
+    key = multiplier_grid_key(axes, fixed_params, horizon_length, irf_length)
+    arrays = multiplier_grid_arrays(axes, horizon_length, irf_length)
+
+    # Resume a grid made with the same settings, or else start a new one
+    grid = None
+    if (grid_dir / "grid_key.json").exists():
+        grid = open_multiplier_grid(grid_dir, mode="r+")
+        resumable = grid["key"] == key and all(
+            name in grid and grid[name].shape == shape and grid[name].dtype == dtype
+            for name, (dtype, shape) in arrays.items()
         )
+        if not resumable:
+            grid = None
+    if grid is None:
+        grid_dir.mkdir(parents=True, exist_ok=True)
+        (grid_dir / "grid_key.json").unlink(missing_ok=True)
+        grid = open_multiplier_grid(grid_dir, arrays, mode="w+")
+        with open(grid_dir / "grid_key.json", "w") as f:
+            json.dump(key, f)
+
+    tasks = []
+    for point in np.ndindex(grid["done"].shape):
+        if not grid["done"][point]:
+            params = dict(fixed_params)
+            for name, i in zip(MULTIPLIER_GRID_CONTINUOUS, point):
+                params[name] = float(axes[name][i])
+            tasks.append((grid_dir, point, params, axes, horizon_length, irf_length))
+    num_points = grid["done"].size
+    print(f"Multiplier grid: {len(tasks)} of {num_points} points to solve")
+
+    def mark_done(point):
+        # Each point has been written and flushed before it is marked as done
+        grid["done"][point] = True
+        grid["done"].flush()
+        print(f"Solved grid point {int(grid['done'].sum())} of {num_points}")
+
+    # Workers are forked, so they start with the models already built here
+    build_ge_models()
+    num_workers = min(num_workers, len(tasks))
+    if num_workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        for task in tasks:
+            mark_done(solve_multiplier_grid_point(task))
+    else:
+        with multiprocessing.get_context("fork").Pool(processes=num_workers) as pool:
+            for point in pool.imap_unordered(solve_multiplier_grid_point, tasks, chunksize=1):
+                mark_done(point)
 
-        # Fixed real rate
-        multipliers_transfers_fixed_real_rate[i] = NPV(
-            irfs_transfer_fixed_real_rate["C"], i + 1
-        ) / NPV(irfs_transfer_fixed_real_rate["transfers"], 300)
-        multipliers_UI_extensions_fixed_real_rate[i] = NPV(
-            irfs_UI_extension_fixed_real_rate["C"], i + 1
-        ) / NPV(irfs_UI_extension_fixed_real_rate["UI_extension_cost"], 300)
-        multipliers_tax_cut_fixed_real_rate[i] = -NPV(
-            irfs_tau_fixed_real_rate["C"], i + 1
-        ) / NPV(irfs_tau_fixed_real_rate["tax_cost"], 300)
 
-    # Print summary multipliers (output multipliers at infinite horizon)
-    print("FISCAL MULTIPLIERS SUMMARY")
-    print("=" * 60)
-    print(
-        f"UI Extension (active taylor rule): {NPV(irfs_UI_extend['Y'], bigT) / NPV(irfs_UI_extend['UI_extension_cost'], bigT):.3f}"
-    )
-    print(
-        f"UI Extension (fixed nominal rate): {NPV(irfs_UI_extend_fixed_nominal_rate['Y'], bigT) / NPV(irfs_UI_extend_fixed_nominal_rate['UI_extension_cost'], bigT):.3f}"
-    )
-    print(
-        f"UI Extension (fixed real rate): {NPV(irfs_UI_extension_fixed_real_rate['Y'], bigT) / NPV(irfs_UI_extension_fixed_real_rate['UI_extension_cost'], bigT):.3f}"
-    )
-    print(
-        f"Transfers (active taylor rule): {NPV(irfs_transfer['Y'], bigT) / NPV(irfs_transfer['transfers'], bigT):.3f}"
-    )
-    print(
-        f"Transfers (fixed nominal rate): {NPV(irfs_transfer_fixed_nominal_rate['Y'], bigT) / NPV(irfs_transfer_fixed_nominal_rate['transfers'], bigT):.3f}"
-    )
-    print(
-        f"Transfers (fixed real rate): {NPV(irfs_transfer_fixed_real_rate['Y'], bigT) / NPV(irfs_transfer_fixed_real_rate['transfers'], bigT):.3f}"
-    )
-    print(
-        f"Tax cut (active taylor rule): {NPV(irfs_tau['Y'], bigT) / NPV(irfs_tau['tax_cost'], bigT):.3f}"
-    )
-    print(
-        f"Tax cut (fixed nominal rate): {NPV(irfs_tau_fixed_nominal_rate['Y'], bigT) / NPV(irfs_tau_fixed_nominal_rate['tax_cost'], bigT):.3f}"
-    )
-    print(
-        f"Tax cut (fixed real rate): {NPV(irfs_tau_fixed_real_rate['Y'], bigT) / NPV(irfs_tau_fixed_real_rate['tax_cost'], bigT):.3f}"
-    )
-    print("=" * 60)
+def grid_interpolation_weights(axis, value):
+    """
+    Indices and weights of the grid points bracketing a value, for linear interpolation.
 
-    return {
-        "multipliers": {
-            "transfers": multipliers_transfers,
-            "UI_extend": multipliers_UI_extend,
-            "tax_cut": multipliers_tax_cut,
-            "transfers_fixed_nominal": multipliers_transfers_fixed_nominal_rate,
-            "UI_extend_fixed_nominal": multipliers_UI_extensions_fixed_nominal_rate,
-            "tax_cut_fixed_nominal": multipliers_tax_cut_fixed_nominal_rate,
-            "transfers_fixed_real": multipliers_transfers_fixed_real_rate,
-            "UI_extend_fixed_real": multipliers_UI_extensions_fixed_real_rate,
-            "tax_cut_fixed_real": multipliers_tax_cut_fixed_real_rate,
-        },
-        "irfs": {
-            "UI_extend": irfs_UI_extend,
-            "UI_extend_fixed_nominal": irfs_UI_extend_fixed_nominal_rate,
-            "UI_extend_fixed_real": irfs_UI_extension_fixed_real_rate,
-            "transfer": irfs_transfer,
-            "transfer_fixed_nominal": irfs_transfer_fixed_nominal_rate,
-            "transfer_fixed_real": irfs_transfer_fixed_real_rate,
-            "tau": irfs_tau,
-            "tau_fixed_nominal": irfs_tau_fixed_nominal_rate,
-            "tau_fixed_real": irfs_tau_fixed_real_rate,
-        },
+    Args:
+        axis: Increasing grid values
+        value: Value within the range of the grid
+
+    Returns:
+        list: (index, weight) pairs with nonzero weights
+    """
+    if len(axis) == 1:
+        return [(0, 1.0)]
+    i = int(np.clip(np.searchsorted(axis, value, side="right") - 1, 0, len(axis) - 2))
+    w = (value - axis[i]) / (axis[i + 1] - axis[i])
+    return [(j, weight) for j, weight in [(i, 1.0 - w), (i + 1, w)] if weight > 0.0]
+
+
+def lookup_policy_multipliers(policy, horizon_length=20, **param_overrides):
+    """
+    Look up the fiscal multipliers and consumption IRFs of one policy in the precomputed grid.
+
+    Takes the same arguments as compute_policy_multipliers. Returns None, so that
+    the caller can solve the model instead, if there is no complete grid in
+    MULTIPLIER_GRID_DIR or the parameters are not covered by it.
+
+    Args:
+        policy: Key of the policy in POLICY_EXPERIMENTS
+        horizon_length: Number of quarters of multipliers (default=20)
+        **param_overrides: Parameter overrides, as for compute_fiscal_multipliers
+
+    Returns:
+        dict or None: 'multipliers' and 'irfs' as from compute_policy_multipliers,
+            except that each IRF dictionary only holds consumption ("C")
+    """
+    global multiplier_grid
+    if multiplier_grid is None:
+        if not (MULTIPLIER_GRID_DIR / "grid_key.json").exists():
+            return None
+        grid = open_multiplier_grid(MULTIPLIER_GRID_DIR)
+        if not grid["done"].all():
+            return None
+        multiplier_grid = grid
+    grid = multiplier_grid
+    key = grid["key"]
+    if horizon_length > key["horizon_length"]:
+        return None
+    experiment = POLICY_EXPERIMENTS[policy]
+
+    params = {
+        "phi_pi": phi_pi,
+        "phi_y": phi_y,
+        "phi_b": phi_b,
+        "rho_r": rho_r,
+        "kappa_p": kappa_p_ss,
+        "real_wage_rigidity": real_wage_rigidity,
+        "UI_extension_length": UI_extension_length,
+        "tax_cut_length": tax_cut_length,
     }
+    params.update({name: param_overrides[name] for name in params if name in param_overrides})
+    for name, value in params.items():
+        if name in key["fixed_params"]:
+            if not np.isclose(value, key["fixed_params"][name]):
+                return None
+        elif name in key["axes"]:
+            axis = key["axes"][name]
+            if not axis[0] - 1e-9 <= value <= axis[-1] + 1e-9:
+                return None
+        else:
+            return None
+
+    length_index = ()
+    if experiment["length"] is not None:
+        length_axis = key["axes"][experiment["length"]]
+        if params[experiment["length"]] not in length_axis:
+            return None
+        length_index = (length_axis.index(params[experiment["length"]]),)
+
+    # Interpolate over the policy rule coefficients
+    corners = itertools.product(
+        *[
+            grid_interpolation_weights(key["axes"][name], params[name])
+            for name in MULTIPLIER_GRID_CONTINUOUS
+        ]
+    )
+    policy_multipliers = np.zeros((3, horizon_length))
+    policy_C = np.zeros((3, key["irf_length"]))
+    for corner in corners:
+        index = tuple(i for i, _ in corner) + length_index
+        weight = np.prod([w for _, w in corner])
+        policy_multipliers += weight * grid[policy + "_multipliers"][index][:, :horizon_length]
+        policy_C += weight * grid[policy + "_C"][index]
+
+    multipliers = {}
+    irfs = {}
+    for regime, (mult_key, irf_key) in enumerate(
+        zip(experiment["multipliers"], experiment["irfs"])
+    ):
+        multipliers[mult_key] = policy_multipliers[regime]
+        irfs[irf_key] = {"C": policy_C[regime]}
+
+    return {"multipliers": multipliers, "irfs": irfs}
+
+
+def lookup_fiscal_multipliers(horizon_length=20, **param_overrides):
+    """
+    Look up fiscal multipliers and consumption IRFs of all policies in the precomputed grid.
+
+    Args:
+        horizon_length: Number of quarters of multipliers (default=20)
+        **param_overrides: Parameter overrides, as for compute_fiscal_multipliers
+
+    Returns:
+        dict or None: 'multipliers' and 'irfs' as from compute_fiscal_multipliers,
+            except that each IRF dictionary only holds consumption ("C"); None if
+            the grid does not cover the parameters
+    """
+    multipliers = {}
+    irfs = {}
+    for policy in POLICY_EXPERIMENTS:
+        results = lookup_policy_multipliers(policy, horizon_length, **param_overrides)
+        if results is None:
+            return None
+        multipliers.update(results["multipliers"])
+        irfs.update(results["irfs"])
+    return {"multipliers": multipliers, "irfs": irfs}
+
+
+def get_policy_multipliers(
+    policy, horizon_length=20, status_callback=None, **param_overrides
+):
+    """
+    Fiscal multipliers of one policy from the precomputed grid if it covers the parameters, or else solved.
+
+    Args:
+        policy: Key of the policy in POLICY_EXPERIMENTS
+        horizon_length: Number of quarters to compute multipliers (default=20)
+        status_callback: Optional function called with a progress message after each GE solve
+        **param_overrides: Parameter overrides, as for compute_fiscal_multipliers
+
+    Returns:
+        dict: 'multipliers' and 'irfs', as from compute_policy_multipliers
+    """
+    results = lookup_policy_multipliers(policy, horizon_length, **param_overrides)
+    if results is None:
+        results = compute_policy_multipliers(
+            policy, horizon_length, status_callback, **param_overrides
+        )
+    return results
+
+
+def get_fiscal_multipliers(horizon_length=20, status_callback=None, **param_overrides):
+    """
+    Fiscal multipliers from the precomputed grid if it covers the parameters, or else solved.
+
+    Args:
+        horizon_length: Number of quarters to compute multipliers (default=20)
+        status_callback: Optional function called with a progress message after each GE solve
+        **param_overrides: Parameter overrides, as for compute_fiscal_multipliers
+
+    Returns:
+        dict: 'multipliers' and 'irfs', as from compute_fiscal_multipliers
+    """
+    results = lookup_fiscal_multipliers(horizon_length, **param_overrides)
+    if results is None:
+        results = compute_fiscal_multipliers(
+            horizon_length, status_callback=status_callback, **param_overrides
+        )
+    return results
 
 
 # ═════════════════════════════════════════════════════════════════════════════
@@ -1883,6 +2549,8 @@ def create_dashboard_figure(multipliers, irfs, figsize=(12, 8), fontsize=10):
     Returns:
         fig: Matplotlib figure object ready for display
     """
+    import matplotlib.pyplot as plt
+
     # Create figure with 2 rows, 3 columns
     fig, axes = plt.subplots(2, 3, figsize=figsize, sharey="row")
 
@@ -2251,6 +2919,8 @@ def plot_multipliers_across_horizon():
     a 20-quarter horizon under the standard Taylor rule. Shows how multipliers
     evolve from impact to long-run values.
     """
+    import matplotlib.pyplot as plt
+
     # Compute multipliers for all experiments
     results = compute_fiscal_multipliers()
     multipliers = results["multipliers"]
@@ -2294,6 +2964,8 @@ def plot_consumption_irfs_three(irf_SC1, irf_UI1, irf_TC1):
         irf_UI1: IRF dictionary for UI extension experiment
         irf_TC1: IRF dictionary for tax cut experiment
     """
+    import matplotlib.pyplot as plt
+
     Length = 12  # Plot first 3 years
     fontsize = 10
     width = 2
@@ -2367,6 +3039,11 @@ def plot_consumption_irfs_three(irf_SC1, irf_UI1, irf_TC1):
 # - Multipliers converge to long-run values after ~3 years
 
 if __name__ == "__main__":
+    # Offline mode: fill in the multiplier grid used by the dashboard, then stop
+    if "--precompute" in sys.argv[1:]:
+        precompute_fiscal_multipliers()
+        raise SystemExit
+
     # Run all policy experiments and compute fiscal multipliers
     # This will print a summary table of output multipliers
     results = compute_fiscal_multipliers()
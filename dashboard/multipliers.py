@@ -0,0 +1,83 @@
+"""
+Net present values and fiscal multipliers for the HANK-SAM dashboard.
+
+Every function discounts with one precomputed discount vector and handles
+whole arrays of impulse responses at once: the last axis of an IRF array is
+time, and any leading axes (e.g. monetary regimes) are processed in the same
+vectorized pass.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def discount_vector(length, discount_rate):
+    """
+    Discount factors 1 / R^t for t = 0, ..., length - 1.
+
+    Args:
+        length: Number of periods
+        discount_rate: Gross discount rate R
+
+    Returns:
+        np.ndarray: Read-only array of discount factors (cached per length and rate)
+    """
+    discount = float(discount_rate) ** -np.arange(length, dtype=float)
+    discount.flags.writeable = False
+    return discount
+
+
+def NPV(irf, length, discount_rate):
+    """
+    Compute the net present value of the first `length` periods of a time series.
+
+    Args:
+        irf: Impulse response array (time on the last axis)
+        length: Number of periods to include in NPV calculation
+        discount_rate: Gross discount rate R
+
+    Returns:
+        float or np.ndarray: Net present value of each series
+    """
+    return np.asarray(irf)[..., :length] @ discount_vector(length, discount_rate)
+
+
+def cumulative_NPV(irf, length, discount_rate):
+    """
+    Compute the net present value of a time series at every horizon up to `length`.
+
+    Args:
+        irf: Impulse response array (time on the last axis)
+        length: Number of horizons
+        discount_rate: Gross discount rate R
+
+    Returns:
+        np.ndarray: Entry t along the last axis is the NPV of periods 0, ..., t
+    """
+    return np.cumsum(
+        np.asarray(irf)[..., :length] * discount_vector(length, discount_rate),
+        axis=-1,
+    )
+
+
+def fiscal_multipliers(C_irfs, cost_irfs, horizon_length, discount_rate, cost_length=300, sign=1):
+    """
+    Compute cumulative fiscal multipliers at all horizons in one pass.
+
+        Multiplier(t) = sign * NPV(ΔC, t) / NPV(Fiscal Cost, cost_length)
+
+    Args:
+        C_irfs: Consumption impulse responses (time on the last axis)
+        cost_irfs: Fiscal cost impulse responses, matching the leading axes of C_irfs
+        horizon_length: Number of horizons t = 1, ..., horizon_length
+        discount_rate: Gross discount rate R
+        cost_length: Number of periods of the fiscal cost to discount (default=300)
+        sign: +1 for spending policies, -1 for tax cuts (whose cost is negative)
+
+    Returns:
+        np.ndarray: Multipliers with horizons on the last axis
+    """
+    total_cost = NPV(cost_irfs, cost_length, discount_rate)
+    return sign * cumulative_NPV(C_irfs, horizon_length, discount_rate) / np.expand_dims(total_cost, -1)
@@ -17,6 +17,18 @@ import hafiscal
 print('✅ All imports successful!')
 "
 
+# Precomputed multiplier grid: without it every slider change is a live solve
+if [ ! -e dashboard/multiplier_grid/grid_key.json ]; then
+    if [ "${HAFISCAL_BUILD_GRID:-0}" = "1" ]; then
+        bash dashboard/build-multiplier-grid.sh
+    else
+        echo ""
+        echo "ℹ️  No precomputed multiplier grid found; simulations will be solved live."
+        echo "   Run dashboard/build-multiplier-grid.sh (several hours on one core),"
+        echo "   or set HAFISCAL_BUILD_GRID=1 to build it before starting the dashboard."
+    fi
+fi
+
 echo ""
 echo "🚀 Starting Voila dashboard..."
 echo "   → Dashboard will be available on port 8866"
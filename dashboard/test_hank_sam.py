@@ -20,6 +20,21 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
+# Both implementations need the household Jacobians, which are produced by
+# Code/HA-Models/FromPandemicCode/HA-Fiscal-HANK-SAM.py and not kept in the repository
+jacobian_dir = root_dir / "Code" / "HA-Models" / "FromPandemicCode"
+missing_jacobians = [
+    name
+    for name in ["HA_Fiscal_Jacs.obj", "HA_Fiscal_Jacs_UI_extend_real.obj"]
+    if not (jacobian_dir / name).exists()
+]
+if missing_jacobians:
+    pytest.skip(
+        "household Jacobians not found in "
+        f"{jacobian_dir}: {', '.join(missing_jacobians)}",
+        allow_module_level=True,
+    )
+
 # Change working directory to root to find data files
 original_cwd = os.getcwd()
 os.chdir(str(root_dir))
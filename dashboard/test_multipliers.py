@@ -0,0 +1,74 @@
+"""
+test_multipliers.py – Test the vectorized NPVs and multipliers in multipliers.py
+
+Each function is checked against the period-by-period loops that hank_sam.py
+used before it delegated to multipliers.py.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from multipliers import NPV, cumulative_NPV, discount_vector, fiscal_multipliers
+
+R = 1.01
+
+
+def loop_NPV(irf, length, discount_rate):
+    """NPV of the first `length` periods of irf, one period at a time."""
+    NPV_val = 0
+    for i in range(length):
+        NPV_val += irf[i] / discount_rate**i
+    return NPV_val
+
+
+@pytest.fixture
+def irfs():
+    """Three regimes' consumption and fiscal cost responses, as in compute_policy_multipliers."""
+    rng = np.random.default_rng(0)
+    T = 300
+    decay = 0.9 ** np.arange(T)
+    C_irfs = rng.normal(size=(3, T)) * decay
+    cost_irfs = (1.0 + rng.uniform(size=(3, T))) * decay
+    return C_irfs, cost_irfs
+
+
+def test_discount_vector():
+    discount = discount_vector(20, R)
+    np.testing.assert_allclose(discount, [1 / R**t for t in range(20)], rtol=1e-14)
+    assert discount_vector(20, R) is discount
+    assert not discount.flags.writeable
+
+
+def test_NPV(irfs):
+    C_irfs, _ = irfs
+    for length in [1, 12, 300]:
+        assert NPV(C_irfs[0], length, R) == pytest.approx(loop_NPV(C_irfs[0], length, R), rel=1e-12, abs=1e-14)
+        np.testing.assert_allclose(
+            NPV(C_irfs, length, R),
+            [loop_NPV(irf, length, R) for irf in C_irfs],
+            rtol=1e-12,
+            atol=1e-14,
+        )
+
+
+def test_cumulative_NPV(irfs):
+    C_irfs, _ = irfs
+    expected = [[loop_NPV(irf, t + 1, R) for t in range(40)] for irf in C_irfs]
+    np.testing.assert_allclose(cumulative_NPV(C_irfs, 40, R), expected, rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.parametrize("sign", [1, -1])
+def test_fiscal_multipliers(irfs, sign):
+    C_irfs, cost_irfs = irfs
+    horizon_length = 20
+    expected = np.zeros((3, horizon_length))
+    for r in range(3):
+        for i in range(horizon_length):
+            expected[r, i] = sign * loop_NPV(C_irfs[r], i + 1, R) / loop_NPV(cost_irfs[r], 300, R)
+    multipliers = fiscal_multipliers(C_irfs, cost_irfs, horizon_length, R, cost_length=300, sign=sign)
+    np.testing.assert_allclose(multipliers, expected, rtol=1e-12, atol=1e-14)